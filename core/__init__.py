@@ -6,11 +6,13 @@ QuickLauncher 核心模块
 from .config_manager import ConfigManager, AppConfig, QuickWindowConfig
 from .app_manager import AppManager
 from .icon_cache import IconCache
+from .frecency import FrecencyEngine
 
 __all__ = [
     'ConfigManager',
     'AppConfig',
     'QuickWindowConfig',
     'AppManager',
-    'IconCache'
+    'IconCache',
+    'FrecencyEngine'
 ]
\ No newline at end of file
@@ -5,15 +5,21 @@
 """
 
 import os
+import sys
+import shutil
 import hashlib
 import time
 import uuid
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 from dataclasses import asdict
 import logging
 
+from .path_status import stat_paths
+from .desktop_entry import get_desktop_entry_cache
+from .app_search import AppSearchIndex
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -38,6 +44,26 @@ class AppManager:
             self.cache_available = False
             self.icon_cache = None
 
+        # 应用路径状态缓存（通过目录监视和后台复查保持最新），列表和搜索不再逐个检查文件
+        from .path_status import get_path_status_cache
+        self.path_status = get_path_status_cache()
+
+        # Linux下XDG应用目录索引，为搜索提供尚未添加的可发现应用
+        self.app_indexer = None
+        if sys.platform.startswith('linux'):
+            from .xdg_indexer import XdgAppIndexer
+            self.app_indexer = XdgAppIndexer()
+
+        # .desktop文件解析缓存（与图标提取共享）
+        self.desktop_entries = get_desktop_entry_cache()
+
+        # 搜索索引：按使用频率排好序的应用快照，应用列表变化（包括启动后使用频率变化）时失效
+        self.search_index = AppSearchIndex(
+            self.config_manager.get_all_apps,
+            lambda app_ids: self.config_manager.frecency.rank(app_ids)
+        )
+        self.config_manager.app_list_updated.connect(self.search_index.invalidate)
+
         # 性能统计
         self.start_time = time.time()
         self.total_operations = 0
@@ -76,15 +102,13 @@ class AppManager:
             else:
                 # Linux/Mac系统尝试读取.desktop文件
                 if lnk_path.endswith('.desktop'):
-                    with open(lnk_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        for line in content.split('\n'):
-                            if line.startswith('Exec='):
-                                exec_path = line[5:].strip()
-                                # 移除可能的参数
-                                exec_path = exec_path.split(' ')[0]
-                                if os.path.exists(exec_path):
-                                    return exec_path
+                    entry = self.desktop_entries.get(lnk_path)
+                    command = entry.command() if entry else ''
+                    if command:
+                        # Exec中的命令可以是绝对路径，也可以是PATH中的命令名
+                        exec_path = command if os.path.isabs(command) else shutil.which(command)
+                        if exec_path and os.path.exists(exec_path):
+                            return exec_path
             return None
         except Exception as e:
             logger.warning(f"解析快捷方式失败 {lnk_path}: {e}")
@@ -297,27 +321,37 @@ class AppManager:
             return {"success": False, "message": f"删除应用失败: {str(e)}"}
 
     def remove_applications(self, app_ids: List[str]) -> Dict[str, Any]:
-        """批量删除应用"""
+        """批量删除应用（只保存一次、只发出一次列表更新信号）"""
         results = {
             "total": len(app_ids),
             "successful": 0,
             "failed": 0,
             "details": []
         }
+        self.total_operations += len(app_ids)
 
-        for app_id in app_ids:
-            result = self.remove_application(app_id)
-            results["details"].append({
-                "app_id": app_id,
-                "success": result["success"],
-                "message": result.get("message", "")
-            })
+        try:
+            names = {}
+            for app_id in app_ids:
+                app = self.config_manager.get_app(app_id)
+                if app:
+                    names[app_id] = app.name
+            removed = set(self.config_manager.remove_apps(list(names)))
+        except Exception as e:
+            logger.error(f"批量删除应用失败: {e}")
+            removed = set()
 
-            if result["success"]:
+        for app_id in app_ids:
+            if app_id in removed:
+                detail = {"app_id": app_id, "success": True, "message": f"已删除应用: {names[app_id]}"}
                 results["successful"] += 1
             else:
+                message = "删除应用失败" if app_id in names else "应用不存在"
+                detail = {"app_id": app_id, "success": False, "message": message}
                 results["failed"] += 1
+            results["details"].append(detail)
 
+        self.successful_operations += results["successful"]
         return results
 
     def update_application(self, app_id: str, **kwargs) -> Dict[str, Any]:
@@ -376,76 +410,110 @@ class AppManager:
             else:
                 apps = self.config_manager.get_all_apps()
 
-            result = []
-            for app_id, app in apps.items():
-                try:
-                    app_dict = asdict(app)
-                    app_dict['id'] = app_id
+            return self._to_app_dicts(apps.items())
 
-                    # 检查文件是否存在
-                    app_dict['exists'] = os.path.exists(app.path)
+        except Exception as e:
+            logger.error(f"获取应用列表失败: {e}")
+            return []
 
-                    # 确保有图标路径
-                    if not app_dict.get('icon_path') or app_dict['icon_path'] == "":
-                        app_dict['icon_path'] = f"image://icon/{app.path}"
+    def _to_app_dicts(self, items) -> List[Dict[str, Any]]:
+        """把 (应用ID, 应用) 转换为界面使用的字典"""
+        result = []
+        for app_id, app in items:
+            try:
+                app_dict = asdict(app)
+                app_dict['id'] = app_id
 
-                    result.append(app_dict)
-                except Exception as e:
-                    logger.warning(f"转换应用数据失败 {app_id}: {e}")
-                    continue
+                # 检查文件是否存在
+                app_dict['exists'] = self.path_status.exists(app.path)
 
-            return result
+                # 确保有图标路径
+                if not app_dict.get('icon_path'):
+                    app_dict['icon_path'] = f"image://icon/{app.path}"
 
-        except Exception as e:
-            logger.error(f"获取应用列表失败: {e}")
-            return []
+                result.append(app_dict)
+            except Exception as e:
+                logger.warning(f"转换应用数据失败 {app_id}: {e}")
+                continue
+        return result
 
     def search_applications(self, query: str, search_fields: List[str] = None) -> List[Dict[str, Any]]:
-        """搜索应用"""
+        """搜索应用，结果按使用频率排序，常用应用排在前面"""
         try:
             if not query or query.strip() == "":
                 return self.get_applications()
+            return self._to_app_dicts(self.search_index.search(query, search_fields))
 
-            search_fields = search_fields or ["name", "description", "tags", "path"]
-            query_lower = query.lower().strip()
-            apps = self.config_manager.get_all_apps()
-            results = []
+        except Exception as e:
+            logger.error(f"搜索应用失败: {e}")
+            return []
 
-            for app_id, app in apps.items():
-                try:
-                    match_found = False
-
-                    # 检查各个字段
-                    if "name" in search_fields and query_lower in app.name.lower():
-                        match_found = True
-                    elif "description" in search_fields and query_lower in app.description.lower():
-                        match_found = True
-                    elif "path" in search_fields and query_lower in app.path.lower():
-                        match_found = True
-                    elif "tags" in search_fields:
-                        for tag in app.tags:
-                            if query_lower in tag.lower():
-                                match_found = True
-                                break
-
-                    if match_found:
-                        app_dict = asdict(app)
-                        app_dict['id'] = app_id
-                        app_dict['exists'] = os.path.exists(app.path)
-
-                        if not app_dict.get('icon_path'):
-                            app_dict['icon_path'] = f"image://icon/{app.path}"
-
-                        results.append(app_dict)
-
-                except Exception as e:
-                    logger.debug(f"搜索应用时出错 {app_id}: {e}")
+    def iter_search_results(self, query: str, search_fields: List[str] = None,
+                            is_cancelled: Optional[Callable[[], bool]] = None,
+                            first_page: int = 50, chunk_size: int = 500,
+                            filters: Optional[Dict[str, Any]] = None):
+        """分块产生搜索结果（可在工作线程中调用），空查询时按添加顺序产生全部应用
+
+        filters不为空时只保留符合标签、收藏和最近使用组合条件的应用（条件见TagIndex.filter_mask）
+        """
+        allowed = set(self.config_manager.filter_apps(filters)) if filters else None
+        for items in self.search_index.iter_search(query, search_fields, first_page=first_page,
+                                                   chunk_size=chunk_size, is_cancelled=is_cancelled):
+            if allowed is not None:
+                items = [item for item in items if item[0] in allowed]
+                if not items:
                     continue
+            yield self._to_app_dicts(items)
 
-            return results
+    def filter_applications(self, filters: Dict[str, Any], facet_limit: Optional[int] = None) -> Dict[str, Any]:
+        """按标签（与/或/非）、收藏和最近使用的组合筛选应用，同时返回结果的分面计数"""
+        try:
+            apps = self.config_manager.filter_apps(filters)
+            return {
+                "success": True,
+                "apps": self._to_app_dicts(apps.items()),
+                "facets": self.config_manager.get_tag_facets(filters, facet_limit)
+            }
+        except Exception as e:
+            logger.error(f"筛选应用失败: {e}")
+            return {"success": False, "message": f"筛选应用失败: {str(e)}", "apps": [], "facets": {}}
 
+    def rescan_app_index(self, verify_files: bool = True) -> Dict[str, Any]:
+        """重新扫描XDG应用目录（只解析变化的文件）"""
+        if self.app_indexer is None:
+            return {"success": False, "message": "当前系统不支持应用目录索引"}
+        try:
+            result = self.app_indexer.rescan(verify_files)
+            return {"success": True, **result}
         except Exception as e:
-            logger.error(f"搜索应用失败: {e}")
+            logger.error(f"扫描应用目录失败: {e}")
+            return {"success": False, "message": f"扫描应用目录失败: {str(e)}"}
+
+    def discover_applications(self, query: str = "", limit: int = 50) -> List[Dict[str, Any]]:
+        """搜索应用目录索引中尚未添加的应用"""
+        if self.app_indexer is None:
+            return []
+        try:
+            added = {os.path.normcase(app.path) for app in self.config_manager.get_all_apps().values()}
+            results = []
+            for entry in self.app_indexer.search(query, limit + len(added)):
+                if os.path.normcase(entry['path']) in added:
+                    continue
+                icon = entry['icon']
+                results.append({
+                    'name': entry['name'],
+                    'path': entry['path'],
+                    'description': entry['comment'],
+                    'tags': entry['categories'],
+                    'icon_path': f"image://icon/{icon if os.path.isabs(icon) else entry['path']}",
+                    'desktop_id': entry['id'],
+                    'discoverable': True
+                })
+                if len(results) >= limit:
+                    break
+            return results
+        except Exception as e:
+            logger.error(f"搜索可发现应用失败: {e}")
             return []
 
     def get_application_by_id(self, app_id: str) -> Optional[Dict[str, Any]]:
@@ -455,7 +523,7 @@ class AppManager:
             if app:
                 app_dict = asdict(app)
                 app_dict['id'] = app_id
-                app_dict['exists'] = os.path.exists(app.path)
+                app_dict['exists'] = self.path_status.exists(app.path)
                 return app_dict
             return None
         except Exception as e:
@@ -471,12 +539,13 @@ class AppManager:
             if not app:
                 return {"success": False, "message": "应用不存在"}
 
-            # 检查文件是否存在
-            if not os.path.exists(app.path):
+            # 检查文件是否存在（启动前重新读取，同时更新缓存）
+            if not self.path_status.refresh(app.path).exists:
                 return {"success": False, "message": "应用文件不存在"}
 
             # 更新使用统计
             current_time = time.time()
+            self.config_manager.frecency.record(app_id, current_time)
             self.config_manager.update_app(
                 app_id,
                 last_used=current_time,
@@ -514,7 +583,9 @@ class AppManager:
                         subprocess.Popen(['open', '-a', app.path])
                 else:  # Linux
                     if app.path.endswith('.desktop'):
-                        subprocess.Popen(['gtk-launch', app.path])
+                        result = self._launch_desktop_entry(app.path)
+                        if not result["success"]:
+                            return result
                     else:
                         subprocess.Popen(['xdg-open', app.path])
 
@@ -534,6 +605,48 @@ class AppManager:
             logger.error(f"启动应用时出错: {e}")
             return {"success": False, "message": f"启动应用失败: {str(e)}"}
 
+    @staticmethod
+    def _desktop_launcher_argv(path: str) -> List[str]:
+        """通过系统启动器（gio / gtk-launch）启动.desktop文件的命令，都不可用时返回空列表"""
+        if shutil.which('gio'):
+            return ['gio', 'launch', path]
+        if shutil.which('gtk-launch'):
+            # gtk-launch 接受桌面文件ID
+            return ['gtk-launch', os.path.basename(path)]
+        return []
+
+    def _launch_desktop_entry(self, path: str) -> Dict[str, Any]:
+        """按.desktop文件的Exec直接启动；D-Bus激活或没有Exec的条目交给系统启动器"""
+        import subprocess
+
+        entry = self.desktop_entries.get(path)
+        if entry is None:
+            return {"success": False, "message": "无法读取.desktop文件"}
+
+        if not entry.is_installed():
+            return {"success": False, "message": f"程序未安装: {entry.get('TryExec')}"}
+
+        # 链接类型的条目交给默认程序打开
+        if entry.type == 'Link' and entry.get('URL'):
+            argv = ['xdg-open', entry.get('URL')]
+        elif entry.dbus_activatable:
+            argv = self._desktop_launcher_argv(path) or entry.build_argv()
+        else:
+            argv = entry.build_argv() or self._desktop_launcher_argv(path)
+        if not argv:
+            return {"success": False, "message": ".desktop文件中没有可执行的命令"}
+
+        working_dir = entry.working_dir
+        subprocess.Popen(
+            argv,
+            cwd=working_dir if working_dir and os.path.isdir(working_dir) else None,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        return {"success": True, "message": f"已启动: {entry.localized('Name') or path}"}
+
     def get_app_stats(self) -> Dict[str, Any]:
         """获取应用统计信息"""
         try:
@@ -590,27 +703,60 @@ class AppManager:
                 'uptime': 0
             }
 
-    def cleanup_missing_apps(self) -> Dict[str, Any]:
-        """清理不存在的应用"""
-        try:
-            apps = self.config_manager.get_all_apps()
-            missing_apps = []
+    def sweep_missing_apps(self, max_workers: int = 16, timeout: float = 2.0,
+                           progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """并发检查所有应用路径是否存在
+
+        每个路径单独计时，超过timeout仍未返回（如网络驱动器无响应）的路径记为超时、不视为不存在，
+        无响应的卷不影响其他卷上路径的检查（见stat_paths）；progress(已检查数, 总数) 在调用线程中被调用
+        """
+        apps = self.config_manager.get_all_apps()
+        path_apps: Dict[str, List[str]] = {}
+        for app_id, app in apps.items():
+            path_apps.setdefault(app.path, []).append(app_id)
+
+        paths = list(path_apps)
+        statuses, timed_out = stat_paths(paths, timeout, max_workers, progress)
+
+        # 检查结果同步到路径状态缓存
+        self.path_status.update_statuses(statuses)
+
+        missing_paths = [path for path, status in statuses.items() if not status.exists]
+        missing_apps = [app_id for path in missing_paths for app_id in path_apps[path]]
+        return {
+            "checked": len(statuses),
+            "total": len(paths),
+            "missing_apps": missing_apps,
+            "timed_out_paths": timed_out
+        }
 
-            for app_id, app in apps.items():
-                if not os.path.exists(app.path):
-                    missing_apps.append(app_id)
+    def cleanup_missing_apps(self, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """清理不存在的应用（并发检查，一次性批量删除）"""
+        try:
+            sweep = self.sweep_missing_apps(progress=progress)
+            return self.remove_missing_apps(sweep)
+        except Exception as e:
+            logger.error(f"清理不存在应用失败: {e}")
+            return {"success": False, "message": f"清理不存在应用失败: {str(e)}"}
 
+    def remove_missing_apps(self, sweep: Dict[str, Any]) -> Dict[str, Any]:
+        """根据sweep_missing_apps的结果批量删除不存在的应用"""
+        try:
+            missing_apps = sweep.get("missing_apps", [])
+            timed_out = len(sweep.get("timed_out_paths", []))
             if missing_apps:
                 result = self.remove_applications(missing_apps)
                 return {
                     "success": True,
-                    "cleaned_count": len(missing_apps),
+                    "cleaned_count": result["successful"],
+                    "timed_out_count": timed_out,
                     "details": result
                 }
             else:
                 return {
                     "success": True,
                     "cleaned_count": 0,
+                    "timed_out_count": timed_out,
                     "message": "没有发现不存在的应用"
                 }
 
@@ -759,4 +905,4 @@ class AppManager:
 
         except Exception as e:
             logger.error(f"管理快捷窗口应用失败: {e}")
-            return {"success": False, "message": f"管理快捷窗口应用失败: {str(e)}"}
\ No newline at end of file
+            return {"success": False, "message": f"管理快捷窗口应用失败: {str(e)}"}
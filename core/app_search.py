@@ -0,0 +1,177 @@
+"""
+应用搜索索引
+保存按使用频率排好序的应用快照和各搜索字段的小写文本列，搜索按排名顺序扫描，
+匹配满第一页就交出结果，其余分块继续；调用方可随时取消过期的搜索
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("name", "description", "tags", "path")
+
+# 每扫描这么多个应用检查一次是否已取消
+SCAN_BLOCK = 2048
+
+
+class AppSnapshot:
+    """某一时刻的应用快照（只读，可在多个线程中共享）"""
+
+    def __init__(self, version: int, apps: Dict[str, Any], ranked_ids: Sequence[str]):
+        self.version = version
+        self.apps = apps
+        self.ranked_ids = tuple(ranked_ids)
+        # 字段 -> 与ranked_ids对齐的小写文本，首次搜索该字段时生成
+        self._columns: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+
+    def column(self, field: str) -> Tuple[str, ...]:
+        """获取字段的小写文本列（标签以\\0连接）"""
+        with self._lock:
+            column = self._columns.get(field)
+            if column is None:
+                apps = self.apps
+                if field == "tags":
+                    column = tuple("\0".join(apps[app_id].tags).lower() for app_id in self.ranked_ids)
+                else:
+                    column = tuple((getattr(apps[app_id], field, "") or "").lower() for app_id in self.ranked_ids)
+                self._columns[field] = column
+            return column
+
+
+class AppSearchIndex:
+    """应用搜索索引（线程安全）
+
+    应用列表变化或使用频率变化时调用invalidate()，下次搜索时重新生成快照。
+    输入追加字符时新查询包含上一次的查询，只在上一次的匹配结果中继续筛选。
+    """
+
+    def __init__(self, get_apps: Callable[[], Dict[str, Any]], rank: Callable[[Iterable[str]], List[str]]):
+        self._get_apps = get_apps
+        self._rank = rank
+        self._snapshot: Optional[AppSnapshot] = None
+        self._version = 0
+        # 上一次完整扫描 (快照版本, 字段, 查询, 匹配位置)
+        self._last_scan: Optional[Tuple[int, Tuple[str, ...], str, List[int]]] = None
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'searches': 0,
+            'snapshots': 0,
+            'refined': 0,
+            'cancelled': 0
+        }
+
+    def invalidate(self):
+        """应用列表已变化，丢弃快照"""
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+            self._last_scan = None
+
+    def snapshot(self) -> AppSnapshot:
+        """获取当前快照，失效时重新生成"""
+        with self._lock:
+            snapshot = self._snapshot
+            version = self._version
+        if snapshot is not None:
+            return snapshot
+
+        apps = self._get_apps()
+        snapshot = AppSnapshot(version, apps, self._rank(apps))
+        with self._lock:
+            self.stats['snapshots'] += 1
+            # 生成期间列表又有变化时不保存，下次重新生成
+            if self._version == version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def iter_search(self, query: str, fields: Optional[Iterable[str]] = None, first_page: int = 50,
+                    chunk_size: int = 500, is_cancelled: Optional[Callable[[], bool]] = None
+                    ) -> Iterator[List[Tuple[str, Any]]]:
+        """分块产生匹配的 (应用ID, 应用)
+
+        有查询时按使用频率从高到低，第一块最多first_page个，之后每块chunk_size个；
+        空查询按添加顺序产生全部应用。is_cancelled返回True时停止。
+        """
+        cancelled = is_cancelled or (lambda: False)
+        query = (query or "").strip().lower()
+        fields = tuple(field for field in (fields or SEARCH_FIELDS) if field in SEARCH_FIELDS)
+        snapshot = self.snapshot()
+        with self._lock:
+            self.stats['searches'] += 1
+
+        if not query:
+            items = list(snapshot.apps.items())
+            for start in range(0, len(items), chunk_size):
+                if cancelled():
+                    self._count_cancelled()
+                    return
+                yield items[start:start + chunk_size]
+            return
+
+        columns = [snapshot.column(field) for field in fields]
+        candidates: Sequence[int] = range(len(snapshot.ranked_ids))
+        with self._lock:
+            last_scan = self._last_scan
+        if (last_scan is not None and last_scan[0] == snapshot.version
+                and last_scan[1] == fields and last_scan[2] in query):
+            candidates = last_scan[3]
+            with self._lock:
+                self.stats['refined'] += 1
+
+        matches: List[int] = []
+        pending: List[int] = []
+        limit = max(1, first_page)
+        for start in range(0, len(candidates), SCAN_BLOCK):
+            if cancelled():
+                self._count_cancelled()
+                return
+            block = candidates[start:start + SCAN_BLOCK]
+            if len(columns) == 1:
+                column = columns[0]
+                found = [position for position in block if query in column[position]]
+            else:
+                found = [position for position in block
+                         if any(query in column[position] for column in columns)]
+            matches.extend(found)
+            pending.extend(found)
+            while len(pending) >= limit:
+                yield self._items(snapshot, pending[:limit])
+                pending = pending[limit:]
+                limit = max(1, chunk_size)
+                if cancelled():
+                    self._count_cancelled()
+                    return
+
+        with self._lock:
+            if self._version == snapshot.version:
+                self._last_scan = (snapshot.version, fields, query, matches)
+        if pending:
+            yield self._items(snapshot, pending)
+
+    def search(self, query: str, fields: Optional[Iterable[str]] = None) -> List[Tuple[str, Any]]:
+        """同步搜索，返回全部匹配的 (应用ID, 应用)"""
+        results = []
+        for chunk in self.iter_search(query, fields, chunk_size=4096):
+            results.extend(chunk)
+        return results
+
+    @staticmethod
+    def _items(snapshot: AppSnapshot, positions: List[int]) -> List[Tuple[str, Any]]:
+        ranked_ids = snapshot.ranked_ids
+        apps = snapshot.apps
+        return [(ranked_ids[position], apps[ranked_ids[position]]) for position in positions]
+
+    def _count_cancelled(self):
+        with self._lock:
+            self.stats['cancelled'] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计信息"""
+        with self._lock:
+            snapshot = self._snapshot
+            return {**self.stats, 'apps': len(snapshot.apps) if snapshot is not None else 0}
@@ -0,0 +1,334 @@
+"""
+毛玻璃背景预渲染缓存
+在工作线程中把背景图片缩放、模糊、叠加亮度/色调/噪声并裁剪圆角，
+按 (图片, 窗口尺寸, 模糊半径, 色调...) 缓存到内存和磁盘，QML直接显示静态图片
+"""
+
+import os
+import math
+import time
+import random
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from dataclasses import dataclass, astuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any
+
+from PySide6.QtGui import QImage, QImageReader, QPainter, QColor, QBrush, QPainterPath
+from PySide6.QtCore import QObject, Signal, Qt, QRectF, QSize
+
+# 尝试导入NumPy用于高质量的高斯模糊近似
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 渲染算法改变时递增，使旧的磁盘缓存失效
+RENDER_VERSION = 1
+
+
+@dataclass(frozen=True)
+class BackgroundParams:
+    """预渲染背景参数"""
+    image_path: str
+    width: int
+    height: int
+    radius_blur: int = 20
+    color_tint: str = "#FFFFFF"
+    opacity_tint: float = 0.3
+    luminosity: float = 0.1
+    opacity_noise: float = 0.02
+    enable_noise: bool = True
+    corner_radius: int = 8
+
+
+class BackgroundCache(QObject):
+    """预渲染背景缓存"""
+
+    # 渲染完成（缓存键, 图片文件路径，失败时为空字符串），在工作线程中发出
+    background_ready = Signal(str, str)
+
+    cache_dir0 = Path(__file__).parent.parent / "cache" / "backgrounds"
+
+    def __init__(self, cache_dir: str = cache_dir0, max_memory_items: int = 8, max_disk_items: int = 16):
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+
+        # 缓存键 -> 渲染结果
+        self._memory_cache: "OrderedDict[str, QImage]" = OrderedDict()
+        self._pending = set()
+        self._lock = threading.RLock()
+        self._noise_tile: Optional[QImage] = None
+
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'renders': 0,
+            'render_ms': 0.0
+        }
+
+        # 单个工作线程，背景很少变化，不需要并行渲染
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    @staticmethod
+    def resolve_image_path(image_path: str) -> str:
+        """把配置中的图片路径（可能带file://前缀或为相对路径）转换为绝对路径"""
+        if image_path.startswith("file:///") and os.name == "nt":
+            image_path = image_path[8:]
+        elif image_path.startswith("file://"):
+            image_path = image_path[7:]
+        path = Path(image_path)
+        if not path.is_absolute():
+            path = Path(__file__).parent.parent / path
+        return str(path)
+
+    def cache_key(self, params: BackgroundParams) -> str:
+        """生成缓存键，图片修改后自动失效"""
+        image_path = self.resolve_image_path(params.image_path)
+        try:
+            stat = os.stat(image_path)
+            file_sig = f"{stat.st_mtime_ns}_{stat.st_size}"
+        except OSError:
+            file_sig = "missing"
+        key_data = f"{RENDER_VERSION}|{os.path.normcase(os.path.abspath(image_path))}|{file_sig}|{astuple(params)[1:]}"
+        return hashlib.md5(key_data.encode('utf-8')).hexdigest()
+
+    def _get_disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.png"
+
+    def get_cached_path(self, params: BackgroundParams) -> Optional[str]:
+        """查找已渲染的背景，命中时返回图片文件路径"""
+        key = self.cache_key(params)
+        disk_path = self._get_disk_path(key)
+        with self._lock:
+            if key in self._memory_cache:
+                self._memory_cache.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return str(disk_path)
+
+        if disk_path.exists():
+            image = QImage(str(disk_path))
+            if not image.isNull():
+                self._add_to_memory_cache(key, image)
+                self.stats['disk_hits'] += 1
+                return str(disk_path)
+        return None
+
+    def request(self, params: BackgroundParams) -> Optional[str]:
+        """获取预渲染背景，未缓存时在工作线程中渲染并返回None，完成后发出background_ready"""
+        cached = self.get_cached_path(params)
+        if cached:
+            return cached
+
+        key = self.cache_key(params)
+        with self._lock:
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+        self._executor.submit(self._render_job, key, params)
+        return None
+
+    def _render_job(self, key: str, params: BackgroundParams):
+        """工作线程：渲染并写入缓存"""
+        path = ""
+        try:
+            start = time.perf_counter()
+            image = self.render(params)
+            if image.isNull():
+                raise ValueError(f"无法加载背景图片: {params.image_path}")
+
+            disk_path = self._get_disk_path(key)
+            temp_path = disk_path.with_suffix(".tmp.png")
+            if image.save(str(temp_path), "PNG"):
+                os.replace(temp_path, disk_path)
+                path = str(disk_path)
+                self._prune_disk_cache()
+            self._add_to_memory_cache(key, image)
+
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stats['renders'] += 1
+            self.stats['render_ms'] += elapsed
+            logger.info(f"背景预渲染完成: {params.width}x{params.height}, 模糊半径 {params.radius_blur}, 耗时 {elapsed:.1f} ms")
+        except Exception as e:
+            logger.error(f"背景预渲染失败: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+            self.background_ready.emit(key, path)
+
+    def _add_to_memory_cache(self, key: str, image: QImage):
+        with self._lock:
+            self._memory_cache[key] = image
+            self._memory_cache.move_to_end(key)
+            while len(self._memory_cache) > self.max_memory_items:
+                self._memory_cache.popitem(last=False)
+
+    def _prune_disk_cache(self):
+        """只保留最近生成的若干个背景文件"""
+        try:
+            files = sorted(self.cache_dir.glob("*.png"), key=lambda f: f.stat().st_mtime, reverse=True)
+            for old_file in files[self.max_disk_items:]:
+                old_file.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"清理背景缓存失败: {e}")
+
+    def render(self, params: BackgroundParams) -> QImage:
+        """渲染背景：等比裁剪填充 -> 模糊 -> 亮度/色调/噪声叠加 -> 圆角裁剪（QImage可在工作线程中使用）"""
+        width = max(1, int(params.width))
+        height = max(1, int(params.height))
+
+        # 解码时直接缩小到覆盖窗口所需的尺寸，不生成原始分辨率的位图
+        reader = QImageReader(self.resolve_image_path(params.image_path))
+        reader.setAutoTransform(True)
+        image_size = reader.size()
+        if image_size.isValid():
+            scale = min(1.0, max(width / image_size.width(), height / image_size.height()))
+            if scale < 1.0:
+                reader.setScaledSize(QSize(max(width, math.ceil(image_size.width() * scale)),
+                                           max(height, math.ceil(image_size.height() * scale))))
+        source = reader.read()
+        if source.isNull():
+            return QImage()
+
+        # 与Image.PreserveAspectCrop一致：等比放大到覆盖整个窗口后居中裁剪
+        scaled = source.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        scaled = scaled.copy((scaled.width() - width) // 2, (scaled.height() - height) // 2, width, height)
+        blurred = self._blur(scaled, params.radius_blur)
+
+        result = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        result.fill(Qt.transparent)
+
+        painter = QPainter(result)
+        try:
+            painter.setRenderHint(QPainter.Antialiasing)
+            clip = QPainterPath()
+            clip.addRoundedRect(QRectF(0, 0, width, height), params.corner_radius, params.corner_radius)
+            painter.setClipPath(clip)
+
+            painter.drawImage(0, 0, blurred)
+
+            # 亮度层
+            painter.fillRect(0, 0, width, height, QColor(255, 255, 255, self._alpha(params.luminosity)))
+
+            # 色调层
+            tint = QColor(params.color_tint)
+            if not tint.isValid():
+                tint = QColor(128, 128, 128)
+            tint.setAlpha(self._alpha(params.opacity_tint))
+            painter.fillRect(0, 0, width, height, tint)
+
+            # 噪声层
+            if params.enable_noise and params.opacity_noise > 0:
+                painter.setOpacity(min(1.0, params.opacity_noise))
+                painter.fillRect(0, 0, width, height, QBrush(self._get_noise_tile()))
+        finally:
+            painter.end()
+        return result
+
+    @staticmethod
+    def _alpha(value: float) -> int:
+        return max(0, min(255, int(round(float(value) * 255))))
+
+    def _get_noise_tile(self) -> QImage:
+        """固定种子的灰度噪声图块，保证每次渲染结果相同"""
+        if self._noise_tile is None:
+            rng = random.Random(0)
+            tile = QImage(64, 64, QImage.Format_ARGB32)
+            for y in range(64):
+                for x in range(64):
+                    gray = rng.randint(0, 255)
+                    tile.setPixel(x, y, QColor(gray, gray, gray, 255).rgba())
+            self._noise_tile = tile
+        return self._noise_tile
+
+    @classmethod
+    def _blur(cls, image: QImage, radius: int) -> QImage:
+        """高斯模糊近似，标准差与Qt5Compat GaussianBlur的默认deviation一致"""
+        if radius <= 0:
+            return image
+        sigma = (radius + 1) / 3.3333
+        if NUMPY_AVAILABLE:
+            return cls._blur_numpy(image, sigma)
+        return cls._blur_scaled(image, sigma)
+
+    @staticmethod
+    def _box_sizes(sigma: float, passes: int = 3) -> list:
+        """三次盒式模糊逼近高斯模糊时各次的盒子宽度"""
+        ideal = math.sqrt(12 * sigma * sigma / passes + 1)
+        lower = int(math.floor(ideal))
+        if lower % 2 == 0:
+            lower -= 1
+        upper = lower + 2
+        m = round((12 * sigma * sigma - passes * lower * lower - 4 * passes * lower - 3 * passes) / (-4 * lower - 4))
+        return [lower if i < m else upper for i in range(passes)]
+
+    @classmethod
+    def _blur_numpy(cls, image: QImage, sigma: float) -> QImage:
+        """用累加和实现的可分离盒式模糊，耗时与模糊半径无关"""
+        image = image.convertToFormat(QImage.Format_RGBA8888_Premultiplied)
+        width, height = image.width(), image.height()
+        buffer = np.frombuffer(image.constBits(), dtype=np.uint8)
+        pixels = buffer.reshape(height, image.bytesPerLine())[:, :width * 4].reshape(height, width, 4)
+        data = pixels.astype(np.float32)
+
+        for size in cls._box_sizes(sigma):
+            r = (size - 1) // 2
+            if r <= 0:
+                continue
+            for axis in (0, 1):
+                pad = [(0, 0)] * 3
+                pad[axis] = (r + 1, r)
+                summed = np.cumsum(np.pad(data, pad, mode='edge'), axis=axis, dtype=np.float32)
+                if axis == 0:
+                    data = (summed[2 * r + 1:] - summed[:-2 * r - 1]) / (2 * r + 1)
+                else:
+                    data = (summed[:, 2 * r + 1:] - summed[:, :-2 * r - 1]) / (2 * r + 1)
+
+        output = np.ascontiguousarray(np.clip(data + 0.5, 0, 255).astype(np.uint8))
+        return QImage(output.data, width, height, width * 4, QImage.Format_RGBA8888_Premultiplied).copy()
+
+    @staticmethod
+    def _blur_scaled(image: QImage, sigma: float) -> QImage:
+        """没有NumPy时的近似：平滑缩小后再放大"""
+        width, height = image.width(), image.height()
+        factor = max(1.0, sigma)
+        small = image.scaled(max(1, int(width / factor)), max(1, int(height / factor)),
+                             Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        return small.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+    def clear(self):
+        """清空内存和磁盘缓存"""
+        with self._lock:
+            self._memory_cache.clear()
+        for file in self.cache_dir.glob("*.png"):
+            try:
+                file.unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._lock:
+            memory_items = len(self._memory_cache)
+            pending = len(self._pending)
+        return {
+            **self.stats,
+            'memory_items': memory_items,
+            'pending': pending,
+            'numpy': NUMPY_AVAILABLE,
+            'cache_dir': str(self.cache_dir)
+        }
+
+    def shutdown(self):
+        """停止工作线程"""
+        self._executor.shutdown(wait=False)
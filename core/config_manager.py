@@ -18,6 +18,9 @@ from PySide6.QtCore import QObject, Signal
 from PySide6.QtQml import QJSValue
 import copy
 
+from .frecency import FrecencyEngine
+from .tag_index import TagIndex
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -63,6 +66,8 @@ class QuickWindowConfig:
     background_opacity: float = 0.3  # 专门用于背景毛玻璃效果的透明度
     rows: int = 1  # 窗口行数
     cols: int = 1  # 窗口列数
+    auto_order: bool = False  # 按使用频率自动排序快捷窗口应用
+    paged: bool = False  # 分页显示，超过 行数×列数 的应用可通过滚轮翻页
 
 
 @dataclass
@@ -77,6 +82,7 @@ class MainWindowConfig:
     background_color: str = "#FFFFFF"  # 背景颜色
     luminosity: float = 0.1  # 亮度
     enable_noise: bool = True  # 启用噪声效果
+    static_background: bool = True  # 预渲染毛玻璃背景（关闭后每帧实时模糊）
     auto_start: bool = False  # 开机自启动
     show_on_startup: bool = True  # 启动时显示主窗口
     hide_on_startup_if_auto: bool = False  # 开机自启动时是否隐藏主窗口
@@ -107,9 +113,10 @@ class ConfigManager(QObject):
             super().__init__()
             self._initialized = True
 
-            # 使用项目根目录作为配置目录
+            # 使用项目根目录作为配置目录，可通过环境变量指定（用于基准测试）
             self.project_root = Path(__file__).parent.parent
-            self.config_dir = self.project_root / "config"
+            config_dir = os.environ.get("QUICKLAUNCHER_CONFIG_DIR")
+            self.config_dir = Path(config_dir) if config_dir else self.project_root / "config"
             self.config_file = self.config_dir / "config.json"
             self.backup_dir = self.config_dir / "backups"
 
@@ -122,12 +129,18 @@ class ConfigManager(QObject):
             self._apps: Dict[str, AppConfig] = {}
             self._quick_config: QuickWindowConfig = QuickWindowConfig()
             self._main_window_config: MainWindowConfig = MainWindowConfig()
+            self._frecency: FrecencyEngine = FrecencyEngine()
+            # 标签/收藏/最近使用的位图索引，随应用的增删改同步更新
+            self._tag_index: TagIndex = TagIndex()
 
             # 添加保存状态追踪
             self._is_saving = False
             self._pending_save = False
             self._last_save_time = 0
             self._save_lock = threading.RLock()
+            # 保存统计：请求次数和实际写入文件次数
+            self.save_request_count = 0
+            self.save_write_count = 0
 
             # 初始化数据
             self._load_config()
@@ -154,6 +167,9 @@ class ConfigManager(QObject):
         # 加载应用配置
         self._load_apps()
 
+        # 加载使用频率评分
+        self._load_frecency()
+
         # 加载快捷窗口配置
         self._load_quick_config()
 
@@ -175,8 +191,11 @@ class ConfigManager(QObject):
                 "max_cache_size_mb": 500,
                 "cache_days_to_live": 7,
                 "min_save_interval": 1,  # 最小保存间隔（秒）
-                "max_pending_time": 5   # 最大延迟保存时间（秒）
-            }
+                "max_pending_time": 5,   # 最大延迟保存时间（秒）
+                "frecency_half_life_days": 7,  # 使用频率评分半衰期（天）
+                "frecency_max_events": 500  # 保留的启动记录数量
+            },
+            "frecency": {}
         }
 
     def _load_apps(self):
@@ -205,6 +224,25 @@ class ConfigManager(QObject):
             except Exception as e:
                 logger.error(f"加载应用配置失败 {app_id}: {e}")
 
+        self._tag_index.rebuild(self._apps)
+
+    def _load_frecency(self):
+        """加载使用频率评分"""
+        settings = self._config.get("settings", {})
+        try:
+            self._frecency = FrecencyEngine(
+                half_life_days=settings.get("frecency_half_life_days", 7),
+                max_events=settings.get("frecency_max_events", 500)
+            )
+            self._frecency.load(self._config.get("frecency", {}))
+        except Exception as e:
+            logger.error(f"加载使用频率评分失败: {e}")
+            self._frecency = FrecencyEngine()
+
+        # 旧配置没有评分时，根据使用次数和最后使用时间生成初始评分
+        for app_id, app in self._apps.items():
+            self._frecency.seed(app_id, app.usage_count, app.last_used)
+
     def _load_quick_config(self):
         """加载快捷窗口配置"""
         quick_data = self._config.get("quick_window", {})
@@ -247,7 +285,7 @@ class ConfigManager(QObject):
                                 setattr(temp_config, key, 1)  # 默认1行
                             elif key == "cols":
                                 setattr(temp_config, key, 5)  # 默认5列
-                    elif key in ["auto_start", "show_on_startup", "show_labels", "use_system_icons", "show_favorites", "animation_enabled"]:
+                    elif key in ["auto_start", "show_on_startup", "show_labels", "use_system_icons", "show_favorites", "animation_enabled", "auto_order", "paged"]:
                         # 确保布尔值是布尔类型
                         if isinstance(value, bool):
                             setattr(temp_config, key, value)
@@ -332,7 +370,7 @@ class ConfigManager(QObject):
                                 setattr(temp_config, key, "")  # 默认值
                             elif key == "background_color":
                                 setattr(temp_config, key, "#FFFFFF")  # 默认值
-                    elif key in ["enable_noise", "auto_start", "show_on_startup", "hide_on_startup_if_auto"]:
+                    elif key in ["enable_noise", "static_background", "auto_start", "show_on_startup", "hide_on_startup_if_auto"]:
                         # 确保这些是布尔类型
                         if isinstance(value, bool):
                             setattr(temp_config, key, value)
@@ -393,6 +431,7 @@ class ConfigManager(QObject):
         with self._save_lock:
             import time
             current_time = time.time()
+            self.save_request_count += 1
             
             # 检查是否需要跳过保存（最小间隔检查）
             min_interval = self._config.get("settings", {}).get("min_save_interval", 1)
@@ -465,6 +504,7 @@ class ConfigManager(QObject):
             self._config["apps"] = apps_data
             self._config["quick_window"] = clean_quick_config_data
             self._config["main_window"] = clean_main_window_config_data
+            self._config["frecency"] = self._frecency.to_dict()
 
             # 保存到文件
             with open(self.config_file, 'w', encoding='utf-8') as f:
@@ -472,6 +512,7 @@ class ConfigManager(QObject):
 
             logger.info("配置保存成功")
             self._last_save_time = current_time
+            self.save_write_count += 1
             self.config_saved.emit(True)
             return True
 
@@ -523,6 +564,7 @@ class ConfigManager(QObject):
                 app.id = str(uuid.uuid4())
 
             self._apps[app.id] = app
+            self._tag_index.update(app.id, app)
 
             # 自动保存
             if self._config.get("settings", {}).get("auto_save", True):
@@ -539,11 +581,15 @@ class ConfigManager(QObject):
         """移除应用"""
         if app_id in self._apps:
             del self._apps[app_id]
+            self._tag_index.remove(app_id)
 
             # 从快捷窗口排序中移除
             if app_id in self._quick_config.app_order:
                 self._quick_config.app_order.remove(app_id)
 
+            # 移除使用频率评分
+            self._frecency.remove(app_id)
+
             # 自动保存
             if self._config.get("settings", {}).get("auto_save", True):
                 self.save()
@@ -552,12 +598,38 @@ class ConfigManager(QObject):
             return True
         return False
 
+    def remove_apps(self, app_ids: List[str]) -> List[str]:
+        """批量移除应用，只保存一次并只发出一次列表更新信号，返回实际移除的应用ID"""
+        removed = [app_id for app_id in dict.fromkeys(app_ids) if app_id in self._apps]
+        if not removed:
+            return []
+
+        removed_set = set(removed)
+        for app_id in removed:
+            del self._apps[app_id]
+            self._tag_index.remove(app_id)
+            # 移除使用频率评分
+            self._frecency.remove(app_id)
+
+        # 从快捷窗口排序中移除
+        self._quick_config.app_order[:] = [
+            app_id for app_id in self._quick_config.app_order if app_id not in removed_set
+        ]
+
+        # 自动保存
+        if self._config.get("settings", {}).get("auto_save", True):
+            self.save()
+
+        self.app_list_updated.emit()
+        return removed
+
     def update_app(self, app_id: str, **kwargs):
         """更新应用"""
         if app_id in self._apps:
             for key, value in kwargs.items():
                 if hasattr(self._apps[app_id], key):
                     setattr(self._apps[app_id], key, value)
+            self._tag_index.update(app_id, self._apps[app_id])
 
             # 自动保存
             if self._config.get("settings", {}).get("auto_save", True):
@@ -576,17 +648,28 @@ class ConfigManager(QObject):
 
     def get_apps_by_tag(self, tag: str) -> Dict[str, AppConfig]:
         """根据标签获取应用"""
-        return {
-            app_id: app for app_id, app in self._apps.items()
-            if tag in app.tags
-        }
+        return self._apps_in(self._tag_index.tag_mask(tag))
 
     def get_favorite_apps(self) -> Dict[str, AppConfig]:
         """获取收藏的应用"""
-        return {
-            app_id: app for app_id, app in self._apps.items()
-            if app.favorite
-        }
+        return self._apps_in(self._tag_index.favorite_mask())
+
+    def filter_apps(self, filters: Dict[str, Any]) -> Dict[str, AppConfig]:
+        """按标签（与/或/非）、收藏和最近使用的组合筛选应用，条件见TagIndex.filter_mask"""
+        return self._apps_in(self._tag_index.filter_mask(filters))
+
+    def get_tag_facets(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        """筛选结果中各标签、收藏和最近使用的应用数量"""
+        return self._tag_index.facets(self._tag_index.filter_mask(filters), limit)
+
+    def _apps_in(self, mask: int) -> Dict[str, AppConfig]:
+        apps = self._apps
+        return {app_id: apps[app_id] for app_id in self._tag_index.ids(mask) if app_id in apps}
+
+    @property
+    def tag_index(self) -> TagIndex:
+        """标签位图索引"""
+        return self._tag_index
 
     def search_apps(self, query: str) -> Dict[str, AppConfig]:
         """搜索应用"""
@@ -611,6 +694,18 @@ class ConfigManager(QObject):
         )
         return {app.id: app for app in sorted_apps[:limit]}
 
+    @property
+    def frecency(self) -> FrecencyEngine:
+        """使用频率排序引擎"""
+        return self._frecency
+
+    def get_quick_app_order(self) -> List[str]:
+        """获取快捷窗口应用顺序，开启自动排序时按使用频率排列"""
+        app_order = list(self._quick_config.app_order)
+        if self._quick_config.auto_order:
+            return self._frecency.rank(app_order)
+        return app_order
+
     # 快捷窗口配置
     @property
     def quick_config(self) -> QuickWindowConfig:
@@ -816,7 +911,9 @@ class ConfigManager(QObject):
         """清空所有应用"""
         try:
             self._apps.clear()
+            self._tag_index.rebuild(self._apps)
             self._quick_config.app_order.clear()
+            self._frecency.clear()
             self.save()
             self.app_list_updated.emit()
             return True
@@ -829,7 +926,9 @@ class ConfigManager(QObject):
         try:
             self._config = self._get_default_config()
             self._apps.clear()
+            self._tag_index.rebuild(self._apps)
             self._quick_config = QuickWindowConfig()
+            self._frecency.clear()
             self.save()
             self.app_list_updated.emit()
             self.quick_config_updated.emit()
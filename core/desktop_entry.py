@@ -0,0 +1,416 @@
+"""
+.desktop文件解析
+按桌面项规范解析全部分组、本地化键、转义和Exec中的引号与字段代码（%f %U等），
+解析结果按 (路径, 修改时间, 大小) 缓存，快捷方式解析、图标查找和启动应用共用同一份
+"""
+
+import os
+import shutil
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Iterable, Tuple
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+MAIN_GROUP = 'Desktop Entry'
+
+# 字符串值中的转义
+_VALUE_ESCAPES = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+
+# Exec双引号内可以用反斜杠转义的字符
+_QUOTED_ESCAPES = {'"', '`', '$', '\\'}
+
+# 已废弃或不适用的字段代码，展开时去掉
+_DEPRECATED_FIELD_CODES = {'d', 'D', 'n', 'N', 'v', 'm'}
+
+# Terminal=true时使用的终端及其执行命令参数（按优先级排列）
+_TERMINALS = (
+    ('x-terminal-emulator', '-e'),
+    ('gnome-terminal', '--'),
+    ('konsole', '-e'),
+    ('xfce4-terminal', '-x'),
+    ('xterm', '-e'),
+)
+
+
+def locale_names() -> List[str]:
+    """当前语言环境对应的本地化键后缀（按匹配优先级），如 zh_CN.UTF-8 -> [zh_CN, zh]"""
+    lang = os.environ.get("LC_ALL") or os.environ.get("LC_MESSAGES") or os.environ.get("LANG") or ""
+    lang, _, modifier = lang.partition('@')
+    lang = lang.split('.')[0]
+    if not lang or lang in ('C', 'POSIX'):
+        return []
+
+    language, _, country = lang.partition('_')
+    names = []
+    if country and modifier:
+        names.append(f"{language}_{country}@{modifier}")
+    if country:
+        names.append(f"{language}_{country}")
+    if modifier:
+        names.append(f"{language}@{modifier}")
+    names.append(language)
+    return names
+
+
+def unescape_value(value: str) -> str:
+    r"""还原字符串值中的转义（\s \n \t \r \\）"""
+    if '\\' not in value:
+        return value
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, '')
+            result.append(_VALUE_ESCAPES.get(escaped, '\\' + escaped))
+        else:
+            result.append(char)
+    return ''.join(result)
+
+
+def split_list(value: str) -> List[str]:
+    r"""拆分以分号分隔的列表值（\; 为字面分号）"""
+    items = []
+    current = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            escaped = next(chars, '')
+            current.append(';' if escaped == ';' else _VALUE_ESCAPES.get(escaped, '\\' + escaped))
+        elif char == ';':
+            items.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    if current:
+        items.append(''.join(current))
+    return [item for item in items if item]
+
+
+def split_exec(exec_line: str) -> List[Tuple[str, bool]]:
+    """按规范拆分Exec（已还原字符串转义），返回 (参数, 是否带引号)"""
+    args: List[Tuple[str, bool]] = []
+    current: List[str] = []
+    in_arg = quoted = in_quotes = False
+
+    chars = iter(exec_line)
+    for char in chars:
+        if in_quotes:
+            if char == '"':
+                in_quotes = False
+            elif char == '\\':
+                escaped = next(chars, '')
+                current.append(escaped if escaped in _QUOTED_ESCAPES else '\\' + escaped)
+            else:
+                current.append(char)
+        elif char == '"':
+            in_arg = quoted = in_quotes = True
+        elif char in ' \t\n':
+            if in_arg:
+                args.append((''.join(current), quoted))
+                current = []
+                in_arg = quoted = False
+        elif char == '\\':
+            # 规范要求保留字符放在引号中，引号外的反斜杠按常见写法宽松处理
+            current.append(next(chars, ''))
+            in_arg = True
+        else:
+            current.append(char)
+            in_arg = True
+
+    if in_arg:
+        args.append((''.join(current), quoted))
+    return args
+
+
+# (TERMINAL, PATH) -> 终端命令前缀
+_terminal_cache: Dict[Tuple[str, str], Optional[List[str]]] = {}
+
+
+def find_terminal() -> Optional[List[str]]:
+    """查找用于运行Terminal=true应用的终端，返回命令前缀（按环境变量缓存）"""
+    env_key = (os.environ.get("TERMINAL", ""), os.environ.get("PATH", ""))
+    if env_key in _terminal_cache:
+        prefix = _terminal_cache[env_key]
+        return list(prefix) if prefix else None
+
+    prefix = None
+    if env_key[0] and shutil.which(env_key[0]):
+        prefix = [env_key[0], '-e']
+    else:
+        for name, exec_flag in _TERMINALS:
+            path = shutil.which(name)
+            if path:
+                prefix = [path, exec_flag]
+                break
+    _terminal_cache[env_key] = prefix
+    return list(prefix) if prefix else None
+
+
+class DesktopEntry:
+    """解析后的.desktop文件"""
+
+    def __init__(self, path: str, groups: Dict[str, Dict[str, str]]):
+        self.path = path
+        # 分组 -> {键（含本地化后缀）: 原始值}
+        self.groups = groups
+
+    @classmethod
+    def parse(cls, path: str) -> 'DesktopEntry':
+        """读取并解析.desktop文件（读取失败时抛出OSError）"""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return cls.from_text(f.read(), path)
+
+    @classmethod
+    def from_text(cls, text: str, path: str = '') -> 'DesktopEntry':
+        """解析.desktop文件内容"""
+        groups: Dict[str, Dict[str, str]] = {}
+        current: Optional[Dict[str, str]] = None
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                # 重复的分组合并，先出现的键优先
+                current = groups.setdefault(line[1:-1], {})
+                continue
+            if current is None or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            current.setdefault(key.strip(), value.strip())
+        return cls(path, groups)
+
+    def _raw(self, key: str, group: str, locales: Optional[List[str]]) -> Optional[str]:
+        values = self.groups.get(group)
+        if not values:
+            return None
+        if locales is not None:
+            for locale in locales:
+                value = values.get(f"{key}[{locale}]")
+                if value:
+                    return value
+        return values.get(key)
+
+    def get(self, key: str, default: str = '', group: str = MAIN_GROUP) -> str:
+        """读取字符串值"""
+        value = self._raw(key, group, None)
+        return default if value is None else unescape_value(value)
+
+    def localized(self, key: str, default: str = '', group: str = MAIN_GROUP,
+                  locales: Optional[List[str]] = None) -> str:
+        """读取本地化字符串值，找不到当前语言时回退到未本地化的键"""
+        value = self._raw(key, group, locale_names() if locales is None else locales)
+        return default if value is None else unescape_value(value)
+
+    def get_bool(self, key: str, default: bool = False, group: str = MAIN_GROUP) -> bool:
+        """读取布尔值"""
+        value = self._raw(key, group, None)
+        return default if value is None else value.strip().lower() == 'true'
+
+    def get_list(self, key: str, group: str = MAIN_GROUP, localized: bool = False,
+                 locales: Optional[List[str]] = None) -> List[str]:
+        """读取分号分隔的列表值"""
+        if localized and locales is None:
+            locales = locale_names()
+        value = self._raw(key, group, locales if localized else None)
+        return split_list(value) if value else []
+
+    @property
+    def type(self) -> str:
+        return self.get('Type', 'Application')
+
+    @property
+    def exec(self) -> str:
+        return self.get('Exec')
+
+    @property
+    def icon(self) -> str:
+        return self.get('Icon')
+
+    @property
+    def terminal(self) -> bool:
+        return self.get_bool('Terminal')
+
+    @property
+    def working_dir(self) -> str:
+        return self.get('Path')
+
+    @property
+    def dbus_activatable(self) -> bool:
+        return self.get_bool('DBusActivatable')
+
+    def is_installed(self) -> bool:
+        """TryExec指定的程序是否存在（未指定时视为已安装）"""
+        try_exec = self.get('TryExec')
+        if not try_exec:
+            return True
+        if os.path.isabs(try_exec):
+            return os.path.isfile(try_exec) and os.access(try_exec, os.X_OK)
+        return shutil.which(try_exec) is not None
+
+    def is_application(self) -> bool:
+        """是否为可启动的应用条目"""
+        return self.type == 'Application' and bool(self.exec)
+
+    def actions(self) -> List[str]:
+        """附加动作（如"新建窗口"）的id"""
+        return [action for action in self.get_list('Actions')
+                if f"Desktop Action {action}" in self.groups]
+
+    def exec_args(self, group: str = MAIN_GROUP) -> List[str]:
+        """Exec拆分后的参数，去掉字段代码"""
+        args = []
+        for arg, quoted in split_exec(self.get('Exec', group=group)):
+            if not quoted and len(arg) == 2 and arg[0] == '%' and arg[1] != '%':
+                continue
+            args.append(arg.replace('%%', '%') if quoted else arg)
+        return args
+
+    def command(self) -> str:
+        """Exec中的可执行文件"""
+        args = self.exec_args()
+        return args[0] if args else ''
+
+    def expand_exec(self, files: Optional[Iterable[str]] = None, group: str = MAIN_GROUP) -> List[str]:
+        """展开Exec中的字段代码，返回参数列表"""
+        files = [os.fspath(f) for f in files or ()]
+        argv: List[str] = []
+        for arg, quoted in split_exec(self.get('Exec', group=group)):
+            # 引号中不允许字段代码，只处理 %%
+            if quoted:
+                argv.append(arg.replace('%%', '%'))
+                continue
+
+            # 单独的 %F %U %i 展开为多个参数
+            if arg in ('%F', '%U'):
+                argv.extend(files)
+                continue
+            if arg == '%i':
+                if self.icon:
+                    argv.extend(['--icon', self.icon])
+                continue
+
+            expanded = self._expand_codes(arg, files)
+            # 只由字段代码组成且展开为空的参数不保留
+            if expanded or not arg.startswith('%'):
+                argv.append(expanded)
+        return argv
+
+    def _expand_codes(self, arg: str, files: List[str]) -> str:
+        """展开参数内嵌的字段代码"""
+        if '%' not in arg:
+            return arg
+        result = []
+        chars = iter(arg)
+        for char in chars:
+            if char != '%':
+                result.append(char)
+                continue
+            code = next(chars, '')
+            if code == '%':
+                result.append('%')
+            elif code in ('f', 'u', 'F', 'U'):
+                # 参数内嵌时只能替换为单个文件
+                result.append(files[0] if files else '')
+            elif code == 'c':
+                result.append(self.localized('Name'))
+            elif code == 'k':
+                result.append(self.path)
+            elif code == 'i':
+                result.append(self.icon)
+            elif code not in _DEPRECATED_FIELD_CODES:
+                logger.debug(f"未知的字段代码 %{code}: {self.path}")
+        return ''.join(result)
+
+    def build_argv(self, files: Optional[Iterable[str]] = None, action: Optional[str] = None) -> List[str]:
+        """构造启动命令的参数列表（Terminal=true时在终端中运行）"""
+        group = f"Desktop Action {action}" if action else MAIN_GROUP
+        argv = self.expand_exec(files, group)
+        if argv and self.terminal:
+            terminal = find_terminal()
+            if terminal:
+                argv = terminal + argv
+            else:
+                logger.warning(f"未找到终端，直接运行: {self.path}")
+        return argv
+
+
+class DesktopEntryCache:
+    """按 (路径, 修改时间, 大小) 缓存的.desktop解析结果（线程安全）"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # 路径 -> (修改时间, 大小, 解析结果)
+        self._entries: 'OrderedDict[str, Tuple[int, int, DesktopEntry]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'requests': 0,
+            'hits': 0,
+            'parses': 0,
+            'errors': 0
+        }
+
+    def get(self, path: str) -> Optional[DesktopEntry]:
+        """获取解析结果，文件变化后重新解析，无法读取时返回None"""
+        with self._lock:
+            self.stats['requests'] += 1
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats['errors'] += 1
+                self._entries.pop(path, None)
+            return None
+
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._entries.move_to_end(path)
+                self.stats['hits'] += 1
+                return cached[2]
+
+        try:
+            entry = DesktopEntry.parse(path)
+        except OSError as e:
+            logger.debug(f"读取.desktop文件失败: {path}, {e}")
+            with self._lock:
+                self.stats['errors'] += 1
+            return None
+
+        with self._lock:
+            self.stats['parses'] += 1
+            self._entries[path] = (stat.st_mtime_ns, stat.st_size, entry)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, path: Optional[str] = None):
+        """丢弃一个或全部缓存的解析结果"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'cached': len(self._entries)}
+
+
+# 全局共享的.desktop解析缓存
+_shared_cache: Optional[DesktopEntryCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_desktop_entry_cache() -> DesktopEntryCache:
+    """获取全局共享的.desktop解析缓存"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = DesktopEntryCache()
+        return _shared_cache
@@ -0,0 +1,158 @@
+"""
+使用频率排序引擎
+基于指数衰减的frecency评分，启动时O(1)更新，用于快捷窗口自动排序和搜索结果排序
+"""
+
+import math
+import time
+import heapq
+import threading
+import logging
+from collections import deque
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+
+class FrecencyEngine:
+    """Frecency排序引擎
+
+    每个应用只保存一个与时间无关的对数分数 v = ln(score) + λ·t，
+    实际分数 score(t) = exp(v - λ·t)。衰减对所有应用按相同比例生效，
+    因此排序只需比较 v，启动时的更新是O(1)，不需要定期重算所有应用。
+    """
+
+    def __init__(self, half_life_days: float = 7.0, max_events: int = 500):
+        self.half_life_days = float(half_life_days) if half_life_days and half_life_days > 0 else 7.0
+        self._decay = math.log(2) / (self.half_life_days * 86400)
+
+        # 应用ID -> 对数分数
+        self._scores: Dict[str, float] = {}
+        # 启动事件环形缓冲区 (app_id, timestamp)
+        self._events: deque = deque(maxlen=max(1, int(max_events)))
+        self._lock = threading.RLock()
+
+    def _log_weight(self, timestamp: float) -> float:
+        """一次启动在时间戳处的对数权重"""
+        return self._decay * timestamp
+
+    def record(self, app_id: str, timestamp: Optional[float] = None) -> float:
+        """记录一次启动，返回启动时刻的分数"""
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            weight = self._log_weight(timestamp)
+            old = self._scores.get(app_id)
+            if old is None:
+                new = weight
+            else:
+                # log(exp(old) + exp(weight))，避免指数溢出
+                high, low = (old, weight) if old >= weight else (weight, old)
+                new = high + math.log1p(math.exp(low - high))
+
+            self._scores[app_id] = new
+            self._events.append((app_id, timestamp))
+            return math.exp(new - weight)
+
+    def seed(self, app_id: str, usage_count: int, last_used: float):
+        """根据旧的使用统计为没有分数的应用生成初始分数"""
+        if usage_count <= 0 or last_used <= 0:
+            return
+        with self._lock:
+            if app_id not in self._scores:
+                self._scores[app_id] = math.log(usage_count) + self._log_weight(last_used)
+
+    def score(self, app_id: str, now: Optional[float] = None) -> float:
+        """获取应用在当前时刻的衰减分数"""
+        with self._lock:
+            value = self._scores.get(app_id)
+        if value is None:
+            return 0.0
+        if now is None:
+            now = time.time()
+        return math.exp(value - self._log_weight(now))
+
+    def sort_key(self, app_id: str) -> float:
+        """排序键，未使用过的应用排在最后"""
+        return self._scores.get(app_id, float('-inf'))
+
+    def rank(self, app_ids: Iterable[str]) -> List[str]:
+        """按分数从高到低排序，分数相同（或从未启动）的应用保持原有顺序"""
+        with self._lock:
+            scores = self._scores
+            return sorted(app_ids, key=lambda app_id: scores.get(app_id, float('-inf')), reverse=True)
+
+    def top(self, limit: int = 10, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """获取分数最高的应用 (app_id, score)"""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            best = heapq.nlargest(limit, self._scores.items(), key=lambda item: item[1])
+        offset = self._log_weight(now)
+        return [(app_id, math.exp(value - offset)) for app_id, value in best]
+
+    def remove(self, app_id: str):
+        """移除应用的分数和启动记录"""
+        with self._lock:
+            if self._scores.pop(app_id, None) is not None:
+                self._events = deque(
+                    (event for event in self._events if event[0] != app_id),
+                    maxlen=self._events.maxlen
+                )
+
+    def clear(self):
+        """清空所有分数和启动记录"""
+        with self._lock:
+            self._scores.clear()
+            self._events.clear()
+
+    def recent_events(self, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """获取最近的启动记录（最新的在前）"""
+        with self._lock:
+            events = list(reversed(self._events))
+        return events[:limit] if limit else events
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出为紧凑的可序列化数据"""
+        with self._lock:
+            return {
+                "half_life_days": self.half_life_days,
+                "scores": {app_id: round(value, 6) for app_id, value in self._scores.items()},
+                "events": [[app_id, int(timestamp)] for app_id, timestamp in self._events]
+            }
+
+    def load(self, data: Dict[str, Any]):
+        """从持久化数据加载"""
+        if not isinstance(data, dict):
+            return
+
+        with self._lock:
+            self._scores.clear()
+            self._events.clear()
+
+            # 半衰期改变后，保持各应用当前分数不变，按新的衰减速率换算
+            shift = 0.0
+            try:
+                saved_half_life = float(data.get("half_life_days") or self.half_life_days)
+                if saved_half_life > 0 and saved_half_life != self.half_life_days:
+                    saved_decay = math.log(2) / (saved_half_life * 86400)
+                    shift = (self._decay - saved_decay) * time.time()
+            except (ValueError, TypeError):
+                shift = 0.0
+
+            for app_id, value in (data.get("scores") or {}).items():
+                try:
+                    self._scores[str(app_id)] = float(value) + shift
+                except (ValueError, TypeError):
+                    logger.warning(f"忽略无效的frecency分数: {app_id}")
+
+            for event in data.get("events") or []:
+                try:
+                    self._events.append((str(event[0]), float(event[1])))
+                except (ValueError, TypeError, IndexError):
+                    continue
+
+    def __len__(self) -> int:
+        return len(self._scores)
@@ -2,10 +2,13 @@
 """
 图标缓存管理器 - 优化完善版本
 支持EXE、LNK等文件图标提取，自动缓存为PNG格式到cache/icons文件夹
+提取、缩放、生成和编码都只使用QImage，可在多个工作线程中并行执行，
+QPixmap只在GUI线程的使用方转换一次
 """
 
 import os
 import sys
+import math
 import time
 import hashlib
 import logging
@@ -15,8 +18,14 @@ from concurrent.futures import ThreadPoolExecutor
 import threading
 from datetime import datetime, timedelta
 
-from PySide6.QtGui import QPixmap, QImage, QPainter, QColor, QPen, QFont, QIcon, QLinearGradient, QBrush
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QPixmap, QImage, QImageReader, QColor, QIcon
+from PySide6.QtCore import Qt, QSize, QThread, QCoreApplication
+
+from .icon_process_pool import IconProcessPool, IconProcessPoolError
+from .placeholder_icons import FILETYPE_COLORS, get_placeholder_icons
+from .desktop_entry import get_desktop_entry_cache
+from .icon_theme_index import get_icon_theme_index
+from .svg_rasterizer import get_svg_rasterizer, is_svg, dpr_bucket
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -26,53 +35,67 @@ class IconCache:
     """图标缓存管理器 - 优化版本"""
     cache_dir0 = Path(__file__).parent.parent / "cache" / "icons"
 
-    def __init__(self, max_size: int = 100, cache_dir: str = cache_dir0):
+    def __init__(self, max_size: int = 100, cache_dir: str = cache_dir0,
+                 process_workers: Optional[int] = None):
         self.max_size = max_size
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # 缓存
-        self.memory_cache: Dict[str, QPixmap] = {}
+        # 两级缓存：缓存键(路径, 尺寸, 修改时间) -> 内容哈希 -> 像素数据，
+        # 像素完全相同的图标在内存和磁盘上只保存一份
+        self.path_index: Dict[str, str] = {}
+        self.memory_cache: Dict[str, QImage] = {}
         self.access_order: List[str] = []
         self.cache_mutex = threading.RLock()
+        # 正在提取的图标（缓存键 -> 完成事件），避免同一图标被并发提取多次
+        self._inflight: Dict[str, threading.Event] = {}
         
         # 内存监控
         self._estimated_memory_usage = 0
         self._max_memory_mb = 50  # 限制图标缓存占用的最大内存量(MB)
 
-        # 文件类型颜色映射
-        self.filetype_colors = {
-            '.exe': QColor(0, 120, 215),  # Windows蓝
-            '.lnk': QColor(255, 165, 0),  # 橙色
-            '.msi': QColor(16, 124, 16),  # 深绿
-            '.dll': QColor(106, 0, 95),  # 紫红
-            '.sys': QColor(178, 0, 32),  # 深红
-            '.bat': QColor(64, 64, 64),  # 深灰
-            '.cmd': QColor(64, 64, 64),
-            '.ps1': QColor(0, 51, 153),  # PowerShell蓝
-            '.zip': QColor(251, 140, 0),
-            '.rar': QColor(251, 140, 0),
-            '.7z': QColor(251, 140, 0),
-            '.iso': QColor(139, 195, 74),  # 浅绿
-        }
+        # 保留层：界面当前显示的图标变体（如快捷窗口的悬停尺寸）不参与LRU淘汰，单独限制内存
+        self.pinned_budget_mb = 16
+        self._pinned_requests: set = set()
+        self._pinned_hashes: Dict[str, int] = {}
+        self._pinned_bytes = 0
+
+        # 文件类型颜色映射与程序生成的占位图标（全局共享缓存）
+        self.filetype_colors = FILETYPE_COLORS
+        self.placeholders = get_placeholder_icons()
+
+        # SVG解析与光栅化缓存（全局共享）
+        self.svg_rasterizer = get_svg_rasterizer()
+
+        # Linux下的图标主题索引（图标名 -> 文件），替代逐目录查找的QIcon.fromTheme
+        self.theme_index = None
+        if sys.platform not in ('win32', 'darwin'):
+            self.theme_index = get_icon_theme_index()
+            if QCoreApplication.instance() is not None:
+                self.theme_index.set_theme(QIcon.themeName())
 
         # 统计信息
-        self.stats = {
-            'total_requests': 0,
-            'memory_hits': 0,
-            'extractions': 0,
-            'failed_extractions': 0,
-            'start_time': time.time()
-        }
+        self.stats = self._new_stats()
+        self.dedupe_stats = self._new_dedupe_stats()
+
+        # 线程池（工作线程只处理QImage，可使用全部CPU核心）
+        self.thread_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
 
-        # 线程池
-        self.thread_pool = ThreadPoolExecutor(max_workers=2)
+        # 可选的进程池提取后端，进程数可通过环境变量指定，0表示在进程内提取
+        if process_workers is None:
+            try:
+                process_workers = int(os.environ.get("QUICKLAUNCHER_ICON_WORKERS", "0"))
+            except ValueError:
+                process_workers = 0
+        self.process_pool: Optional[IconProcessPool] = None
+        if process_workers > 0:
+            self.process_pool = IconProcessPool(process_workers, str(self.cache_dir))
 
         logger.info(f"图标缓存初始化完成: {self.cache_dir}")
         logger.info(f"内存缓存大小: {max_size}")
 
-    def _get_cache_key(self, path: str, size: int) -> str:
-        """生成缓存键"""
+    def _get_cache_key(self, path: str, size: int, dpr: float = 1.0) -> str:
+        """生成缓存键（逻辑尺寸和设备像素比档位，1倍时与旧版缓存键相同）"""
         try:
             abs_path = os.path.abspath(path).lower()
 
@@ -85,46 +108,195 @@ class IconCache:
                     pass
 
             # 生成哈希
-            key_data = f"{abs_path}_{size}_{mtime}"
+            size_key = str(size) if dpr == 1.0 else f"{size}@{dpr:g}x"
+            key_data = f"{abs_path}_{size_key}_{mtime}"
             return hashlib.md5(key_data.encode('utf-8')).hexdigest()
         except Exception as e:
             logger.error(f"生成缓存键失败: {e}")
-            return hashlib.md5(f"{path}_{size}".encode('utf-8')).hexdigest()
+            return hashlib.md5(f"{path}_{size}@{dpr:g}x".encode('utf-8')).hexdigest()
 
     def _get_disk_cache_path(self, key: str) -> Path:
-        """获取磁盘缓存路径"""
+        """获取磁盘缓存路径（旧版按缓存键保存的PNG）"""
         # 使用两级目录结构
         subdir = key[:2]
         return self.cache_dir / subdir / f"{key}.png"
 
-    def _save_to_disk_cache(self, disk_path: Path, pixmap: QPixmap):
-        """保存图标到磁盘缓存"""
+    def _get_ref_path(self, key: str) -> Path:
+        """缓存键对应的引用文件，内容为图标的内容哈希"""
+        return self.cache_dir / key[:2] / f"{key}.ref"
+
+    def _get_blob_path(self, content_hash: str) -> Path:
+        """按内容哈希保存的图标PNG"""
+        return self.cache_dir / "blobs" / content_hash[:2] / f"{content_hash}.png"
+
+    @staticmethod
+    def _new_stats() -> Dict[str, Any]:
+        return {
+            'total_requests': 0,
+            'memory_hits': 0,
+            'extractions': 0,
+            'failed_extractions': 0,
+            'inflight_waits': 0,
+            'deferred_to_gui': 0,
+            'prefetches': 0,
+            'start_time': time.time()
+        }
+
+    @staticmethod
+    def _new_dedupe_stats() -> Dict[str, int]:
+        return {
+            'path_entries': 0,
+            'unique_images': 0,
+            'shared_refs': 0,
+            'memory_bytes_saved': 0,
+            'disk_bytes_saved': 0
+        }
+
+    @staticmethod
+    def _normalize_image(image: QImage) -> QImage:
+        """统一像素格式，保证相同图标得到相同的内容哈希"""
+        if image.format() != QImage.Format.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+        return image
+
+    @staticmethod
+    def _content_hash(image: QImage) -> str:
+        """图标像素的内容哈希"""
+        digest = hashlib.sha1(f"{image.width()}x{image.height()}:{image.bytesPerLine()}".encode('utf-8'))
+        digest.update(memoryview(image.constBits()).cast('B')[:image.sizeInBytes()])
+        return digest.hexdigest()
+
+    def _read_ref(self, key: str) -> Optional[str]:
+        """读取缓存键对应的内容哈希"""
+        try:
+            content_hash = self._get_ref_path(key).read_text(encoding='utf-8').strip()
+            return content_hash or None
+        except OSError:
+            return None
+
+    def _write_ref(self, key: str, content_hash: str):
+        """写入缓存键对应的内容哈希"""
+        try:
+            ref_path = self._get_ref_path(key)
+            ref_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = ref_path.with_name(f"{ref_path.stem}.{threading.get_ident()}.tmp")
+            temp_path.write_text(content_hash, encoding='utf-8')
+            os.replace(temp_path, ref_path)
+        except OSError as e:
+            logger.error(f"保存图标引用失败: {e}")
+
+    def _share_image(self, key: str, content_hash: str, image: QImage) -> Tuple[QImage, bool]:
+        """登记缓存键到内容哈希的映射；内存中已有相同内容时返回已有的图像（共享引用）"""
+        with self.cache_mutex:
+            if self.path_index.get(key) != content_hash:
+                self.path_index[key] = content_hash
+                self.dedupe_stats['path_entries'] += 1
+
+            shared = self.memory_cache.get(content_hash)
+            if shared is not None:
+                self.dedupe_stats['shared_refs'] += 1
+                self.dedupe_stats['memory_bytes_saved'] += self._estimate_image_memory(image)
+                if content_hash in self.access_order:
+                    self.access_order.remove(content_hash)
+                self.access_order.append(content_hash)
+                return shared, True
+
+            self._add_to_memory_cache(content_hash, image)
+            return image, False
+
+    def _store_icon(self, key: str, image: QImage) -> QImage:
+        """按内容保存新提取或生成的图标，返回（可能与其他路径共享的）图像"""
+        image = self._normalize_image(image)
+        content_hash = self._content_hash(image)
+        image, shared = self._share_image(key, content_hash, image)
+
+        # 内容已存在时只写引用文件，并刷新内容文件的修改时间以免被当作旧缓存清理
+        blob_path = self._get_blob_path(content_hash)
+        if shared or blob_path.exists():
+            if not shared:
+                self._count_dedupe('shared_refs')
+            try:
+                os.utime(blob_path)
+                self._count_dedupe('disk_bytes_saved', blob_path.stat().st_size)
+            except OSError:
+                pass
+        else:
+            self._save_to_disk_cache(blob_path, image)
+            self._count_dedupe('unique_images')
+        self._write_ref(key, content_hash)
+        return image
+
+    def _count_dedupe(self, name: str, value: int = 1):
+        with self.cache_mutex:
+            self.dedupe_stats[name] += value
+
+    def _save_to_disk_cache(self, disk_path: Path, image: QImage):
+        """保存图标到磁盘缓存（只使用QImage，可在工作线程中调用）"""
         try:
             # 确保父目录存在
             disk_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 保存图标为PNG格式
-            if not pixmap.isNull():
-                success = pixmap.save(str(disk_path), "PNG", quality=90)
+
+            # 先写入临时文件再替换，避免并发读取到写了一半的文件
+            if not image.isNull():
+                temp_path = disk_path.with_name(f"{disk_path.stem}.{threading.get_ident()}.tmp.png")
+                success = image.save(str(temp_path), "PNG", quality=90)
                 if success:
+                    os.replace(temp_path, disk_path)
                     logger.debug(f"图标已保存到磁盘缓存: {disk_path}")
                 else:
                     logger.warning(f"保存图标到磁盘缓存失败: {disk_path}")
         except Exception as e:
             logger.error(f"保存图标到磁盘缓存异常: {e}")
 
-    def _extract_icon_windows(self, path: str, size: int) -> Optional[QPixmap]:
+    @staticmethod
+    def _is_gui_thread() -> bool:
+        """当前是否为GUI线程（QIcon/QPixmap只能在GUI线程使用）"""
+        app = QCoreApplication.instance()
+        return app is not None and QThread.currentThread() == app.thread()
+
+    def _read_image(self, path: str, size: int) -> Optional[QImage]:
+        """用QImageReader读取图片文件，解码时直接缩放（线程安全）"""
+        # SVG只解析一次，按尺寸档位光栅化并缓存
+        if is_svg(path):
+            image = self.svg_rasterizer.render(path, size)
+            if image is not None:
+                return image
+
+        try:
+            reader = QImageReader(path)
+            if not reader.canRead():
+                return None
+
+            image_size = reader.size()
+            if image_size.isValid() and (image_size.width() > size or image_size.height() > size):
+                reader.setScaledSize(image_size.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio))
+            image = reader.read()
+            if not image.isNull():
+                return image
+        except Exception as e:
+            logger.debug(f"读取图片失败: {e}")
+        return None
+
+    @staticmethod
+    def _icon_to_image(icon: QIcon, size: int) -> Optional[QImage]:
+        """QIcon转QImage，只能在GUI线程调用"""
+        if icon.isNull():
+            return None
+        pixmap = icon.pixmap(size, size)
+        if pixmap.isNull():
+            return None
+        return pixmap.toImage()
+
+    def _extract_icon_windows(self, path: str, size: int) -> Optional[QImage]:
         """Windows系统图标提取"""
         try:
             if sys.platform != 'win32':
                 return None
 
-            # 使用Qt内置方法提取图标，处理中文路径
-            icon = QIcon(path)
-            if not icon.isNull():
-                pixmap = icon.pixmap(size, size)
-                if not pixmap.isNull():
-                    return pixmap
+            # 图片、ICO文件直接解码
+            image = self._read_image(path, size)
+            if image is not None:
+                return image
 
             # 尝试使用系统API，确保路径正确编码
             try:
@@ -165,16 +337,13 @@ class IconCache:
                 )
 
                 if result and shfi.hIcon:
-                    # 转换HICON为QPixmap
-                    from PySide6.QtGui import QImage
-                    image = QImage.fromHICON(shfi.hIcon)
+                    # 转换HICON为QImage，转换后释放图标句柄
+                    try:
+                        image = QImage.fromHICON(shfi.hIcon)
+                    finally:
+                        ctypes.windll.user32.DestroyIcon(shfi.hIcon)
                     if not image.isNull():
-                        pixmap = QPixmap.fromImage(image)
-                        if size != pixmap.width() or size != pixmap.height():
-                            pixmap = pixmap.scaled(size, size,
-                                                   Qt.AspectRatioMode.KeepAspectRatio,
-                                                   Qt.TransformationMode.SmoothTransformation)
-                        return pixmap
+                        return image
             except UnicodeDecodeError as e:
                 logger.warning(f"Windows图标提取失败，路径包含无法解码的字符: {e}")
             except Exception as e:
@@ -185,263 +354,287 @@ class IconCache:
 
         return None
 
-    def _extract_icon_linux(self, path: str, size: int) -> Optional[QPixmap]:
+    def _extract_icon_linux(self, path: str, size: int) -> Optional[QImage]:
         """Linux系统图标提取"""
         try:
-            # 尝试使用Qt内置方法
-            icon = QIcon(path)
-            if not icon.isNull():
-                pixmap = icon.pixmap(size, size)
-                if not pixmap.isNull():
-                    return pixmap
+            # 图片文件直接解码
+            image = self._read_image(path, size)
+            if image is not None:
+                return image
 
             # 对于.desktop文件，尝试解析图标
             if path.endswith('.desktop'):
-                with open(path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    for line in content.split('\n'):
-                        if line.startswith('Icon='):
-                            icon_name = line[5:].strip()
-                            # 尝试从主题加载图标
-                            icon = QIcon.fromTheme(icon_name)
-                            if not icon.isNull():
-                                pixmap = icon.pixmap(size, size)
-                                if not pixmap.isNull():
-                                    return pixmap
+                entry = get_desktop_entry_cache().get(path)
+                icon_name = entry.icon if entry else ''
+                if icon_name:
+                    # 绝对路径的图标可在任意线程解码
+                    if os.path.isabs(icon_name):
+                        return self._read_image(icon_name, size)
+                    # 主题图标先查索引，找到时直接解码文件
+                    icon_path = self.theme_index.lookup(icon_name, size) if self.theme_index else None
+                    if icon_path:
+                        image = self._read_image(icon_path, size)
+                        if image is not None:
+                            return image
+                    # 索引中没有的图标依赖QIcon，只在GUI线程加载
+                    if self._is_gui_thread():
+                        return self._icon_to_image(QIcon.fromTheme(icon_name), size)
+                    return None
         except:
             pass
 
         return None
 
-    def _extract_icon_mac(self, path: str, size: int) -> Optional[QPixmap]:
+    def _extract_icon_mac(self, path: str, size: int) -> Optional[QImage]:
         """macOS系统图标提取"""
         try:
-            # 使用Qt内置方法
-            icon = QIcon(path)
-            if not icon.isNull():
-                pixmap = icon.pixmap(size, size)
-                if not pixmap.isNull():
-                    return pixmap
+            # 图片文件直接解码
+            image = self._read_image(path, size)
+            if image is not None:
+                return image
 
             # 对于.app包，尝试获取图标
             if path.endswith('.app'):
                 icon_path = os.path.join(path, 'Contents', 'Resources', 'AppIcon.icns')
                 if os.path.exists(icon_path):
-                    icon = QIcon(icon_path)
-                    if not icon.isNull():
-                        pixmap = icon.pixmap(size, size)
-                        if not pixmap.isNull():
-                            return pixmap
+                    return self._read_image(icon_path, size)
         except:
             pass
 
         return None
 
-    def _extract_icon(self, path: str, size: int) -> Optional[QPixmap]:
+    def _needs_gui_thread(self, path: str) -> bool:
+        """该文件的图标是否只能在GUI线程中提取（如主题图标）"""
+        if self.process_pool is not None:
+            return False
+        return sys.platform not in ('win32', 'darwin') and path.endswith('.desktop')
+
+    def _extract_icon(self, path: str, size: int) -> Optional[QImage]:
         """提取图标"""
-        self.stats['extractions'] += 1
+        self._count('extractions')
+
+        # 使用进程池时在工作进程中提取，进程池不可用时退回进程内提取
+        if self.process_pool is not None:
+            try:
+                image = self.process_pool.extract(path, size)
+                if image is None:
+                    self._count('failed_extractions')
+                return image
+            except IconProcessPoolError as e:
+                logger.debug(f"进程池提取不可用: {e}")
 
         try:
             # 根据系统选择提取方法
             if sys.platform == 'win32':
-                pixmap = self._extract_icon_windows(path, size)
+                image = self._extract_icon_windows(path, size)
             elif sys.platform == 'darwin':
-                pixmap = self._extract_icon_mac(path, size)
+                image = self._extract_icon_mac(path, size)
             else:
-                pixmap = self._extract_icon_linux(path, size)
+                image = self._extract_icon_linux(path, size)
+
+            # 最后在GUI线程中尝试Qt内置方法
+            if (image is None or image.isNull()) and self._is_gui_thread():
+                image = self._icon_to_image(QIcon(path), size)
 
-            if pixmap and not pixmap.isNull():
-                return pixmap
+            if image is not None and not image.isNull():
+                return image
             else:
-                self.stats['failed_extractions'] += 1
+                self._count('failed_extractions')
                 return None
 
         except Exception as e:
-            self.stats['failed_extractions'] += 1
+            self._count('failed_extractions')
             logger.error(f"图标提取失败: {e}")
             return None
 
-    def _create_filetype_icon(self, path: str, size: int) -> QPixmap:
-        """创建文件类型图标"""
-        try:
-            ext = os.path.splitext(path)[1].lower()
-            color = self.filetype_colors.get(ext, QColor(96, 125, 139))
-
-            pixmap = QPixmap(size, size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            # 绘制背景
-            margin = max(2, size // 16)
-            rect = pixmap.rect().adjusted(margin, margin, -margin, -margin)
-
-            # 创建渐变
-            gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
-            gradient.setColorAt(0, color.lighter(120))
-            gradient.setColorAt(1, color.darker(120))
+    def _create_filetype_icon(self, path: str, size: int) -> QImage:
+        """创建文件类型图标（共享的占位图标）"""
+        return self.placeholders.get('filetype', size, os.path.splitext(path)[1])
 
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, size // 8, size // 8)
-
-            # 绘制扩展名
-            if ext and len(ext) > 1:
-                ext_text = ext[1:].upper()
-                if len(ext_text) > 4:
-                    ext_text = ext_text[:4]
-
-                font = QFont()
-                font.setPixelSize(max(size // 3, 8))
-                font.setBold(True)
-                painter.setFont(font)
-                painter.setPen(QColor(255, 255, 255))
-
-                painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, ext_text)
-
-            painter.end()
-            return pixmap
-
-        except Exception as e:
-            logger.error(f"创建文件类型图标失败: {e}")
-            return self._create_default_icon(size)
+    def _create_default_icon(self, size: int) -> QImage:
+        """创建默认图标（共享的占位图标）"""
+        return self.placeholders.get('default', size)
 
-    def _create_default_icon(self, size: int) -> QPixmap:
-        """创建默认图标"""
-        try:
-            pixmap = QPixmap(size, size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            # 绘制背景
-            gradient = QLinearGradient(0, 0, size, size)
-            gradient.setColorAt(0, QColor(66, 133, 244, 180))
-            gradient.setColorAt(1, QColor(26, 115, 232, 180))
-
-            margin = max(2, size // 16)
-            rect = pixmap.rect().adjusted(margin, margin, -margin, -margin)
-
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, size // 8, size // 8)
-
-            painter.end()
-            return pixmap
-
-        except Exception as e:
-            logger.error(f"创建默认图标失败: {e}")
-            pixmap = QPixmap(size, size)
-            pixmap.fill(QColor(66, 133, 244))
-            return pixmap
-
-    def get_icon(self, path: str, size: int = 32) -> QPixmap:
-        """获取图标 - 主要入口点"""
+    def _count(self, name: str, value: int = 1):
+        """线程安全地累加统计"""
         with self.cache_mutex:
-            self.stats['total_requests'] += 1
+            self.stats[name] = self.stats.get(name, 0) + value
 
-            # 清理路径
-            clean_path = os.path.abspath(path.strip())
-            cache_key = self._get_cache_key(clean_path, size)
-
-            # 1. 检查内存缓存
-            if cache_key in self.memory_cache:
+    def _lookup_memory_cache(self, key: str) -> Optional[QImage]:
+        """通过缓存键查询内存缓存并更新访问顺序"""
+        with self.cache_mutex:
+            content_hash = self.path_index.get(key)
+            image = self.memory_cache.get(content_hash) if content_hash else None
+            if image is not None:
                 self.stats['memory_hits'] += 1
-                pixmap = self.memory_cache[cache_key]
-
-                # 更新访问顺序
-                if cache_key in self.access_order:
-                    self.access_order.remove(cache_key)
-                self.access_order.append(cache_key)
+                if content_hash in self.access_order:
+                    self.access_order.remove(content_hash)
+                self.access_order.append(content_hash)
+            return image
+
+    def get_icon(self, path: str, size: int = 32, dpr: float = 1.0) -> QPixmap:
+        """获取图标 - 主要入口点，返回QPixmap，只能在GUI线程调用"""
+        return QPixmap.fromImage(self.get_icon_image(path, size, dpr))
+
+    def get_icon_image(self, path: str, size: int = 32, dpr: float = 1.0) -> QImage:
+        """获取逻辑尺寸size、设备像素比dpr下的图标QImage，可在任意线程调用
+
+        设备像素比按档位取整，每个 (逻辑尺寸, 设备像素比档位) 单独缓存，
+        窗口在不同缩放比例的屏幕间移动时直接使用已缓存的变体
+        """
+        dpr = dpr_bucket(dpr)
+        image = self._get_icon_pixels(path, size, dpr)
+        if dpr == 1.0 and image.devicePixelRatio() == 1.0:
+            return image
+        # 缓存中的图像按像素共享，返回带设备像素比的副本
+        image = QImage(image)
+        image.setDevicePixelRatio(dpr)
+        return image
+
+    def _get_icon_pixels(self, path: str, size: int, dpr: float) -> QImage:
+        """获取图标的像素图像（size * dpr 像素）
+
+        锁只保护缓存表，提取和编码在锁外进行；同一图标的并发请求只提取一次
+        """
+        self._count('total_requests')
+
+        # 清理路径
+        clean_path = os.path.abspath(path.strip())
+        cache_key = self._get_cache_key(clean_path, size, dpr)
+        pixel_size = max(1, math.ceil(size * dpr))
+
+        # 1. 检查内存缓存，同一图标正在提取时等待其完成
+        while True:
+            image = self._lookup_memory_cache(cache_key)
+            if image is not None:
+                return image
 
-                return pixmap
+            with self.cache_mutex:
+                event = self._inflight.get(cache_key)
+                if event is None:
+                    self._inflight[cache_key] = threading.Event()
+                    break
+            event.wait()
+            self._count('inflight_waits')
+
+            # 等待的请求结果未缓存（如需在GUI线程提取），自行处理
+            with self.cache_mutex:
+                cached = self.memory_cache.get(self.path_index.get(cache_key, ""))
+                if cached is None and cache_key not in self._inflight:
+                    self._inflight[cache_key] = threading.Event()
+                    break
 
-            # 2. 检查磁盘缓存
-            disk_cache_path = self._get_disk_cache_path(cache_key)
-            if disk_cache_path.exists():
-                try:
+        try:
+            return self._load_icon_image(clean_path, pixel_size, cache_key)
+        finally:
+            with self.cache_mutex:
+                event = self._inflight.pop(cache_key, None)
+            if event is not None:
+                event.set()
+
+    def _load_icon_image(self, clean_path: str, size: int, cache_key: str) -> QImage:
+        """从磁盘缓存加载或提取图标（size为像素尺寸）"""
+        # 2. 检查磁盘缓存（引用文件 -> 内容PNG）
+        content_hash = self._read_ref(cache_key)
+        if content_hash:
+            try:
+                # 相同内容已在内存中时直接共享
+                with self.cache_mutex:
+                    shared = self.memory_cache.get(content_hash)
+                if shared is None:
                     # 从磁盘加载缓存的图标
-                    pixmap = QPixmap(str(disk_cache_path))
-                    if not pixmap.isNull():
-                        # 添加到内存缓存
-                        self._add_to_memory_cache(cache_key, pixmap)
-                        return pixmap
-                except Exception as e:
-                    logger.warning(f"从磁盘加载缓存图标失败: {e}")
-
-            # 3. 检查文件是否存在
-            if not os.path.exists(clean_path):
-                logger.warning(f"文件不存在: {clean_path}")
-                pixmap = self._create_filetype_icon(clean_path, size)
-                # 保存到磁盘缓存
-                self._save_to_disk_cache(disk_cache_path, pixmap)
-                self._add_to_memory_cache(cache_key, pixmap)
-                return pixmap
-
-            # 4. 提取图标
-            pixmap = self._extract_icon(clean_path, size)
-
-            # 5. 如果提取失败，创建文件类型图标
-            if not pixmap or pixmap.isNull():
-                pixmap = self._create_filetype_icon(clean_path, size)
-
-            # 6. 调整大小
-            if pixmap and (pixmap.width() != size or pixmap.height() != size):
-                pixmap = pixmap.scaled(
-                    size, size,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-
-            # 7. 缓存图标
-            if pixmap and not pixmap.isNull():
-                # 保存到磁盘缓存
-                self._save_to_disk_cache(disk_cache_path, pixmap)
-                self._add_to_memory_cache(cache_key, pixmap)
-
-            return pixmap if pixmap else self._create_default_icon(size)
+                    blob_path = self._get_blob_path(content_hash)
+                    if blob_path.exists():
+                        shared = self._normalize_image(QImage(str(blob_path)))
+                if shared is not None and not shared.isNull():
+                    return self._share_image(cache_key, content_hash, shared)[0]
+            except Exception as e:
+                logger.warning(f"从磁盘加载缓存图标失败: {e}")
 
-    def _estimate_pixmap_memory(self, pixmap: QPixmap) -> int:
-        """估算QPixmap占用的内存大小（字节）"""
-        if pixmap.isNull():
+        # 旧版按缓存键保存的PNG，迁移到按内容保存
+        legacy_path = self._get_disk_cache_path(cache_key)
+        if legacy_path.exists():
+            try:
+                image = QImage(str(legacy_path))
+                if not image.isNull():
+                    image = self._store_icon(cache_key, image)
+                    legacy_path.unlink(missing_ok=True)
+                    return image
+            except Exception as e:
+                logger.warning(f"迁移旧版缓存图标失败: {e}")
+
+        # 3. 检查文件是否存在
+        if not os.path.exists(clean_path):
+            logger.warning(f"文件不存在: {clean_path}")
+            image = self._create_filetype_icon(clean_path, size)
+            # 保存到磁盘缓存
+            return self._store_icon(cache_key, image)
+
+        # 4. 提取图标
+        image = self._extract_icon(clean_path, size)
+
+        # 5. 如果提取失败，创建文件类型图标
+        if image is None or image.isNull():
+            image = self._create_filetype_icon(clean_path, size)
+
+            # 需要GUI线程才能提取的图标不缓存占位图，留给界面请求时再提取
+            if not self._is_gui_thread() and self._needs_gui_thread(clean_path):
+                self._count('deferred_to_gui')
+                return image
+
+        # 6. 调整大小
+        if image.width() != size or image.height() != size:
+            image = image.scaled(
+                size, size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+
+        # 7. 缓存图标（相同内容只保存一份）
+        if not image.isNull():
+            return self._store_icon(cache_key, image)
+
+        return self._create_default_icon(size)
+
+    def _estimate_image_memory(self, image: QImage) -> int:
+        """估算QImage占用的内存大小（字节）"""
+        if image.isNull():
             return 0
-        # 计算像素数量 * 每像素字节数 (RGBA = 4 bytes)
-        return pixmap.width() * pixmap.height() * 4
-    
-    def _add_to_memory_cache(self, key: str, pixmap: QPixmap):
+        return image.sizeInBytes()
+
+    def _add_to_memory_cache(self, key: str, image: QImage):
         """添加到内存缓存"""
         with self.cache_mutex:
-            estimated_size = self._estimate_pixmap_memory(pixmap)
-            
+            estimated_size = self._estimate_image_memory(image)
+
             if key in self.memory_cache:
                 # 更新现有，调整内存使用估计
-                old_pixmap = self.memory_cache[key]
-                old_size = self._estimate_pixmap_memory(old_pixmap)
+                old_image = self.memory_cache[key]
+                old_size = self._estimate_image_memory(old_image)
                 self._estimated_memory_usage = self._estimated_memory_usage - old_size + estimated_size
-                
-                self.memory_cache[key] = pixmap
+
+                self.memory_cache[key] = image
                 if key in self.access_order:
                     self.access_order.remove(key)
                 self.access_order.append(key)
             else:
-                # 检查缓存大小限制
-                while (len(self.memory_cache) >= self.max_size or 
-                       (self._estimated_memory_usage + estimated_size) > (self._max_memory_mb * 1024 * 1024)):
+                # 检查缓存大小限制（保留层的图标单独计算，不被淘汰）
+                while (len(self.memory_cache) - len(self._pinned_hashes) >= self.max_size or
+                       (self._estimated_memory_usage - self._pinned_bytes + estimated_size) >
+                       (self._max_memory_mb * 1024 * 1024)):
                     # LRU淘汰
-                    if self.access_order:
-                        oldest_key = self.access_order.pop(0)
-                        if oldest_key in self.memory_cache:
-                            old_pixmap = self.memory_cache[oldest_key]
-                            old_size = self._estimate_pixmap_memory(old_pixmap)
-                            self._estimated_memory_usage -= old_size
-                            del self.memory_cache[oldest_key]
-                    else:
+                    oldest_key = next((k for k in self.access_order if k not in self._pinned_hashes), None)
+                    if oldest_key is None:
                         break
+                    self.access_order.remove(oldest_key)
+                    if oldest_key in self.memory_cache:
+                        old_image = self.memory_cache[oldest_key]
+                        old_size = self._estimate_image_memory(old_image)
+                        self._estimated_memory_usage -= old_size
+                        del self.memory_cache[oldest_key]
 
                 # 添加新缓存
-                self.memory_cache[key] = pixmap
+                self.memory_cache[key] = image
                 self.access_order.append(key)
                 self._estimated_memory_usage += estimated_size
 
@@ -450,9 +643,12 @@ class IconCache:
         try:
             with self.cache_mutex:
                 # 清理内存缓存
+                self.path_index.clear()
                 self.memory_cache.clear()
                 self.access_order.clear()
                 self._estimated_memory_usage = 0  # 重置内存使用估计
+                self._pinned_hashes.clear()
+                self._pinned_bytes = 0
 
                 if not memory_only:
                     # 清理磁盘缓存
@@ -462,13 +658,8 @@ class IconCache:
                         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
                 # 重置统计
-                self.stats = {
-                    'total_requests': 0,
-                    'memory_hits': 0,
-                    'extractions': 0,
-                    'failed_extractions': 0,
-                    'start_time': time.time()
-                }
+                self.stats = self._new_stats()
+                self.dedupe_stats = self._new_dedupe_stats()
 
                 logger.info(f"缓存已清理 (内存{'仅' if memory_only else '和磁盘'})")
                 return True
@@ -488,7 +679,7 @@ class IconCache:
             total_size = 0
             cache_files = []
 
-            for file in self.cache_dir.rglob("*.png"):
+            for file in list(self.cache_dir.rglob("*.png")) + list(self.cache_dir.rglob("*.ref")):
                 if file.is_file():
                     try:
                         file_size = file.stat().st_size
@@ -561,22 +752,36 @@ class IconCache:
                     'size': len(self.memory_cache),
                     'max_size': self.max_size,
                     'hits': self.stats['memory_hits'],
-                    'hit_rate': round(memory_hit_rate, 2)
+                    'hit_rate': round(memory_hit_rate, 2),
+                    'pinned': len(self._pinned_hashes),
+                    'pinned_mb': round(self._pinned_bytes / 1024 / 1024, 2),
+                    'prefetches': self.stats['prefetches']
                 },
                 'extractions': {
                     'total': self.stats['extractions'],
                     'failed': self.stats['failed_extractions'],
-                    'success_rate': round(extraction_success_rate, 2)
+                    'success_rate': round(extraction_success_rate, 2),
+                    'inflight_waits': self.stats['inflight_waits'],
+                    'deferred_to_gui': self.stats['deferred_to_gui'],
+                    'pending': len(self._inflight)
+                },
+                'dedupe': {
+                    **self.dedupe_stats,
+                    'dedupe_ratio': round(self.dedupe_stats['path_entries'] /
+                                          max(1, self.dedupe_stats['unique_images']), 2)
                 },
                 'performance': {
                     'total_requests': self.stats['total_requests'],
                     'requests_per_second': round(self.stats['total_requests'] / total_time, 2) if total_time > 0 else 0,
                     'uptime_hours': round(total_time / 3600, 2)
                 },
+                'process_pool': self.process_pool.get_stats() if self.process_pool else None,
+                'theme_index': self.theme_index.get_stats() if self.theme_index else None,
+                'svg': self.svg_rasterizer.get_stats(),
                 'cache_dir': str(self.cache_dir)
             }
 
-    def preload_icons(self, paths: List[str], sizes: Optional[List[int]] = None):
+    def preload_icons(self, paths: List[str], sizes: Optional[List[int]] = None, dpr: float = 1.0):
         """预加载图标"""
         if sizes is None:
             sizes = [ 32, 48, 64]
@@ -585,21 +790,55 @@ class IconCache:
             if os.path.exists(path):
                 for size in sizes:
                     # 异步预加载
-                    self.thread_pool.submit(self.get_icon, path, size)
+                    self.thread_pool.submit(self.get_icon_image, path, size, dpr)
 
         logger.info(f"开始预加载 {len(paths) * len(sizes)} 个图标")
 
+    def pin_icons(self, paths: List[str], sizes: List[int], dpr: float = 1.0):
+        """保留一组图标变体（替换上一组）：在后台预取，之后不参与LRU淘汰，总内存不超过pinned_budget_mb"""
+        dpr = dpr_bucket(dpr)
+        requests = {(os.path.abspath(path.strip()), size, dpr)
+                    for path in paths if path for size in sizes if size > 0}
+        with self.cache_mutex:
+            self._pinned_requests = requests
+            self._pinned_hashes.clear()
+            self._pinned_bytes = 0
+
+        for path, size, dpr in requests:
+            self.thread_pool.submit(self._prefetch_pinned, path, size, dpr)
+
+    def _prefetch_pinned(self, path: str, size: int, dpr: float):
+        """工作线程：加载图标并登记到保留层"""
+        try:
+            self.get_icon_image(path, size, dpr)
+            cache_key = self._get_cache_key(path, size, dpr)
+            with self.cache_mutex:
+                self.stats['prefetches'] += 1
+                if (path, size, dpr) not in self._pinned_requests:
+                    return
+                content_hash = self.path_index.get(cache_key)
+                image = self.memory_cache.get(content_hash) if content_hash else None
+                if image is None or content_hash in self._pinned_hashes:
+                    return
+                nbytes = self._estimate_image_memory(image)
+                if self._pinned_bytes + nbytes > self.pinned_budget_mb * 1024 * 1024:
+                    return
+                self._pinned_hashes[content_hash] = nbytes
+                self._pinned_bytes += nbytes
+        except Exception as e:
+            logger.debug(f"预取图标失败: {path}, {e}")
+
     def export_icon(self, path: str, output_path: str, size: int = 256) -> bool:
         """导出图标到文件"""
         try:
-            pixmap = self.get_icon(path, size)
-            if pixmap and not pixmap.isNull():
+            image = self.get_icon_image(path, size)
+            if not image.isNull():
                 # 确保输出目录存在
                 output_dir = Path(output_path).parent
                 output_dir.mkdir(parents=True, exist_ok=True)
 
                 # 保存为PNG
-                success = pixmap.save(output_path, "PNG", quality=100)
+                success = image.save(output_path, "PNG", quality=100)
                 if success:
                     logger.info(f"图标已导出: {output_path}")
                 return success
@@ -612,6 +851,8 @@ class IconCache:
         """关闭图标缓存，清理资源"""
         try:
             self.thread_pool.shutdown(wait=True)
+            if self.process_pool is not None:
+                self.process_pool.shutdown()
             logger.info("图标缓存已关闭")
         except Exception as e:
-            logger.error(f"关闭图标缓存失败: {e}")
\ No newline at end of file
+            logger.error(f"关闭图标缓存失败: {e}")
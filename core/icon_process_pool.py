@@ -0,0 +1,280 @@
+"""
+图标提取进程池
+在独立的工作进程中提取图标（QIcon加载、.desktop主题图标、SVG光栅化），
+结果以ARGB32原始像素通过共享内存传回，单个任务超时后回收进程池，
+异常文件不会卡住或拖垮启动器本身
+"""
+
+import os
+import sys
+import time
+import logging
+import itertools
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import Optional, Tuple, List, Set, Dict
+
+from PySide6.QtGui import QImage, QIcon
+from PySide6.QtCore import QCoreApplication
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 工作进程中的提取器（每个进程一个）
+_worker_cache = None
+
+
+def _init_worker(cache_dir: str, theme_name: str, theme_paths: List[str]):
+    """工作进程初始化：创建离屏GUI应用，使QIcon和主题图标可用"""
+    global _worker_cache
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtGui import QGuiApplication
+    from core.icon_cache import IconCache
+
+    if QCoreApplication.instance() is None:
+        QGuiApplication([sys.argv[0] if sys.argv else "icon-worker"])
+    if theme_paths:
+        QIcon.setThemeSearchPaths(theme_paths)
+    if theme_name:
+        QIcon.setThemeName(theme_name)
+
+    _worker_cache = IconCache(max_size=1, cache_dir=cache_dir, process_workers=0)
+
+
+def _extract_in_worker(path: str, size: int, shm_name: str) -> Optional[Tuple[str, int, int, int]]:
+    """工作进程：提取图标并写入共享内存，返回 (共享内存名, 宽, 高, 每行字节数)
+
+    共享内存名由主进程指定，工作进程在复制中途被终止时主进程也能找到并释放
+    """
+    image = _worker_cache._extract_icon(path, size)
+    if image is None or image.isNull():
+        return None
+
+    image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    nbytes = image.sizeInBytes()
+    shm = shared_memory.SharedMemory(name=shm_name, create=True, size=max(1, nbytes))
+    try:
+        shm.buf[:nbytes] = memoryview(image.constBits()).cast('B')[:nbytes]
+    finally:
+        shm.close()
+    return shm.name, image.width(), image.height(), image.bytesPerLine()
+
+
+def _image_from_shared_memory(name: str, width: int, height: int, bytes_per_line: int) -> QImage:
+    """从共享内存读取像素并释放共享内存"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        data = bytes(shm.buf[:bytes_per_line * height])
+    finally:
+        shm.close()
+        shm.unlink()
+    # QImage不持有data的引用，复制一份再返回
+    return QImage(data, width, height, bytes_per_line, QImage.Format.Format_ARGB32_Premultiplied).copy()
+
+
+def _release_shared_memory(name: str):
+    """释放没有被读取的共享内存（不存在时忽略）"""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except (FileNotFoundError, OSError, ValueError):
+        return
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class _PendingJob:
+    """提取任务结果的归属：等待的调用方读取结果，调用方放弃后才到达的结果由回调释放"""
+
+    def __init__(self, shm_name: str):
+        self.shm_name = shm_name
+        self._lock = threading.Lock()
+        self._settled = False
+        self._payload = None
+
+    def on_result(self, payload):
+        """进程池结果线程：保存结果，调用方已放弃时直接释放"""
+        with self._lock:
+            if not self._settled:
+                self._payload = payload
+                return
+        if payload is not None:
+            _release_shared_memory(payload[0])
+
+    def claim(self):
+        """调用方取走结果，之后到达的结果不再保存"""
+        with self._lock:
+            self._settled = True
+            payload, self._payload = self._payload, None
+        return payload
+
+    def abandon(self):
+        """调用方放弃任务，释放已到达的结果"""
+        payload = self.claim()
+        if payload is not None:
+            _release_shared_memory(payload[0])
+
+
+class IconProcessPoolError(RuntimeError):
+    """进程池不可用（由调用方退回到进程内提取）"""
+
+
+class IconProcessPool:
+    """图标提取进程池"""
+
+    def __init__(self, workers: int, cache_dir: str, timeout: float = 5.0, max_tasks_per_child: int = 500):
+        self.workers = max(1, workers)
+        self.cache_dir = str(cache_dir)
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+
+        # 超时的文件不再重试，直接使用占位图标
+        self.bad_paths: Set[str] = set()
+
+        self._pool = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # 进程池代号 -> 尚未取走结果的共享内存名，进程池被终止后统一释放
+        self._pending: Dict[int, Set[str]] = {}
+        self._job_ids = itertools.count()
+
+        # 主题信息只能在创建进程池的一方（GUI进程）读取后传给工作进程
+        self._theme_name = ""
+        self._theme_paths: List[str] = []
+        if QCoreApplication.instance() is not None:
+            try:
+                self._theme_name = QIcon.themeName()
+                self._theme_paths = list(QIcon.themeSearchPaths())
+            except Exception:
+                pass
+
+        self.stats = {
+            'jobs': 0,
+            'timeouts': 0,
+            'recycles': 0,
+            'errors': 0,
+            'bytes_transferred': 0
+        }
+
+    def _get_pool(self) -> Tuple[object, int]:
+        """获取当前进程池（按需创建）"""
+        with self._lock:
+            if self._closed:
+                raise IconProcessPoolError("进程池已关闭")
+            if self._pool is None:
+                context = multiprocessing.get_context("spawn")
+                self._pool = context.Pool(
+                    processes=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.cache_dir, self._theme_name, self._theme_paths),
+                    maxtasksperchild=self.max_tasks_per_child
+                )
+                logger.info(f"图标提取进程池已启动: {self.workers} 个进程")
+            return self._pool, self._generation
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def _settle(self, generation: int, job: _PendingJob):
+        """任务结束（结果已取走或已放弃），不再需要在回收进程池时释放"""
+        with self._lock:
+            names = self._pending.get(generation)
+            if names is not None:
+                names.discard(job.shm_name)
+
+    def _release_pending(self, generation: int):
+        """释放已终止的进程池中没有被取走的共享内存（包括复制中途被终止的任务）"""
+        with self._lock:
+            names = self._pending.pop(generation, set())
+        for name in names:
+            _release_shared_memory(name)
+
+    def _recycle(self, generation: int):
+        """终止卡住的进程池，下次提取时重新创建"""
+        with self._lock:
+            if generation != self._generation or self._pool is None:
+                return
+            pool = self._pool
+            self._pool = None
+            self._generation += 1
+            self.stats['recycles'] += 1
+        pool.terminate()
+        self._release_pending(generation)
+        logger.warning("图标提取任务超时，已回收进程池")
+
+    def extract(self, path: str, size: int) -> Optional[QImage]:
+        """在工作进程中提取图标，失败或超时返回None；进程池不可用时抛出IconProcessPoolError"""
+        if path in self.bad_paths:
+            return None
+
+        for _ in range(2):
+            pool, generation = self._get_pool()
+            job = _PendingJob(f"qlicon_{os.getpid():x}_{next(self._job_ids):x}")
+            with self._lock:
+                self._pending.setdefault(generation, set()).add(job.shm_name)
+            try:
+                result = pool.apply_async(_extract_in_worker, (path, size, job.shm_name), callback=job.on_result)
+            except ValueError as e:
+                # 进程池刚被其他线程回收，重新获取
+                self._settle(generation, job)
+                logger.debug(f"提交图标提取任务失败: {e}")
+                continue
+            self._count('jobs')
+
+            deadline = time.monotonic() + self.timeout
+            while not result.ready():
+                if generation != self._generation:
+                    # 进程池因其他任务超时被回收，本任务重新提交一次
+                    job.abandon()
+                    break
+                if time.monotonic() >= deadline:
+                    self._count('timeouts')
+                    self.bad_paths.add(path)
+                    logger.warning(f"图标提取超时: {path}")
+                    job.abandon()
+                    self._recycle(generation)
+                    return None
+                result.wait(0.05)
+            else:
+                # 结果回调在任务标记为完成之前执行，此时结果已保存在job中
+                payload = job.claim()
+                self._settle(generation, job)
+                if not result.successful():
+                    self._count('errors')
+                    try:
+                        result.get()
+                    except Exception as e:
+                        logger.debug(f"工作进程提取图标失败: {path}, {e}")
+                    return None
+                if payload is None:
+                    return None
+                image = _image_from_shared_memory(*payload)
+                self._count('bytes_transferred', image.sizeInBytes())
+                return image
+
+        raise IconProcessPoolError("进程池在任务执行期间被回收")
+
+    def get_stats(self):
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'workers': self.workers, 'bad_paths': len(self.bad_paths)}
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._lock:
+            self._closed = True
+            pool = self._pool
+            self._pool = None
+            generations = list(self._pending)
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        for generation in generations:
+            self._release_pending(generation)
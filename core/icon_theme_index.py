@@ -0,0 +1,367 @@
+"""
+图标主题索引
+按图标主题规范扫描当前主题、其继承的主题和hicolor，预先计算 图标名 -> 各尺寸档位最合适的文件，
+索引紧凑地保存到磁盘，主题目录修改时间变化时重建；
+.desktop应用的主题图标查找从逐目录检查文件变为一次字典查找
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, NamedTuple, Union
+
+from .desktop_entry import DesktopEntry
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 同一目录中同名图标按此顺序优先
+ICON_EXTENSIONS = ('.png', '.svg', '.xpm')
+
+# 预先计算的尺寸档位（像素），请求的尺寸向上取最近的档位
+SIZE_BUCKETS = (16, 22, 24, 32, 48, 64, 96, 128, 256)
+
+# 不属于任何主题的后备图标目录
+PIXMAP_DIRS = ('/usr/share/pixmaps',)
+
+THEME_GROUP = 'Icon Theme'
+
+
+def icon_search_paths() -> List[str]:
+    """图标主题的基础目录，按优先级排列"""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+
+    paths = [os.path.expanduser("~/.icons")]
+    for base in [data_home] + data_dirs.split(os.pathsep):
+        if base:
+            directory = os.path.join(base, "icons")
+            if directory not in paths:
+                paths.append(directory)
+    return paths
+
+
+class ThemeDirectory(NamedTuple):
+    """index.theme中一个图标目录的尺寸信息"""
+    subdir: str
+    size: int
+    scale: int = 1
+    type: str = 'Threshold'
+    min_size: int = 0
+    max_size: int = 0
+    threshold: int = 2
+
+    def distance(self, size: int) -> int:
+        """与请求尺寸的距离（按规范的DirectorySizeDistance，尺寸乘以缩放比例）"""
+        scale = self.scale
+        if self.type == 'Fixed':
+            return abs(self.size * scale - size)
+        if self.type == 'Scalable':
+            if size < self.min_size * scale:
+                return self.min_size * scale - size
+            if size > self.max_size * scale:
+                return size - self.max_size * scale
+            return 0
+        if size < (self.size - self.threshold) * scale:
+            return self.min_size * scale - size
+        if size > (self.size + self.threshold) * scale:
+            return size - self.max_size * scale
+        return 0
+
+
+def _read_int(entry: DesktopEntry, key: str, group: str, default: int) -> int:
+    try:
+        return int(entry.get(key, group=group) or default)
+    except ValueError:
+        return default
+
+
+def _split_names(value: str) -> List[str]:
+    """拆分index.theme中的名称列表（规范为逗号分隔，部分主题使用分号）"""
+    return [name.strip() for name in value.replace(';', ',').split(',') if name.strip()]
+
+
+def parse_index_theme(path: str) -> Tuple[List[str], List[ThemeDirectory]]:
+    """解析主题的index.theme，返回 (继承的主题, 图标目录)"""
+    entry = DesktopEntry.parse(path)
+    inherits = _split_names(entry.get('Inherits', group=THEME_GROUP))
+
+    directories = []
+    seen = set()
+    for subdir in (_split_names(entry.get('Directories', group=THEME_GROUP))
+                   + _split_names(entry.get('ScaledDirectories', group=THEME_GROUP))):
+        if subdir in seen or subdir not in entry.groups:
+            continue
+        seen.add(subdir)
+        size = _read_int(entry, 'Size', subdir, 0)
+        if size <= 0:
+            continue
+        directories.append(ThemeDirectory(
+            subdir=subdir,
+            size=size,
+            scale=max(1, _read_int(entry, 'Scale', subdir, 1)),
+            type=entry.get('Type', 'Threshold', group=subdir),
+            min_size=_read_int(entry, 'MinSize', subdir, size),
+            max_size=_read_int(entry, 'MaxSize', subdir, size),
+            threshold=_read_int(entry, 'Threshold', subdir, 2)
+        ))
+    return inherits, directories
+
+
+class IconThemeIndex:
+    """图标主题索引（线程安全）"""
+
+    INDEX_VERSION = 1
+    index_file0 = Path(__file__).parent.parent / "cache" / "icon_theme_index.json"
+
+    def __init__(self, theme_name: str = 'hicolor', index_file: str = index_file0,
+                 search_paths: Optional[List[str]] = None, pixmap_dirs: Optional[List[str]] = None,
+                 check_interval: float = 5.0):
+        self.theme_name = theme_name or 'hicolor'
+        self.index_file = Path(index_file)
+        self.search_paths = list(search_paths) if search_paths is not None else icon_search_paths()
+        self.pixmap_dirs = list(pixmap_dirs) if pixmap_dirs is not None else list(PIXMAP_DIRS)
+        # 两次检查目录修改时间的最小间隔（秒）
+        self.check_interval = check_interval
+
+        # 图标目录表；图标名 -> 编码（目录序号 * 4 + 扩展名序号），各档位相同时只存一个整数
+        self._dirs: List[str] = []
+        self._icons: Dict[str, Union[int, List[int]]] = {}
+        # 建立索引时读取的目录和index.theme的修改时间，任一变化时重建
+        self._mtimes: Dict[str, int] = {}
+        self._chain: List[str] = []
+        self._ready = False
+        self._force_build = False
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'misses': 0,
+            'builds': 0,
+            'loads': 0,
+            'stat_calls': 0,
+            'last_build_ms': 0.0
+        }
+
+    def set_theme(self, theme_name: str):
+        """切换当前主题（下次查找时重建或重新加载索引）"""
+        theme_name = theme_name or 'hicolor'
+        with self._lock:
+            if theme_name != self.theme_name:
+                self.theme_name = theme_name
+                self._ready = False
+
+    def _mtime(self, path: str) -> int:
+        self.stats['stat_calls'] += 1
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return -1
+
+    def _theme_roots(self, theme: str) -> List[str]:
+        return [os.path.join(base, theme) for base in self.search_paths]
+
+    def _build(self):
+        """扫描主题链（当前主题、继承的主题、hicolor）建立索引"""
+        start = time.perf_counter()
+        dirs: List[str] = []
+        icons: Dict[str, Union[int, List[int]]] = {}
+        mtimes: Dict[str, int] = {base: self._mtime(base) for base in self.search_paths}
+
+        chain: List[str] = []
+        pending = [self.theme_name]
+        while pending or 'hicolor' not in chain:
+            theme = pending.pop(0) if pending else 'hicolor'
+            if theme in chain:
+                continue
+            chain.append(theme)
+
+            roots = self._theme_roots(theme)
+            index_path = None
+            for root in roots:
+                mtimes[root] = self._mtime(root)
+                candidate = os.path.join(root, 'index.theme')
+                if index_path is None and mtimes[root] >= 0 and os.path.isfile(candidate):
+                    index_path = candidate
+                    mtimes[candidate] = self._mtime(candidate)
+            if index_path is None:
+                continue
+            try:
+                inherits, theme_dirs = parse_index_theme(index_path)
+            except OSError as e:
+                logger.debug(f"读取主题失败: {index_path}, {e}")
+                continue
+            pending.extend(inherits)
+
+            # 图标名 -> [(目录信息, 编码)]，同一主题中按目录顺序排列
+            found: Dict[str, List[Tuple[ThemeDirectory, int]]] = {}
+            for theme_dir in theme_dirs:
+                for root in roots:
+                    directory = os.path.join(root, theme_dir.subdir)
+                    mtime = self._mtime(directory)
+                    if mtime < 0:
+                        continue
+                    mtimes[directory] = mtime
+                    dir_id = len(dirs)
+                    dirs.append(directory)
+                    self._scan_icons(directory, dir_id, found, theme_dir)
+
+            # 先出现的主题优先，主题中有该图标时不再查找继承的主题
+            for name, candidates in found.items():
+                if name not in icons:
+                    icons[name] = self._best_per_bucket(candidates)
+
+        # 后备目录中的图标不分尺寸
+        for directory in self.pixmap_dirs:
+            mtime = self._mtime(directory)
+            mtimes[directory] = mtime
+            if mtime < 0:
+                continue
+            dir_id = len(dirs)
+            dirs.append(directory)
+            unthemed: Dict[str, List[Tuple[ThemeDirectory, int]]] = {}
+            self._scan_icons(directory, dir_id, unthemed, None)
+            for name, candidates in unthemed.items():
+                icons.setdefault(name, min(code for _, code in candidates))
+
+        self._dirs = dirs
+        self._icons = icons
+        self._mtimes = mtimes
+        self._chain = chain
+        self.stats['builds'] += 1
+        self.stats['last_build_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        logger.debug(f"图标主题索引已建立: {' -> '.join(chain)}, {len(dirs)} 个目录, {len(icons)} 个图标")
+
+    @staticmethod
+    def _scan_icons(directory: str, dir_id: int, found: Dict[str, List[Tuple[ThemeDirectory, int]]],
+                    theme_dir: Optional[ThemeDirectory]):
+        """列出目录中的图标文件"""
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name, ext = os.path.splitext(entry.name)
+                    if ext in ICON_EXTENSIONS:
+                        found.setdefault(name, []).append(
+                            (theme_dir, dir_id * 4 + ICON_EXTENSIONS.index(ext)))
+        except OSError as e:
+            logger.debug(f"扫描图标目录失败: {directory}, {e}")
+
+    @staticmethod
+    def _best_per_bucket(candidates: List[Tuple[ThemeDirectory, int]]) -> Union[int, List[int]]:
+        """每个尺寸档位中距离最近的文件，距离相同时目录靠前、扩展名靠前的优先"""
+        codes = [min(candidates, key=lambda c: (c[0].distance(bucket), c[1]))[1] for bucket in SIZE_BUCKETS]
+        return codes[0] if codes.count(codes[0]) == len(codes) else codes
+
+    def _load(self) -> bool:
+        """读取磁盘索引，主题、目录和修改时间都未变化时使用"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if (data.get('version') != self.INDEX_VERSION or data.get('theme') != self.theme_name
+                or data.get('search_paths') != self.search_paths or data.get('pixmap_dirs') != self.pixmap_dirs):
+            return False
+        mtimes = data.get('mtimes', {})
+        if any(self._mtime(path) != mtime for path, mtime in mtimes.items()):
+            return False
+
+        self._dirs = data.get('dirs', [])
+        self._icons = data.get('icons', {})
+        self._mtimes = mtimes
+        self._chain = data.get('chain', [])
+        self.stats['loads'] += 1
+        return True
+
+    def _save(self):
+        """写入磁盘索引"""
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_file.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': self.INDEX_VERSION,
+                    'theme': self.theme_name,
+                    'search_paths': self.search_paths,
+                    'pixmap_dirs': self.pixmap_dirs,
+                    'chain': self._chain,
+                    'mtimes': self._mtimes,
+                    'dirs': self._dirs,
+                    'icons': self._icons
+                }, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.index_file)
+        except OSError as e:
+            logger.warning(f"保存图标主题索引失败: {e}")
+
+    def _ensure_fresh(self):
+        """首次查找时加载或建立索引，之后按间隔检查目录修改时间"""
+        if not self._ready:
+            if self._force_build or not self._load():
+                self._build()
+                self._save()
+            self._ready = True
+            self._force_build = False
+            self._last_check = time.monotonic()
+            return
+
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        for path, mtime in self._mtimes.items():
+            if self._mtime(path) != mtime:
+                self._build()
+                self._save()
+                return
+
+    def lookup(self, icon_name: str, size: int) -> Optional[str]:
+        """查找图标名在该尺寸下最合适的文件路径，找不到时返回None"""
+        name, ext = os.path.splitext(icon_name)
+        if ext not in ICON_EXTENSIONS:
+            name = icon_name
+
+        with self._lock:
+            self.stats['lookups'] += 1
+            self._ensure_fresh()
+            value = self._icons.get(name)
+            if value is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            if not isinstance(value, int):
+                value = value[min(bisect.bisect_left(SIZE_BUCKETS, size), len(SIZE_BUCKETS) - 1)]
+            dir_id, ext_id = divmod(value, 4)
+            return os.path.join(self._dirs[dir_id], name + ICON_EXTENSIONS[ext_id])
+
+    def invalidate(self):
+        """下次查找时强制重建"""
+        with self._lock:
+            self._ready = False
+            self._force_build = True
+
+    def get_stats(self) -> Dict[str, object]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'theme': self.theme_name, 'chain': list(self._chain),
+                    'dirs': len(self._dirs), 'icons': len(self._icons)}
+
+
+# 全局共享的图标主题索引
+_shared_index: Optional[IconThemeIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_icon_theme_index() -> IconThemeIndex:
+    """获取全局共享的图标主题索引"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = IconThemeIndex()
+        return _shared_index
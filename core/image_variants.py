@@ -0,0 +1,214 @@
+"""
+背景图片缩放变体缓存
+在工作线程中按屏幕/窗口尺寸和设备像素比解码出合适尺寸的图片变体，
+以图片内容哈希为键缓存到磁盘，QML只加载与窗口尺寸最接近的变体
+"""
+
+import os
+import math
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any, Tuple
+
+from PySide6.QtGui import QImageReader
+from PySide6.QtCore import QObject, Signal, QSize
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+
+class ImageVariantCache(QObject):
+    """背景图片变体缓存"""
+
+    # 变体尺寸档位（长边像素），窗口尺寸在同一档位内变化时复用同一个变体
+    SIZE_LADDER = (640, 960, 1280, 1600, 1920, 2560, 3200, 3840, 5120, 7680)
+
+    # 变体生成完成（请求键, 图片路径, 宽, 高），在工作线程中发出，失败时路径为空
+    variant_ready = Signal(str, str, int, int)
+
+    cache_dir0 = Path(__file__).parent.parent / "cache" / "bg_variants"
+
+    def __init__(self, cache_dir: str = cache_dir0, max_files: int = 24):
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_files = max_files
+
+        # (路径, 修改时间, 大小) -> 内容哈希，避免重复读取整个文件
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        # 请求键 -> (变体路径, 宽, 高)
+        self._resolved: Dict[str, Tuple[str, int, int]] = {}
+        self._pending = set()
+        self._lock = threading.RLock()
+
+        self.stats = {
+            'requests': 0,
+            'resolved_hits': 0,
+            'disk_hits': 0,
+            'decodes': 0,
+            'decode_ms': 0.0,
+            'last_decode_ms': 0.0,
+            'last_image_bytes': 0
+        }
+
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    @staticmethod
+    def _file_signature(image_path: str) -> Tuple[str, int, int]:
+        stat = os.stat(image_path)
+        return os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size
+
+    def content_hash(self, image_path: str) -> str:
+        """图片内容的SHA-256（同一文件未修改时只计算一次）"""
+        signature = self._file_signature(image_path)
+        with self._lock:
+            cached = self._hashes.get(signature)
+        if cached:
+            return cached
+
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        value = digest.hexdigest()
+        with self._lock:
+            self._hashes[signature] = value
+        return value
+
+    @classmethod
+    def bucket_for(cls, long_edge: int) -> int:
+        """不小于所需长边的最小档位"""
+        for bucket in cls.SIZE_LADDER:
+            if bucket >= long_edge:
+                return bucket
+        return cls.SIZE_LADDER[-1]
+
+    @staticmethod
+    def cover_size(image_size: QSize, width: int, height: int, device_pixel_ratio: float) -> QSize:
+        """等比缩放到刚好覆盖 窗口尺寸×设备像素比 时的图片尺寸（不放大）"""
+        target_w = max(1, math.ceil(width * device_pixel_ratio))
+        target_h = max(1, math.ceil(height * device_pixel_ratio))
+        scale = min(1.0, max(target_w / image_size.width(), target_h / image_size.height()))
+        return QSize(max(1, round(image_size.width() * scale)), max(1, round(image_size.height() * scale)))
+
+    @staticmethod
+    def request_key(image_path: str, width: int, height: int, device_pixel_ratio: float) -> str:
+        """请求键：同一图片文件在同一物理尺寸下的请求视为相同"""
+        try:
+            signature = ImageVariantCache._file_signature(image_path)
+        except OSError:
+            signature = (os.path.abspath(image_path), 0, 0)
+        target = (math.ceil(width * device_pixel_ratio), math.ceil(height * device_pixel_ratio))
+        return hashlib.md5(f"{signature}|{target}".encode('utf-8')).hexdigest()
+
+    def request(self, image_path: str, width: int, height: int,
+                device_pixel_ratio: float = 1.0) -> Tuple[str, Optional[Tuple[str, int, int]]]:
+        """获取图片变体，返回 (请求键, (路径, 宽, 高))；尚未生成时结果为None，
+        在工作线程中生成后发出variant_ready"""
+        self.stats['requests'] += 1
+        key = self.request_key(image_path, width, height, device_pixel_ratio)
+        with self._lock:
+            resolved = self._resolved.get(key)
+            if resolved and os.path.exists(resolved[0]):
+                self.stats['resolved_hits'] += 1
+                return key, resolved
+            if key in self._pending:
+                return key, None
+            self._pending.add(key)
+
+        self._executor.submit(self._variant_job, key, image_path, width, height, device_pixel_ratio)
+        return key, None
+
+    def _variant_job(self, key: str, image_path: str, width: int, height: int, device_pixel_ratio: float):
+        """工作线程：计算内容哈希、选择档位、按需解码并写入磁盘"""
+        result = ("", 0, 0)
+        try:
+            result = self.create_variant(image_path, width, height, device_pixel_ratio)
+            with self._lock:
+                self._resolved[key] = result
+        except Exception as e:
+            logger.error(f"生成背景图片变体失败: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+            self.variant_ready.emit(key, *result)
+
+    def create_variant(self, image_path: str, width: int, height: int,
+                       device_pixel_ratio: float = 1.0) -> Tuple[str, int, int]:
+        """生成（或从磁盘复用）覆盖指定窗口尺寸的变体，返回 (路径, 宽, 高)"""
+        reader = QImageReader(image_path)
+        reader.setAutoTransform(True)
+        image_size = reader.size()
+        if not image_size.isValid():
+            raise ValueError(f"无法读取图片尺寸: {image_path} ({reader.errorString()})")
+
+        cover = self.cover_size(image_size, width, height, device_pixel_ratio)
+        long_edge = max(image_size.width(), image_size.height())
+        bucket = self.bucket_for(max(cover.width(), cover.height()))
+
+        # 原图不大于档位时直接使用原图
+        if long_edge <= bucket:
+            return os.path.abspath(image_path), image_size.width(), image_size.height()
+
+        scale = bucket / long_edge
+        variant_size = QSize(max(1, round(image_size.width() * scale)), max(1, round(image_size.height() * scale)))
+
+        content_hash = self.content_hash(image_path)
+        stem = f"{content_hash[:24]}_{bucket}"
+        for suffix in (".jpg", ".png"):
+            disk_path = self.cache_dir / f"{stem}{suffix}"
+            if disk_path.exists():
+                self.stats['disk_hits'] += 1
+                os.utime(disk_path)
+                return str(disk_path), variant_size.width(), variant_size.height()
+
+        # 解码时直接缩放（JPEG可在解码阶段按比例缩小），不生成原始尺寸的位图
+        start = time.perf_counter()
+        reader.setScaledSize(variant_size)
+        image = reader.read()
+        if image.isNull():
+            raise ValueError(f"解码图片失败: {image_path} ({reader.errorString()})")
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.stats['decodes'] += 1
+        self.stats['decode_ms'] += elapsed
+        self.stats['last_decode_ms'] = round(elapsed, 2)
+        self.stats['last_image_bytes'] = image.sizeInBytes()
+
+        suffix = ".png" if image.hasAlphaChannel() else ".jpg"
+        disk_path = self.cache_dir / f"{stem}{suffix}"
+        temp_path = self.cache_dir / f"{stem}.tmp{suffix}"
+        if not image.save(str(temp_path), "PNG" if suffix == ".png" else "JPEG", 90):
+            raise IOError(f"保存图片变体失败: {temp_path}")
+        os.replace(temp_path, disk_path)
+        self._prune()
+
+        logger.info(f"背景图片变体已生成: {image_size.width()}x{image_size.height()} -> "
+                    f"{image.width()}x{image.height()}, 解码 {elapsed:.1f} ms")
+        return str(disk_path), image.width(), image.height()
+
+    def _prune(self):
+        """只保留最近使用的若干个变体文件"""
+        try:
+            files = sorted(
+                (f for f in self.cache_dir.iterdir() if f.is_file()),
+                key=lambda f: f.stat().st_mtime, reverse=True
+            )
+            for old_file in files[self.max_files:]:
+                old_file.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"清理图片变体缓存失败: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        with self._lock:
+            pending = len(self._pending)
+        return {**self.stats, 'pending': pending, 'cache_dir': str(self.cache_dir)}
+
+    def shutdown(self):
+        """停止工作线程"""
+        self._executor.shutdown(wait=False)
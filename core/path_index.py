@@ -0,0 +1,135 @@
+"""
+系统路径索引
+将常用系统目录和PATH中各目录的文件建立 文件名 -> 完整路径 的索引，
+按目录修改时间定期刷新，查找不存在的应用时不再逐个目录检查文件
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+
+def _system_dirs() -> List[str]:
+    """常见系统目录（按查找优先级排列）"""
+    if sys.platform == 'win32':
+        system_root = os.environ.get("SystemRoot", r"C:\Windows")
+        return [
+            system_root,
+            system_root + r"\System32",
+            os.environ.get("ProgramFiles", r"C:\Program Files"),
+            os.environ.get("ProgramFiles(x86)", r"C:\Program Files (x86)"),
+        ]
+    return [
+        "/usr/bin",
+        "/usr/local/bin",
+        "/usr/share/applications",
+        os.path.expanduser("~/.local/share/applications")
+    ]
+
+
+class SystemPathIndex:
+    """系统目录与PATH的文件名索引"""
+
+    def __init__(self, check_interval: float = 5.0):
+        # 两次检查目录修改时间的最小间隔（秒）
+        self.check_interval = check_interval
+
+        self._dirs: List[str] = []
+        self._path_env: Optional[str] = None
+        self._dir_mtimes: Dict[str, float] = {}
+        self._entries: Dict[str, str] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'lookups': 0,
+            'rebuilds': 0,
+            'stat_calls': 0,
+            'listdir_calls': 0
+        }
+
+    @staticmethod
+    def _normalize(name: str) -> str:
+        return name.lower() if sys.platform == 'win32' else name
+
+    def search_dirs(self) -> List[str]:
+        """查找顺序：系统目录，然后是PATH中的目录（去重）"""
+        dirs = []
+        seen = set()
+        for directory in _system_dirs() + os.environ.get("PATH", "").split(os.pathsep):
+            if not directory:
+                continue
+            key = self._normalize(os.path.normpath(directory))
+            if key not in seen:
+                seen.add(key)
+                dirs.append(directory)
+        return dirs
+
+    def _dir_mtime(self, directory: str) -> float:
+        self.stats['stat_calls'] += 1
+        try:
+            return os.stat(directory).st_mtime
+        except OSError:
+            return -1.0
+
+    def _rebuild(self):
+        """重新扫描所有目录"""
+        self._dirs = self.search_dirs()
+        self._path_env = os.environ.get("PATH", "")
+        self._dir_mtimes = {directory: self._dir_mtime(directory) for directory in self._dirs}
+
+        entries: Dict[str, str] = {}
+        for directory in self._dirs:
+            if self._dir_mtimes[directory] < 0:
+                continue
+            self.stats['listdir_calls'] += 1
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        # 先出现的目录优先
+                        entries.setdefault(self._normalize(entry.name), entry.path)
+            except OSError as e:
+                logger.debug(f"扫描目录失败: {directory}, {e}")
+
+        self._entries = entries
+        self._last_check = time.monotonic()
+        self.stats['rebuilds'] += 1
+        logger.debug(f"系统路径索引已建立: {len(self._dirs)} 个目录, {len(entries)} 个文件")
+
+    def _refresh_if_stale(self):
+        """PATH变化或任一目录修改时间变化时重建索引"""
+        if self._path_env is None or os.environ.get("PATH", "") != self._path_env:
+            self._rebuild()
+            return
+
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        for directory, mtime in self._dir_mtimes.items():
+            if self._dir_mtime(directory) != mtime:
+                self._rebuild()
+                return
+
+    def lookup(self, filename: str) -> Optional[str]:
+        """按文件名查找完整路径"""
+        with self._lock:
+            self.stats['lookups'] += 1
+            self._refresh_if_stale()
+            return self._entries.get(self._normalize(os.path.basename(filename)))
+
+    def invalidate(self):
+        """下次查找时强制重建"""
+        with self._lock:
+            self._path_env = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'dirs': len(self._dirs), 'entries': len(self._entries)}
@@ -0,0 +1,362 @@
+"""
+应用路径状态缓存
+缓存应用路径是否存在及其修改时间、大小，通过监视父目录和定期后台复查保持最新，
+列表和搜索读取缓存的状态，不再对每个应用调用os.path.exists
+"""
+
+import os
+import re
+import sys
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Iterable, NamedTuple, Tuple
+
+from PySide6.QtCore import QObject, Signal, Slot, QTimer, QFileSystemWatcher
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+
+class PathStatus(NamedTuple):
+    """路径状态"""
+    exists: bool
+    mtime: float = 0.0
+    size: int = 0
+
+
+def stat_path(path: str) -> PathStatus:
+    """读取路径的当前状态"""
+    try:
+        stat = os.stat(path)
+        return PathStatus(True, stat.st_mtime, stat.st_size)
+    except (OSError, ValueError):
+        return PathStatus(False)
+
+
+# 同一个卷上超时的路径达到这个数量后，该卷上尚未检查的路径不再检查（视为无响应）
+STUCK_PATHS_PER_VOLUME = 2
+
+
+def _mount_points() -> List[str]:
+    """当前的挂载点（最长的在前），读取/proc/self/mounts不会访问挂载的文件系统"""
+    try:
+        with open("/proc/self/mounts", encoding="utf-8", errors="replace") as f:
+            points = {re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), line.split()[1])
+                      for line in f if len(line.split()) > 1}
+    except OSError:
+        return []
+    return sorted(points, key=len, reverse=True)
+
+
+def volume_key(path: str, mount_points: Optional[List[str]] = None) -> str:
+    """路径所在的卷：盘符或\\\\服务器\\共享、挂载点，都没有时为前两级目录（不访问文件系统）"""
+    path = os.path.normcase(os.path.abspath(path))
+    drive = os.path.splitdrive(path)[0]
+    if drive:
+        return drive
+    for point in mount_points or ():
+        if point != "/" and (path == point or path.startswith(point.rstrip("/") + "/")):
+            return point
+    parts = path.split(os.sep)
+    return os.sep.join(parts[:3])
+
+
+def stat_paths(paths: Iterable[str], timeout: float = 2.0, max_workers: int = 16,
+               progress: Optional[Callable[[int, int], None]] = None
+               ) -> Tuple[Dict[str, PathStatus], List[str]]:
+    """在守护线程上并发读取路径状态，返回 (路径 -> 状态, 超时的路径)
+
+    每个路径单独计时，超过timeout仍未返回（如网络驱动器无响应）的路径记为超时，卡住的线程由新线程替代；
+    同一个卷上超时的路径达到STUCK_PATHS_PER_VOLUME个后，该卷上剩余的路径直接记为超时，其他卷上的路径照常检查。
+    卡住的线程是守护线程，不会阻止程序退出。progress(已检查数, 总数) 在调用线程中被调用
+    """
+    paths = list(dict.fromkeys(paths))
+    total = len(paths)
+    statuses: Dict[str, PathStatus] = {}
+    timed_out: List[str] = []
+    if not paths:
+        return statuses, timed_out
+
+    mount_points = _mount_points() if sys.platform != "win32" else []
+    volumes: Dict[str, deque] = {}
+    for path in paths:
+        volumes.setdefault(volume_key(path, mount_points), deque()).append(path)
+    path_volumes = {path: volume for volume, volume_paths in volumes.items() for path in volume_paths}
+
+    # 各卷的路径轮流排队，一个无响应的卷不会占满开始时的全部线程
+    tasks: "queue.Queue[Optional[str]]" = queue.Queue()
+    while volumes:
+        for volume in list(volumes):
+            tasks.put(volumes[volume].popleft())
+            if not volumes[volume]:
+                del volumes[volume]
+
+    results: "queue.Queue[Tuple[str, Optional[PathStatus]]]" = queue.Queue()
+    started: Dict[str, float] = {}
+    abandoned = set()
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            path = tasks.get()
+            if path is None:
+                return
+            with lock:
+                if path_volumes[path] in abandoned:
+                    skip = True
+                else:
+                    skip = False
+                    started[path] = time.monotonic()
+            results.put((path, None if skip else stat_path(path)))
+
+    def start_worker():
+        threading.Thread(target=worker, name="PathStat", daemon=True).start()
+
+    workers = max(1, min(max_workers, total))
+    for _ in range(workers):
+        start_worker()
+
+    stuck_counts: Dict[str, int] = {}
+    resolved = set()
+    last_reported = -1
+    while len(resolved) < total:
+        try:
+            path, status = results.get(timeout=0.05)
+            if path not in resolved:
+                resolved.add(path)
+                if status is None:
+                    timed_out.append(path)
+                else:
+                    statuses[path] = status
+        except queue.Empty:
+            pass
+
+        # 已开始且超时的路径放弃等待，启动新线程替代卡住的线程
+        now = time.monotonic()
+        with lock:
+            expired = [path for path, start in started.items()
+                       if path not in resolved and now - start > timeout]
+            for path in expired:
+                del started[path]
+                resolved.add(path)
+                timed_out.append(path)
+                volume = path_volumes[path]
+                stuck_counts[volume] = stuck_counts.get(volume, 0) + 1
+                if stuck_counts[volume] >= STUCK_PATHS_PER_VOLUME:
+                    abandoned.add(volume)
+        for _ in expired:
+            start_worker()
+            workers += 1
+
+        if progress and len(resolved) != last_reported:
+            last_reported = len(resolved)
+            progress(last_reported, total)
+
+    # 每个线程取到一个结束标记后退出（卡住的线程恢复后也会退出）
+    for _ in range(workers):
+        tasks.put(None)
+    if abandoned:
+        logger.warning(f"无响应的卷，已跳过剩余路径: {sorted(abandoned)}")
+    return statuses, timed_out
+
+
+class PathStatusCache(QObject):
+    """应用路径状态缓存"""
+
+    # 状态发生变化的路径列表
+    status_changed = Signal(list)
+    # 工作线程复查完成 / 请求在GUI线程添加目录监视
+    _statuses_checked = Signal(dict)
+    _watch_requested = Signal(str)
+
+    def __init__(self, sweep_interval: int = 60000, stat_timeout: float = 2.0, parent=None):
+        super().__init__(parent)
+        self._statuses: Dict[str, PathStatus] = {}
+        # 父目录 -> 该目录下被跟踪的路径
+        self._dir_paths: Dict[str, set] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'lookups': 0,
+            'misses': 0,
+            'stat_calls': 0,
+            'dir_events': 0,
+            'sweeps': 0,
+            'skipped_sweeps': 0,
+            'timeouts': 0,
+            'changes': 0
+        }
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._statuses_checked.connect(self._apply_statuses)
+        self._watch_requested.connect(self._watch_directory)
+
+        # 网络驱动器等不一定有目录变化通知，定期在后台复查全部路径；
+        # 复查在守护线程中进行，每个路径有超时，无响应的驱动器不会让后续复查排队或阻止程序退出
+        self._stat_timeout = stat_timeout
+        # (路径列表, 是否为全部路径的定期复查)，None表示停止
+        self._jobs: "queue.Queue[Optional[Tuple[List[str], bool]]]" = queue.Queue()
+        self._sweep_queued = False
+        threading.Thread(target=self._run_jobs, name="PathStatusSweep", daemon=True).start()
+        self._sweep_timer = QTimer(self)
+        self._sweep_timer.timeout.connect(self.revalidate)
+        self._sweep_timer.start(sweep_interval)
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def status(self, path: str) -> PathStatus:
+        """获取路径状态，已跟踪的路径不访问文件系统"""
+        key = self._key(path)
+        with self._lock:
+            self.stats['lookups'] += 1
+            cached = self._statuses.get(key)
+        if cached is not None:
+            return cached
+
+        # 首次查询时读取并开始跟踪
+        status = self._stat(path)
+        directory = os.path.dirname(key)
+        with self._lock:
+            self.stats['misses'] += 1
+            self._statuses[key] = status
+            new_dir = directory not in self._dir_paths
+            self._dir_paths.setdefault(directory, set()).add(key)
+        if new_dir:
+            self._watch_requested.emit(directory)
+        return status
+
+    def exists(self, path: str) -> bool:
+        """路径是否存在（读取缓存）"""
+        return self.status(path).exists
+
+    def track(self, paths: Iterable[str]):
+        """批量开始跟踪路径"""
+        for path in paths:
+            self.status(path)
+
+    def refresh(self, path: str) -> PathStatus:
+        """立即重新读取路径状态（如启动应用前）"""
+        key = self._key(path)
+        self.status(path)
+        status = self._stat(path)
+        self._apply_statuses({key: status})
+        return status
+
+    def update_statuses(self, statuses: Dict[str, PathStatus]):
+        """用外部读取到的状态更新缓存（可在任意线程调用，在GUI线程中应用）"""
+        self._statuses_checked.emit({self._key(path): status for path, status in statuses.items()})
+
+    def _stat(self, path: str) -> PathStatus:
+        with self._lock:
+            self.stats['stat_calls'] += 1
+        return stat_path(path)
+
+    @Slot(str)
+    def _watch_directory(self, directory: str):
+        """监视目录（只在GUI线程中修改监视器）"""
+        if os.path.isdir(directory) and directory not in self._watcher.directories():
+            if not self._watcher.addPath(directory):
+                logger.debug(f"无法监视目录: {directory}")
+
+    @Slot(str)
+    def _on_directory_changed(self, directory: str):
+        """目录内容变化，后台复查该目录下的路径"""
+        key = self._key(directory)
+        with self._lock:
+            self.stats['dir_events'] += 1
+            paths = list(self._dir_paths.get(key, ()))
+        if paths:
+            self._jobs.put((paths, False))
+
+    @Slot()
+    def revalidate(self):
+        """后台复查全部已跟踪的路径（上一次复查尚未完成时跳过）"""
+        with self._lock:
+            if self._sweep_queued:
+                self.stats['skipped_sweeps'] += 1
+                return
+            self.stats['sweeps'] += 1
+            paths = list(self._statuses)
+            self._sweep_queued = bool(paths)
+        if paths:
+            self._jobs.put((paths, True))
+
+    def _run_jobs(self):
+        """守护线程：依次处理复查任务"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            paths, is_sweep = job
+            self._check_job(paths)
+            if is_sweep:
+                with self._lock:
+                    self._sweep_queued = False
+
+    def _check_job(self, paths: List[str]):
+        """读取路径状态（超时的路径保留原状态），结果交给GUI线程应用"""
+        try:
+            statuses, timed_out = stat_paths(paths, self._stat_timeout, max_workers=4)
+            with self._lock:
+                self.stats['stat_calls'] += len(paths) - len(timed_out)
+                self.stats['timeouts'] += len(timed_out)
+            self._statuses_checked.emit(statuses)
+        except Exception as e:
+            logger.error(f"复查应用路径失败: {e}")
+
+    @Slot(dict)
+    def _apply_statuses(self, statuses: Dict[str, PathStatus]):
+        """更新缓存，状态变化时发出status_changed"""
+        changed = []
+        with self._lock:
+            for key, status in statuses.items():
+                status = PathStatus(*status)
+                if key in self._statuses and self._statuses[key] != status:
+                    changed.append(key)
+                self._statuses[key] = status
+            self.stats['changes'] += len(changed)
+
+        # 被删除后重新创建的目录需要重新监视
+        for directory in {os.path.dirname(key) for key in changed}:
+            self._watch_directory(directory)
+
+        if changed:
+            self.status_changed.emit(changed)
+
+    def forget(self, path: str):
+        """停止跟踪路径"""
+        key = self._key(path)
+        with self._lock:
+            self._statuses.pop(key, None)
+            paths = self._dir_paths.get(os.path.dirname(key))
+            if paths is not None:
+                paths.discard(key)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'tracked': len(self._statuses),
+                    'watched_dirs': len(self._watcher.directories())}
+
+    def shutdown(self):
+        """停止复查"""
+        self._sweep_timer.stop()
+        self._jobs.put(None)
+
+
+# 全局共享的路径状态缓存（主窗口和快捷窗口的应用管理器共用）
+_shared_cache: Optional[PathStatusCache] = None
+
+
+def get_path_status_cache() -> PathStatusCache:
+    """获取全局共享的路径状态缓存（需在GUI线程中首次调用）"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = PathStatusCache()
+    return _shared_cache
@@ -0,0 +1,287 @@
+"""
+占位图标缓存
+文件类型、默认、加载中、错误等程序生成的图标按 (类型, 扩展名, 尺寸, 设备像素比) 缓存，
+只绘制一次，所有占位图标路径共享；常用尺寸在启动时由工作线程预先绘制
+"""
+
+import math
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple, Iterable, Optional
+
+from PySide6.QtGui import QImage, QPainter, QColor, QPen, QFont, QLinearGradient, QBrush
+from PySide6.QtCore import Qt, QRect
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 文件类型颜色映射
+FILETYPE_COLORS = {
+    '.exe': QColor(0, 120, 215),  # Windows蓝
+    '.lnk': QColor(255, 165, 0),  # 橙色
+    '.msi': QColor(16, 124, 16),  # 深绿
+    '.dll': QColor(106, 0, 95),  # 紫红
+    '.sys': QColor(178, 0, 32),  # 深红
+    '.bat': QColor(64, 64, 64),  # 深灰
+    '.cmd': QColor(64, 64, 64),
+    '.ps1': QColor(0, 51, 153),  # PowerShell蓝
+    '.zip': QColor(251, 140, 0),
+    '.rar': QColor(251, 140, 0),
+    '.7z': QColor(251, 140, 0),
+    '.iso': QColor(139, 195, 74),  # 浅绿
+}
+
+
+class PlaceholderIcons:
+    """占位图标缓存（只使用QImage，可在任意线程调用）"""
+
+    KINDS = ('filetype', 'default', 'app', 'loading', 'error')
+
+    # 启动时预先绘制的尺寸
+    COMMON_SIZES = (16, 24, 32, 48, 64)
+
+    def __init__(self):
+        self._images: Dict[Tuple[str, str, int, float], QImage] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {
+            'requests': 0,
+            'hits': 0,
+            'renders': 0
+        }
+
+    def get(self, kind: str, size: int, ext: str = '', dpr: float = 1.0) -> QImage:
+        """获取占位图标，未缓存时绘制并缓存"""
+        ext = ext.lower() if kind == 'filetype' else ''
+        key = (kind, ext, size, round(dpr, 2))
+        with self._lock:
+            self.stats['requests'] += 1
+            image = self._images.get(key)
+            if image is not None:
+                self.stats['hits'] += 1
+                return image
+
+        image = self.render(kind, size, ext, dpr)
+        with self._lock:
+            self.stats['renders'] += 1
+            # 并发绘制同一图标时保留先完成的一份
+            return self._images.setdefault(key, image)
+
+    def prewarm(self, sizes: Iterable[int] = COMMON_SIZES, dpr: float = 1.0):
+        """在工作线程中预先绘制常用尺寸的占位图标"""
+        sizes = tuple(sizes)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._executor.submit(self._prewarm_job, sizes, dpr)
+
+    def _prewarm_job(self, sizes: Tuple[int, ...], dpr: float):
+        try:
+            start = time.perf_counter()
+            for size in sizes:
+                for kind in self.KINDS:
+                    if kind == 'filetype':
+                        for ext in list(FILETYPE_COLORS) + ['']:
+                            self.get(kind, size, ext, dpr)
+                    else:
+                        self.get(kind, size, dpr=dpr)
+            logger.debug(f"占位图标预绘制完成: {len(self._images)} 个, "
+                         f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        except Exception as e:
+            logger.error(f"占位图标预绘制失败: {e}")
+
+    def render(self, kind: str, size: int, ext: str = '', dpr: float = 1.0) -> QImage:
+        """绘制占位图标（不经过缓存）"""
+        pixel_size = max(1, round(size * dpr))
+        try:
+            if kind == 'filetype':
+                image = self._render_filetype(ext, pixel_size)
+            elif kind == 'app':
+                image = self._render_app(pixel_size)
+            elif kind == 'loading':
+                image = self._render_loading(pixel_size)
+            elif kind == 'error':
+                image = self._render_error(pixel_size)
+            else:
+                image = self._render_default(pixel_size)
+        except Exception as e:
+            logger.error(f"绘制占位图标失败: {e}")
+            image = QImage(pixel_size, pixel_size, QImage.Format.Format_ARGB32_Premultiplied)
+            image.fill(QColor(66, 133, 244))
+        image.setDevicePixelRatio(dpr)
+        return image
+
+    @staticmethod
+    def _new_image(size: int) -> QImage:
+        image = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        return image
+
+    @staticmethod
+    def _draw_background(painter: QPainter, rect: QRect, size: int, gradient: QLinearGradient):
+        painter.setBrush(QBrush(gradient))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(rect, size // 8, size // 8)
+
+    def _render_filetype(self, ext: str, size: int) -> QImage:
+        """文件类型图标：按扩展名着色的圆角矩形和扩展名文字"""
+        color = FILETYPE_COLORS.get(ext, QColor(96, 125, 139))
+        image = self._new_image(size)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        margin = max(2, size // 16)
+        rect = image.rect().adjusted(margin, margin, -margin, -margin)
+
+        gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
+        gradient.setColorAt(0, color.lighter(120))
+        gradient.setColorAt(1, color.darker(120))
+        self._draw_background(painter, rect, size, gradient)
+
+        # 绘制扩展名
+        if ext and len(ext) > 1:
+            font = QFont()
+            font.setPixelSize(max(size // 3, 8))
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, ext[1:5].upper())
+
+        painter.end()
+        return image
+
+    def _render_default(self, size: int) -> QImage:
+        """默认图标：蓝色半透明圆角矩形"""
+        image = self._new_image(size)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        gradient = QLinearGradient(0, 0, size, size)
+        gradient.setColorAt(0, QColor(66, 133, 244, 180))
+        gradient.setColorAt(1, QColor(26, 115, 232, 180))
+
+        margin = max(2, size // 16)
+        rect = image.rect().adjusted(margin, margin, -margin, -margin)
+        self._draw_background(painter, rect, size, gradient)
+
+        painter.end()
+        return image
+
+    def _render_app(self, size: int) -> QImage:
+        """默认应用图标：默认图标上绘制一个窗口"""
+        image = self._render_default(size)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        margin = max(2, size // 16)
+        rect = image.rect().adjusted(margin, margin, -margin, -margin)
+
+        painter.setPen(QPen(QColor(255, 255, 255), max(1, size // 32)))
+        painter.setBrush(QColor(255, 255, 255, 100))
+        inner_margin = size // 6
+        inner_rect = rect.adjusted(inner_margin, inner_margin, -inner_margin, -inner_margin)
+        painter.drawRoundedRect(inner_rect, size // 16, size // 16)
+
+        painter.end()
+        return image
+
+    def _render_loading(self, size: int) -> QImage:
+        """加载中图标：灰色背景上的四个圆点"""
+        image = self._new_image(size)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        gradient = QLinearGradient(0, 0, size, size)
+        gradient.setColorAt(0, QColor(240, 240, 240, 200))
+        gradient.setColorAt(1, QColor(220, 220, 220, 200))
+
+        margin = max(2, size // 16)
+        rect = image.rect().adjusted(margin, margin, -margin, -margin)
+        self._draw_background(painter, rect, size, gradient)
+
+        dot_size = max(1, size // 8)
+        center = rect.center()
+        radius = rect.width() // 3
+        painter.setBrush(QColor(66, 133, 244, 200))
+        for i in range(4):
+            rad = math.radians(i * 90)
+            x = center.x() + radius * math.cos(rad)
+            y = center.y() + radius * math.sin(rad)
+            painter.drawEllipse(QRect(int(x - dot_size // 2), int(y - dot_size // 2), dot_size, dot_size))
+
+        # 绘制"加载中"文字
+        if size >= 32:
+            font = QFont()
+            font.setPixelSize(max(size // 6, 8))
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(QColor(100, 100, 100, 200))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "...")
+
+        painter.end()
+        return image
+
+    def _render_error(self, size: int) -> QImage:
+        """错误图标：红色背景上的感叹号"""
+        image = self._new_image(size)
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        gradient = QLinearGradient(0, 0, size, size)
+        gradient.setColorAt(0, QColor(244, 67, 54, 180))
+        gradient.setColorAt(1, QColor(211, 47, 47, 180))
+
+        margin = max(2, size // 16)
+        rect = image.rect().adjusted(margin, margin, -margin, -margin)
+        self._draw_background(painter, rect, size, gradient)
+
+        # 绘制感叹号
+        painter.setPen(QPen(QColor(255, 255, 255), max(2, size // 16)))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        line_x = rect.center().x()
+        line_top = rect.top() + rect.height() // 4
+        line_bottom = rect.bottom() - rect.height() // 4
+        painter.drawLine(line_x, line_top, line_x, line_bottom)
+
+        dot_radius = max(2, size // 32)
+        painter.setBrush(QColor(255, 255, 255))
+        painter.drawEllipse(line_x - dot_radius, line_bottom + dot_radius, dot_radius * 2, dot_radius * 2)
+
+        painter.end()
+        return image
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'cached': len(self._images)}
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._images.clear()
+
+    def shutdown(self):
+        """停止预绘制线程"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+# 全局共享的占位图标缓存
+_shared_placeholders: Optional[PlaceholderIcons] = None
+_shared_lock = threading.Lock()
+
+
+def get_placeholder_icons() -> PlaceholderIcons:
+    """获取全局共享的占位图标缓存"""
+    global _shared_placeholders
+    with _shared_lock:
+        if _shared_placeholders is None:
+            _shared_placeholders = PlaceholderIcons()
+        return _shared_placeholders
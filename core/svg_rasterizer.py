@@ -0,0 +1,207 @@
+"""
+SVG光栅化缓存
+每个SVG只解析一次，解析后的渲染器保存在有限大小的缓存中；
+按 (尺寸档位, 设备像素比档位) 在请求所在的工作线程中按需光栅化，结果按字节数限制缓存，
+悬停放大等相近尺寸共用同一档位的光栅图
+"""
+
+import os
+import math
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtCore import Qt, QRectF
+
+try:
+    from PySide6.QtSvg import QSvgRenderer
+    SVG_AVAILABLE = True
+except ImportError:
+    QSvgRenderer = None
+    SVG_AVAILABLE = False
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+SVG_EXTENSIONS = ('.svg', '.svgz')
+
+# 光栅化的像素尺寸档位，请求的像素尺寸向上取最近的档位后缩小
+PIXEL_BUCKETS = (16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512)
+
+# 设备像素比档位（常见的系统缩放比例），非标准比例向上取档位
+DPR_BUCKETS = (1.0, 1.25, 1.5, 2.0, 2.5, 3.0, 4.0)
+
+
+def is_svg(path: str) -> bool:
+    """是否为SVG文件"""
+    return path.lower().endswith(SVG_EXTENSIONS)
+
+
+def dpr_bucket(dpr: float) -> float:
+    """设备像素比所在的档位"""
+    index = bisect.bisect_left(DPR_BUCKETS, round(dpr, 2))
+    return DPR_BUCKETS[min(index, len(DPR_BUCKETS) - 1)]
+
+
+def pixel_bucket(pixels: int) -> int:
+    """像素尺寸所在的档位，超过最大档位时按实际尺寸"""
+    index = bisect.bisect_left(PIXEL_BUCKETS, pixels)
+    return PIXEL_BUCKETS[index] if index < len(PIXEL_BUCKETS) else pixels
+
+
+class SvgRasterizer:
+    """SVG解析与光栅化缓存（线程安全）"""
+
+    def __init__(self, max_renderers: int = 64, max_raster_mb: int = 32):
+        self.max_renderers = max_renderers
+        self.max_raster_bytes = max_raster_mb * 1024 * 1024
+
+        # (路径, 修改时间, 大小) -> (渲染器, 渲染锁)；QSvgRenderer不能被多个线程同时使用
+        self._renderers: 'OrderedDict[Tuple[str, int, int], Tuple[object, threading.Lock]]' = OrderedDict()
+        # (路径, 修改时间, 大小, 像素档位) -> 光栅图
+        self._rasters: 'OrderedDict[Tuple[str, int, int, int], QImage]' = OrderedDict()
+        self._raster_bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'requests': 0,
+            'raster_hits': 0,
+            'renderer_hits': 0,
+            'parses': 0,
+            'rasterizations': 0,
+            'errors': 0,
+            'evictions': 0
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _get_renderer(self, file_key: Tuple[str, int, int]) -> Optional[Tuple[object, threading.Lock]]:
+        """获取解析后的渲染器，未缓存时解析"""
+        with self._lock:
+            cached = self._renderers.get(file_key)
+            if cached is not None:
+                self._renderers.move_to_end(file_key)
+                self.stats['renderer_hits'] += 1
+                return cached
+
+        renderer = QSvgRenderer(file_key[0])
+        if not renderer.isValid():
+            return None
+        renderer.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
+
+        with self._lock:
+            self.stats['parses'] += 1
+            # 并发解析同一文件时保留先完成的一份
+            cached = self._renderers.setdefault(file_key, (renderer, threading.Lock()))
+            self._renderers.move_to_end(file_key)
+            while len(self._renderers) > self.max_renderers:
+                self._renderers.popitem(last=False)
+            return cached
+
+    def _rasterize(self, renderer, render_lock: threading.Lock, pixels: int) -> QImage:
+        """把SVG绘制到指定像素尺寸的透明图像上"""
+        image = QImage(pixels, pixels, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        with render_lock:
+            painter = QPainter(image)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            renderer.render(painter, QRectF(0, 0, pixels, pixels))
+            painter.end()
+        return image
+
+    def render(self, path: str, size: int, dpr: float = 1.0) -> Optional[QImage]:
+        """获取SVG在逻辑尺寸size、设备像素比dpr下的图像，无法解析时返回None"""
+        if not SVG_AVAILABLE:
+            return None
+        self._count('requests')
+
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            self._count('errors')
+            return None
+
+        dpr = dpr_bucket(dpr)
+        pixels = max(1, math.ceil(size * dpr))
+        bucket = pixel_bucket(pixels)
+        file_key = (path, stat.st_mtime_ns, stat.st_size)
+        raster_key = file_key + (bucket,)
+
+        with self._lock:
+            image = self._rasters.get(raster_key)
+            if image is not None:
+                self._rasters.move_to_end(raster_key)
+                self.stats['raster_hits'] += 1
+
+        if image is None:
+            try:
+                entry = self._get_renderer(file_key)
+                if entry is None:
+                    self._count('errors')
+                    return None
+                image = self._rasterize(entry[0], entry[1], bucket)
+            except Exception as e:
+                logger.debug(f"SVG光栅化失败: {path}, {e}")
+                self._count('errors')
+                return None
+            self._store_raster(raster_key, image)
+
+        # 档位大于请求尺寸时平滑缩小（缩小的质量与直接绘制接近）
+        if bucket != pixels:
+            image = image.scaled(pixels, pixels, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+        else:
+            # 浅拷贝（隐式共享），不修改缓存中图像的设备像素比
+            image = QImage(image)
+        image.setDevicePixelRatio(dpr)
+        return image
+
+    def _store_raster(self, key: Tuple[str, int, int, int], image: QImage):
+        """缓存光栅图，超过字节上限时淘汰最久未使用的"""
+        nbytes = image.sizeInBytes()
+        if nbytes > self.max_raster_bytes:
+            return
+        with self._lock:
+            self.stats['rasterizations'] += 1
+            old = self._rasters.pop(key, None)
+            if old is not None:
+                self._raster_bytes -= old.sizeInBytes()
+            self._rasters[key] = image
+            self._raster_bytes += nbytes
+            while self._raster_bytes > self.max_raster_bytes and self._rasters:
+                _, evicted = self._rasters.popitem(last=False)
+                self._raster_bytes -= evicted.sizeInBytes()
+                self.stats['evictions'] += 1
+
+    def get_stats(self) -> Dict[str, object]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'renderers': len(self._renderers), 'rasters': len(self._rasters),
+                    'raster_mb': round(self._raster_bytes / 1024 / 1024, 2)}
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._renderers.clear()
+            self._rasters.clear()
+            self._raster_bytes = 0
+
+
+# 全局共享的SVG光栅化缓存
+_shared_rasterizer: Optional[SvgRasterizer] = None
+_shared_lock = threading.Lock()
+
+
+def get_svg_rasterizer() -> SvgRasterizer:
+    """获取全局共享的SVG光栅化缓存"""
+    global _shared_rasterizer
+    with _shared_lock:
+        if _shared_rasterizer is None:
+            _shared_rasterizer = SvgRasterizer()
+        return _shared_rasterizer
@@ -0,0 +1,293 @@
+"""
+应用标签倒排索引
+每个应用占一个位，标签、收藏和最近使用各对应一个位图（Python整数），
+标签/收藏/最近使用的与、或、非组合只需几次整数位运算，分面计数用位计数
+"""
+
+import time
+import bisect
+import logging
+import threading
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 86400
+
+# bin() 的 '0'/'1' 转为 0/1 字节，用于 itertools.compress
+_BIT_FLAGS = str.maketrans('01', '\0\1')
+
+
+def mask_from_slots(slots: Iterable[int], size: int) -> int:
+    """由位号列表生成位图（一次生成，避免逐位修改大整数）"""
+    bits = bytearray((size + 7) >> 3)
+    for slot in slots:
+        bits[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(bits, 'little')
+
+
+class TagIndex:
+    """标签、收藏和最近使用的位图索引（线程安全）
+
+    位号按应用加入索引的顺序分配，结果保持与应用列表相同的顺序；
+    删除的应用留下空位，空位过多时整理。
+    """
+
+    def __init__(self, recent_days: float = 7.0):
+        self.recent_days = recent_days
+
+        # 位号 -> 应用ID（空位为None）
+        self._slot_ids: List[Optional[str]] = []
+        # 应用ID -> (位号, 标签, 是否收藏, 最后使用时间)
+        self._entries: Dict[str, Tuple[int, Tuple[str, ...], bool, float]] = {}
+        self._all = 0
+        self._favorites = 0
+        self._tags: Dict[str, int] = {}
+        # 最后使用日期（距纪元的天数）-> 位图
+        self._days: Dict[int, int] = {}
+        # 最近使用位图的缓存 (日期位图版本, 截止日期, 截止日期之后的位图, 截止日期当天的最后使用时间, 位号)
+        self._days_version = 0
+        self._recent_cache: Optional[Tuple[int, int, int, List[float], List[int]]] = None
+        self._lock = threading.RLock()
+
+        self.stats = {
+            'rebuilds': 0,
+            'updates': 0,
+            'queries': 0,
+            'compactions': 0
+        }
+
+    @staticmethod
+    def _fields(app: Any) -> Tuple[Tuple[str, ...], bool, float]:
+        tags = tuple(dict.fromkeys(tag for tag in (app.tags or []) if tag))
+        return tags, bool(app.favorite), float(app.last_used or 0.0)
+
+    @staticmethod
+    def _day(last_used: float) -> Optional[int]:
+        return int(last_used // DAY_SECONDS) if last_used > 0 else None
+
+    def rebuild(self, apps: Dict[str, Any]):
+        """按应用列表重建索引"""
+        with self._lock:
+            self._build([(app_id, *self._fields(app)) for app_id, app in apps.items()])
+            self.stats['rebuilds'] += 1
+
+    def _build(self, rows: List[Tuple[str, Tuple[str, ...], bool, float]]):
+        """由 (应用ID, 标签, 是否收藏, 最后使用时间) 列表生成全部位图"""
+        size = len(rows)
+        tag_slots: Dict[str, List[int]] = {}
+        day_slots: Dict[int, List[int]] = {}
+        favorite_slots = []
+
+        self._slot_ids = []
+        self._entries = {}
+        for slot, (app_id, tags, favorite, last_used) in enumerate(rows):
+            self._slot_ids.append(app_id)
+            self._entries[app_id] = (slot, tags, favorite, last_used)
+            for tag in tags:
+                tag_slots.setdefault(tag, []).append(slot)
+            if favorite:
+                favorite_slots.append(slot)
+            day = self._day(last_used)
+            if day is not None:
+                day_slots.setdefault(day, []).append(slot)
+
+        self._all = (1 << size) - 1
+        self._favorites = mask_from_slots(favorite_slots, size)
+        self._tags = {tag: mask_from_slots(slots, size) for tag, slots in tag_slots.items()}
+        self._days = {day: mask_from_slots(slots, size) for day, slots in day_slots.items()}
+        self._days_version += 1
+
+    def update(self, app_id: str, app: Any):
+        """添加应用或更新应用的标签、收藏和最后使用时间"""
+        tags, favorite, last_used = self._fields(app)
+        with self._lock:
+            self.stats['updates'] += 1
+            entry = self._entries.get(app_id)
+            if entry is None:
+                slot = len(self._slot_ids)
+                self._slot_ids.append(app_id)
+                bit = 1 << slot
+                self._all |= bit
+                old_tags, old_favorite, old_day = (), False, None
+            else:
+                slot, old_tags, old_favorite, old_last_used = entry
+                bit = 1 << slot
+                old_day = self._day(old_last_used)
+            self._entries[app_id] = (slot, tags, favorite, last_used)
+
+            for tag in set(old_tags).difference(tags):
+                self._clear_bit(self._tags, tag, bit)
+            for tag in set(tags).difference(old_tags):
+                self._tags[tag] = self._tags.get(tag, 0) | bit
+
+            if favorite != old_favorite:
+                self._favorites ^= bit
+
+            day = self._day(last_used)
+            if day != old_day:
+                if old_day is not None:
+                    self._clear_bit(self._days, old_day, bit)
+                if day is not None:
+                    self._days[day] = self._days.get(day, 0) | bit
+            if last_used != (entry[3] if entry is not None else 0.0):
+                self._days_version += 1
+
+    def remove(self, app_id: str):
+        """从索引中移除应用"""
+        with self._lock:
+            entry = self._entries.pop(app_id, None)
+            if entry is None:
+                return
+            slot, tags, favorite, last_used = entry
+            bit = 1 << slot
+            self._slot_ids[slot] = None
+            self._all &= ~bit
+            self._favorites &= ~bit
+            for tag in tags:
+                self._clear_bit(self._tags, tag, bit)
+            day = self._day(last_used)
+            if day is not None:
+                self._clear_bit(self._days, day, bit)
+                self._days_version += 1
+
+            # 空位超过一半时整理，位图长度与应用数量保持同一量级
+            empty = len(self._slot_ids) - len(self._entries)
+            if empty > 1024 and empty > len(self._entries):
+                rows = [(slot_id, *self._entries[slot_id][1:]) for slot_id in self._slot_ids
+                        if slot_id is not None]
+                self._build(rows)
+                self.stats['compactions'] += 1
+
+    @staticmethod
+    def _clear_bit(masks: Dict[Any, int], key: Any, bit: int):
+        mask = masks.get(key, 0) & ~bit
+        if mask:
+            masks[key] = mask
+        else:
+            masks.pop(key, None)
+
+    def tag_mask(self, tag: str) -> int:
+        """带有标签的应用"""
+        with self._lock:
+            return self._tags.get(tag, 0)
+
+    def favorite_mask(self) -> int:
+        """收藏的应用"""
+        with self._lock:
+            return self._favorites
+
+    def recent_mask(self, now: Optional[float] = None) -> int:
+        """最近recent_days天内使用过的应用"""
+        if now is None:
+            now = time.time()
+        cutoff = now - self.recent_days * DAY_SECONDS
+        cutoff_day = int(cutoff // DAY_SECONDS)
+        with self._lock:
+            cache = self._recent_cache
+            if cache is None or cache[0] != self._days_version or cache[1] != cutoff_day:
+                mask = 0
+                for day, day_mask in self._days.items():
+                    if day > cutoff_day:
+                        mask |= day_mask
+                # 截止时间所在的那一天按最后使用时间排序，查询时二分查找
+                boundary = sorted((self._entries[self._slot_ids[slot]][3], slot)
+                                  for slot in self._slots(self._days.get(cutoff_day, 0)))
+                cache = (self._days_version, cutoff_day, mask,
+                         [item[0] for item in boundary], [item[1] for item in boundary])
+                self._recent_cache = cache
+
+            _, _, mask, times, slots = cache
+            start = bisect.bisect_right(times, cutoff)
+            if start < len(slots):
+                mask |= mask_from_slots(slots[start:], len(self._slot_ids))
+            return mask
+
+    def filter_mask(self, filters: Optional[Dict[str, Any]] = None, now: Optional[float] = None) -> int:
+        """按条件组合筛选，返回位图
+
+        filters:
+            tags_all: 同时带有这些标签（与）
+            tags_any: 带有其中任一标签（或）
+            tags_none: 不带有这些标签（非）
+            favorite: True只要收藏的，False只要未收藏的，None不限
+            recent: True只要最近使用的，False只要最近未使用的，None不限
+        """
+        filters = filters or {}
+        with self._lock:
+            self.stats['queries'] += 1
+            mask = self._all
+            for tag in filters.get('tags_all') or ():
+                mask &= self._tags.get(tag, 0)
+            tags_any = filters.get('tags_any') or ()
+            if tags_any:
+                any_mask = 0
+                for tag in tags_any:
+                    any_mask |= self._tags.get(tag, 0)
+                mask &= any_mask
+            for tag in filters.get('tags_none') or ():
+                mask &= ~self._tags.get(tag, 0)
+
+            favorite = filters.get('favorite')
+            if favorite is not None:
+                mask &= self._favorites if favorite else ~self._favorites
+            recent = filters.get('recent')
+            if recent is not None:
+                recent_mask = self.recent_mask(now)
+                mask &= recent_mask if recent else ~recent_mask
+            return mask
+
+    @staticmethod
+    def _slots(mask: int) -> List[int]:
+        if mask <= 0:
+            return []
+        flags = bin(mask)[:1:-1].translate(_BIT_FLAGS).encode()
+        return list(compress(range(len(flags)), flags))
+
+    def ids(self, mask: int) -> List[str]:
+        """位图中的应用ID（按加入索引的顺序）"""
+        if mask <= 0:
+            return []
+        flags = bin(mask)[:1:-1].translate(_BIT_FLAGS).encode()
+        with self._lock:
+            return list(compress(self._slot_ids, flags))
+
+    def facets(self, mask: Optional[int] = None, limit: Optional[int] = None,
+               now: Optional[float] = None) -> Dict[str, Any]:
+        """结果中各标签、收藏和最近使用的应用数量（即再加上该条件后的结果数）"""
+        with self._lock:
+            if mask is None:
+                mask = self._all
+            total = mask.bit_count()
+            if total <= len(self._tags) * 16:
+                # 结果较少时逐个累加结果中应用的标签，比逐个标签做位运算更快
+                counts: Dict[str, int] = {}
+                entries = self._entries
+                for app_id in self.ids(mask):
+                    for tag in entries[app_id][1]:
+                        counts[tag] = counts.get(tag, 0) + 1
+                tags = list(counts.items())
+            else:
+                tags = [(tag, (tag_mask & mask).bit_count()) for tag, tag_mask in self._tags.items()]
+            tags = sorted((item for item in tags if item[1] > 0), key=lambda item: (-item[1], item[0]))
+            if limit is not None:
+                tags = tags[:limit]
+            return {
+                'total': total,
+                'favorite': (self._favorites & mask).bit_count(),
+                'recent': (self.recent_mask(now) & mask).bit_count(),
+                'tags': [{'tag': tag, 'count': count} for tag, count in tags]
+            }
+
+    def tags(self) -> List[str]:
+        """全部标签"""
+        with self._lock:
+            return sorted(self._tags)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'apps': len(self._entries), 'slots': len(self._slot_ids),
+                    'tags': len(self._tags), 'days': len(self._days)}
@@ -5,8 +5,17 @@
 
 from typing import List, Tuple, Dict, Any
 from dataclasses import dataclass
+from collections import OrderedDict
+from array import array
 from PySide6.QtCore import QObject, Signal, Slot
 
+# 尝试导入NumPy用于向量化计算位置表
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 
 @dataclass
 class WindowLayoutInfo:
@@ -18,11 +27,189 @@ class WindowLayoutInfo:
     total_apps: int  # 实际应用数量
 
 
+class PositionTable:
+    """紧凑的应用位置表，按应用索引存储行、列和像素偏移"""
+
+    __slots__ = ('rows', 'cols', 'xs', 'ys')
+
+    def __init__(self, rows=None, cols=None, xs=None, ys=None):
+        self.rows = rows if rows is not None else array('i')
+        self.cols = cols if cols is not None else array('i')
+        self.xs = xs if xs is not None else array('i')
+        self.ys = ys if ys is not None else array('i')
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def position(self, index: int) -> Tuple[int, int, int, int]:
+        """获取 (row, col, x, y)"""
+        return int(self.rows[index]), int(self.cols[index]), int(self.xs[index]), int(self.ys[index])
+
+
 class WindowAlgorithm(QObject):
     """窗口算法处理器"""
 
+    # 组合布局结果缓存的最大条目数
+    MAX_LAYOUT_CACHE = 64
+
     def __init__(self):
         super().__init__()
+        # 组合布局结果缓存，布局计算是纯函数，结果只取决于输入参数
+        self._layout_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._table_cache: "OrderedDict[tuple, PositionTable]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def compute_grid_layout(self, app_count: int, rows: int, cols: int, position: str = "bottom_center",
+                            icon_size: int = 48, icon_spacing: int = 10, show_labels: bool = False) -> Dict[str, Any]:
+        """
+        一次性计算完整的网格布局信息（带缓存）
+
+        Args:
+            app_count: 应用总数
+            rows: 配置行数
+            cols: 配置列数
+            position: 窗口位置
+            icon_size: 图标大小
+            icon_spacing: 图标间距
+            show_labels: 是否显示标签
+
+        Returns:
+            Dict: 布局、特殊行、应用分布和窗口尺寸的组合结果，调用方不应修改
+        """
+        key = (app_count, rows, cols, position, icon_size, icon_spacing, bool(show_labels))
+        cached = self._layout_cache.get(key)
+        if cached is not None:
+            self._layout_cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        layout_info = self.calculate_layout(app_count, rows, cols, position)
+        window_width, window_height = self.calculate_window_size(
+            layout_info, icon_size, icon_spacing, show_labels
+        )
+
+        # 确保窗口尺寸基于实际应用数量，而不是配置的最大网格
+        actual_cols = max((pos[1] for pos in layout_info.app_positions), default=-1) + 1
+        actual_cols = min(cols, actual_cols)
+
+        result = {
+            'rows': layout_info.rows,
+            'cols': actual_cols if actual_cols > 0 else layout_info.cols,
+            'max_apps': layout_info.max_apps,
+            'total_apps': layout_info.total_apps,
+            'special_row_info': self.get_special_row_info(layout_info, position),
+            'app_distribution': self.calculate_app_distribution(app_count, rows, cols, position),
+            'can_add_row': self.can_add_row(app_count, rows, cols, position),
+            'width': window_width,
+            'height': window_height,
+            'configured_rows': rows,
+            'configured_cols': cols
+        }
+
+        self._layout_cache[key] = result
+        if len(self._layout_cache) > self.MAX_LAYOUT_CACHE:
+            self._layout_cache.popitem(last=False)
+        return result
+
+    def clear_cache(self):
+        """清空布局缓存"""
+        self._layout_cache.clear()
+        self._table_cache.clear()
+
+    @staticmethod
+    def row_counts(app_count: int, rows: int, cols: int, position: str = "bottom_center") -> List[int]:
+        """
+        计算每行显示的应用数量，与calculate_layout的填充规则一致
+
+        Args:
+            app_count: 应用总数
+            rows: 配置行数
+            cols: 配置列数
+            position: 窗口位置
+
+        Returns:
+            List[int]: 从上到下每行的应用数量
+        """
+        if cols <= 0 or rows <= 0:
+            return []
+        actual_app_count = min(app_count, rows * cols)
+        if actual_app_count <= 0:
+            return []
+        if actual_app_count <= cols:
+            return [actual_app_count]
+
+        k = actual_app_count // cols
+        r = actual_app_count % cols
+        if r == 0:
+            return [cols] * k
+        if position == "top_center":
+            # 顶部居中：前k行满列，最后一行r个
+            return [cols] * k + [r]
+        # 底部居中：第一行r个，后k行满列
+        return [r] + [cols] * k
+
+    def build_position_table(self, app_count: int, rows: int, cols: int, position: str = "bottom_center",
+                             icon_size: int = 48, icon_spacing: int = 10, show_labels: bool = False) -> PositionTable:
+        """
+        生成预先计算好像素偏移的位置表（带缓存）
+
+        特殊行（顶部位置的最后一行、底部位置的第一行）的居中偏移已计入x坐标。
+
+        Args:
+            app_count: 应用总数
+            rows: 配置行数
+            cols: 配置列数
+            position: 窗口位置
+            icon_size: 图标大小
+            icon_spacing: 图标间距（边距）
+            show_labels: 是否显示标签
+
+        Returns:
+            PositionTable: 位置表，调用方不应修改
+        """
+        key = (app_count, rows, cols, position, icon_size, icon_spacing, bool(show_labels))
+        cached = self._table_cache.get(key)
+        if cached is not None:
+            self._table_cache.move_to_end(key)
+            return cached
+
+        counts = self.row_counts(app_count, rows, cols, position)
+        margin = icon_spacing
+        gap = 5
+        cell_width = icon_size + gap
+        cell_height = icon_size + (20 if show_labels else 0) + gap
+
+        # 特殊行索引，与get_special_row_info一致
+        special_row = (len(counts) - 1) if position == "top_center" else 0
+        offsets = [0] * len(counts)
+        if counts:
+            offsets[special_row] = (cols - counts[special_row]) * cell_width // 2
+
+        if NUMPY_AVAILABLE and counts:
+            count_arr = np.asarray(counts, dtype=np.int32)
+            total = int(count_arr.sum())
+            row_arr = np.repeat(np.arange(len(counts), dtype=np.int32), count_arr)
+            starts = np.repeat(np.cumsum(count_arr) - count_arr, count_arr)
+            col_arr = (np.arange(total, dtype=np.int32) - starts).astype(np.int32)
+            x_arr = (margin + col_arr * cell_width + np.asarray(offsets, dtype=np.int32)[row_arr]).astype(np.int32)
+            y_arr = (margin + row_arr * cell_height).astype(np.int32)
+            table = PositionTable(row_arr, col_arr, x_arr, y_arr)
+        else:
+            table = PositionTable()
+            for row_idx, count in enumerate(counts):
+                base_x = margin + offsets[row_idx]
+                y = margin + row_idx * cell_height
+                table.rows.extend([row_idx] * count)
+                table.cols.extend(range(count))
+                table.xs.extend(range(base_x, base_x + count * cell_width, cell_width))
+                table.ys.extend([y] * count)
+
+        self._table_cache[key] = table
+        if len(self._table_cache) > self.MAX_LAYOUT_CACHE:
+            self._table_cache.popitem(last=False)
+        return table
 
     def calculate_layout(self, app_count: int, rows: int, cols: int, position: str = "bottom_center") -> WindowLayoutInfo:
         """
@@ -346,4 +533,4 @@ class WindowAlgorithm(QObject):
                 'is_first_row': True
             }
         
-        return special_row_info
\ No newline at end of file
+        return special_row_info
@@ -0,0 +1,302 @@
+"""
+XDG应用目录索引
+扫描 $XDG_DATA_HOME/applications 和 $XDG_DATA_DIRS/applications 下的.desktop文件，
+并行解析，解析结果按 (路径, 修改时间, 大小) 缓存到磁盘索引，重新扫描时只处理发生变化的目录，
+为搜索提供"可发现的应用"
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from stat import S_ISDIR
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+
+from .desktop_entry import DesktopEntry, locale_names
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+
+def application_dirs() -> List[str]:
+    """XDG应用目录，按优先级排列（用户目录优先）"""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+
+    dirs = []
+    for base in [data_home] + data_dirs.split(os.pathsep):
+        if base:
+            directory = os.path.join(base, "applications")
+            if directory not in dirs:
+                dirs.append(directory)
+    return dirs
+
+
+def parse_desktop_file(path: str, locales: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+    """解析.desktop文件的[Desktop Entry]部分，非应用类型或无法解析时返回None"""
+    if locales is None:
+        locales = locale_names()
+
+    try:
+        entry = DesktopEntry.parse(path)
+    except OSError as e:
+        logger.debug(f"读取.desktop文件失败: {path}, {e}")
+        return None
+
+    if not entry.is_application():
+        return None
+
+    return {
+        'name': entry.localized('Name', locales=locales),
+        'generic_name': entry.localized('GenericName', locales=locales),
+        'comment': entry.localized('Comment', locales=locales),
+        'exec': entry.exec,
+        'command': entry.command(),
+        'icon': entry.icon,
+        'categories': entry.get_list('Categories'),
+        'keywords': entry.get_list('Keywords', localized=True, locales=locales),
+        'terminal': entry.terminal,
+        'no_display': entry.get_bool('NoDisplay'),
+        'hidden': entry.get_bool('Hidden'),
+    }
+
+
+class XdgAppIndexer:
+    """XDG应用目录索引"""
+
+    INDEX_VERSION = 2
+    index_file0 = Path(__file__).parent.parent / "cache" / "xdg_index.json"
+
+    def __init__(self, index_file: str = index_file0, dirs: Optional[List[str]] = None,
+                 max_workers: Optional[int] = None):
+        self.index_file = Path(index_file)
+        self.dirs = dirs if dirs is not None else application_dirs()
+        self.max_workers = max_workers or os.cpu_count() or 4
+        self._locales = locale_names()
+
+        # 目录 -> {"mtime": 目录修改时间, "files": {文件名: [修改时间, 大小, 解析结果]}}
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # desktop id -> 应用条目（同一id以优先级高的目录为准）
+        self._apps: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+        self.stats = {
+            'scans': 0,
+            'dirs_scanned': 0,
+            'dirs_reused': 0,
+            'files_parsed': 0,
+            'files_reused': 0,
+            'last_scan_ms': 0.0
+        }
+
+    def _load_index(self):
+        """读取磁盘索引（区域设置变化时作废）"""
+        self._loaded = True
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.INDEX_VERSION and data.get('locales') == self._locales:
+                self._index = data.get('dirs', {})
+        except (OSError, ValueError):
+            self._index = {}
+
+    def _save_index(self):
+        """写入磁盘索引"""
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_file.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.INDEX_VERSION, 'locales': self._locales, 'dirs': self._index},
+                          f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, self.index_file)
+        except OSError as e:
+            logger.warning(f"保存应用索引失败: {e}")
+
+    def _walk_dirs(self) -> List[Tuple[str, str, str]]:
+        """列出所有应用目录及其子目录，返回 (根目录, 目录, desktop id前缀)
+
+        跟随指向目录的符号链接，同一根目录下已访问过的目录（按设备号和inode）不再重复进入，避免符号链接循环
+        """
+        result = []
+        for root in self.dirs:
+            stack = [(root, '')]
+            visited = set()
+            while stack:
+                directory, prefix = stack.pop()
+                try:
+                    dir_stat = os.stat(directory)
+                except OSError:
+                    continue
+                if not S_ISDIR(dir_stat.st_mode):
+                    continue
+                dir_key = (dir_stat.st_dev, dir_stat.st_ino)
+                if dir_key in visited:
+                    continue
+                visited.add(dir_key)
+                result.append((root, directory, prefix))
+                try:
+                    with os.scandir(directory) as it:
+                        subdirs = [entry for entry in it if entry.is_dir(follow_symlinks=True)]
+                except OSError:
+                    continue
+                # 真实目录先于指向它的符号链接访问，desktop id使用真实路径的前缀
+                subdirs.sort(key=lambda entry: (entry.is_symlink(), entry.name), reverse=True)
+                stack.extend((entry.path, f"{prefix}{entry.name}-") for entry in subdirs)
+        return result
+
+    def _scan_dir(self, directory: str, cached: Optional[Dict[str, Any]],
+                  verify_files: bool) -> Tuple[Dict[str, Any], List[str]]:
+        """扫描一个目录，返回新的目录索引和需要重新解析的文件"""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return {'mtime': 0, 'files': {}}, []
+
+        if cached is not None and cached.get('mtime') == mtime:
+            files = cached['files']
+            if not verify_files:
+                return {'mtime': mtime, 'files': dict(files)}, []
+
+            # 目录未变化，但文件可能被原地修改，只比较已知文件的状态
+            to_parse = []
+            for name, (file_mtime, size, _) in files.items():
+                try:
+                    stat = os.stat(os.path.join(directory, name))
+                    if stat.st_mtime_ns != file_mtime or stat.st_size != size:
+                        to_parse.append(name)
+                except OSError:
+                    to_parse.append(name)
+            return {'mtime': mtime, 'files': dict(files)}, to_parse
+
+        old_files = cached['files'] if cached else {}
+        files = {}
+        to_parse = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if not entry.name.endswith('.desktop') or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    old = old_files.get(entry.name)
+                    if old and old[0] == stat.st_mtime_ns and old[1] == stat.st_size:
+                        files[entry.name] = old
+                    else:
+                        files[entry.name] = [stat.st_mtime_ns, stat.st_size, None]
+                        to_parse.append(entry.name)
+        except OSError as e:
+            logger.debug(f"扫描应用目录失败: {directory}, {e}")
+        return {'mtime': mtime, 'files': files}, to_parse
+
+    def rescan(self, verify_files: bool = True) -> Dict[str, Any]:
+        """扫描应用目录，只重新解析新增或变化的文件，返回统计
+
+        verify_files为False时完全跳过修改时间未变的目录（不检查其中被原地修改的文件）
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+            old_index = self._index
+
+        new_index: Dict[str, Dict[str, Any]] = {}
+        jobs: List[Tuple[str, str]] = []
+        dirs_reused = 0
+        walked = self._walk_dirs()
+        for _, directory, _ in walked:
+            cached = old_index.get(directory)
+            entry, to_parse = self._scan_dir(directory, cached, verify_files)
+            if cached is not None and cached.get('mtime') == entry['mtime']:
+                dirs_reused += 1
+            new_index[directory] = entry
+            jobs.extend((directory, name) for name in to_parse)
+
+        # 并行解析变化的文件
+        if jobs:
+            locales = self._locales
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                parsed = list(executor.map(
+                    lambda job: parse_desktop_file(os.path.join(job[0], job[1]), locales), jobs
+                ))
+            for (directory, name), result in zip(jobs, parsed):
+                files = new_index[directory]['files']
+                try:
+                    stat = os.stat(os.path.join(directory, name))
+                    files[name] = [stat.st_mtime_ns, stat.st_size, result]
+                except OSError:
+                    files.pop(name, None)
+
+        # 同一desktop id以先出现（优先级高）的目录为准
+        apps: Dict[str, Dict[str, Any]] = {}
+        for root, directory, prefix in walked:
+            for name, (_, _, result) in new_index[directory]['files'].items():
+                desktop_id = prefix + name
+                if desktop_id in apps:
+                    continue
+                apps[desktop_id] = dict(result, id=desktop_id, path=os.path.join(directory, name)) if result else None
+
+        changed = bool(jobs) or set(new_index) != set(old_index)
+        with self._lock:
+            self._index = new_index
+            self._apps = {desktop_id: app for desktop_id, app in apps.items()
+                          if app and not app['hidden']}
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stats['scans'] += 1
+            self.stats['dirs_scanned'] += len(walked) - dirs_reused
+            self.stats['dirs_reused'] += dirs_reused
+            self.stats['files_parsed'] += len(jobs)
+            self.stats['files_reused'] += sum(len(d['files']) for d in new_index.values()) - len(jobs)
+            self.stats['last_scan_ms'] = round(elapsed, 2)
+
+        if changed:
+            self._save_index()
+
+        return {
+            'dirs': len(walked),
+            'dirs_reused': dirs_reused,
+            'parsed': len(jobs),
+            'apps': len(self._apps),
+            'elapsed_ms': round(elapsed, 2)
+        }
+
+    def get_apps(self, include_no_display: bool = False) -> List[Dict[str, Any]]:
+        """获取索引中的应用"""
+        with self._lock:
+            apps = list(self._apps.values())
+        if not include_no_display:
+            apps = [app for app in apps if not app['no_display']]
+        return apps
+
+    def search(self, query: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """按名称、通用名称、关键字和命令搜索应用"""
+        query = query.lower().strip()
+        if not query:
+            return self.get_apps()[:limit]
+
+        results = []
+        for app in self.get_apps():
+            name = app['name'].lower()
+            if name.startswith(query):
+                rank = 0
+            elif query in name:
+                rank = 1
+            elif (query in app['generic_name'].lower()
+                  or any(query in keyword.lower() for keyword in app['keywords'])):
+                rank = 2
+            elif query in app['command'].lower() or query in app['comment'].lower():
+                rank = 3
+            else:
+                continue
+            results.append((rank, name, app))
+
+        results.sort(key=lambda item: (item[0], item[1]))
+        return [app for _, _, app in results[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取统计信息"""
+        with self._lock:
+            return {**self.stats, 'apps': len(self._apps), 'dirs': len(self._index),
+                    'index_file': str(self.index_file)}
@@ -9,6 +9,7 @@ QuickLauncher 主程序入口
 import sys
 import os
 import traceback
+import multiprocessing
 from pathlib import Path
 from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QMessageBox
 from PySide6.QtGui import QIcon, QAction, QTextOption, QPalette, QColor, QPixmap, QPainter
@@ -42,8 +43,9 @@ class QuickWindowManager:
         self.engine.rootContext().setContextProperty("quickWindowBackend", self.quick_backend)
         self.engine.rootContext().setContextProperty("mainWindowBackend", self.main_backend)
 
-        # 添加图标提供者
+        # 添加图标提供者，快捷窗口可见图标由后端预取悬停尺寸
         self.engine.addImageProvider("icon", icon_provider)
+        self.quick_backend.set_icon_provider(icon_provider)
 
         # 加载快捷窗口 QML
         qml_path_str = get_qml_path("QuickWindow.qml")
@@ -626,11 +628,16 @@ def main():
             tray_manager.show_message("刷新", "应用列表已刷新", QSystemTrayIcon.Information, 1000)
 
         def cleanup_missing_apps():
-            result = main_window_backend.cleanup_missing_apps()
+            # 后台并发检查，完成后在cleanup_finished中提示
+            main_window_backend.cleanup_missing_apps_async()
+
+        def on_cleanup_finished(result):
             if result["success"]:
                 tray_manager.show_message("清理完成", result.get("message", "清理完成"),
                                         QSystemTrayIcon.Information, 2000)
 
+        main_window_backend.cleanup_finished.connect(on_cleanup_finished)
+
         # 获取托盘菜单并连接信号
         if tray_manager.menu:
             actions = tray_manager.menu.actions()
@@ -692,6 +699,9 @@ def main():
         def on_application_about_to_quit():
             print("应用程序即将退出，保存配置...")
             config_manager.save()
+            main_window_backend.background_cache.shutdown()
+            main_window_backend.image_variants.shutdown()
+            main_window_backend.app_manager.path_status.shutdown()
 
         app.aboutToQuit.connect(on_application_about_to_quit)
 
@@ -708,4 +718,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包后图标提取进程池的子进程需要
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
@@ -6,9 +6,11 @@ QuickLauncher 用户界面模块
 from .main_window import MainWindowBackend
 from .quick_window import QuickWindowBackend
 from .icon_provider_safe import SafeIconProvider
+from .quick_app_model import QuickAppListModel
 
 __all__ = [
     'MainWindowBackend',
     'QuickWindowBackend',
-    'SafeIconProvider'
+    'SafeIconProvider',
+    'QuickAppListModel'
 ]
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+应用管理列表模型
+搜索结果分块到达：第一块替换旧结果，之后的块追加到末尾
+"""
+
+from typing import List, Dict, Any
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Slot, Property, QByteArray
+
+
+class AppListModel(QAbstractListModel):
+    """应用管理列表（搜索结果）模型，角色名与应用字典的字段相同"""
+
+    FIELDS = (
+        'id', 'name', 'path', 'icon_path', 'arguments', 'working_dir', 'description', 'tags',
+        'added_time', 'last_used', 'usage_count', 'favorite', 'exists'
+    )
+
+    # 角色 -> 应用字典中的字段
+    _ROLE_FIELDS = {Qt.UserRole + 1 + i: field for i, field in enumerate(FIELDS)}
+
+    count_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._apps: List[Dict[str, Any]] = []
+        # 应用ID -> 行号
+        self._rows: Dict[str, int] = {}
+
+    def roleNames(self):
+        return {role: QByteArray(field.encode()) for role, field in self._ROLE_FIELDS.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._apps)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._apps):
+            return None
+
+        app = self._apps[index.row()]
+        if role == Qt.DisplayRole:
+            return app.get('name', '')
+        field = self._ROLE_FIELDS.get(role)
+        if field is not None:
+            return app.get(field)
+        return None
+
+    def set_apps(self, apps: List[Dict[str, Any]]):
+        """替换全部应用"""
+        old_count = len(self._apps)
+        self.beginResetModel()
+        self._apps = list(apps)
+        self._rows = {app.get('id'): row for row, app in enumerate(self._apps)}
+        self.endResetModel()
+        if old_count != len(self._apps):
+            self.count_changed.emit()
+
+    def append_apps(self, apps: List[Dict[str, Any]]):
+        """在末尾追加一块应用"""
+        if not apps:
+            return
+        first = len(self._apps)
+        self.beginInsertRows(QModelIndex(), first, first + len(apps) - 1)
+        self._apps.extend(apps)
+        for row, app in enumerate(apps, first):
+            self._rows[app.get('id')] = row
+        self.endInsertRows()
+        self.count_changed.emit()
+
+    def _get_count(self) -> int:
+        return len(self._apps)
+
+    count = Property(int, _get_count, notify=count_changed)
+
+    @Slot(int, result='QVariantMap')
+    def get(self, row: int) -> Dict[str, Any]:
+        """获取指定行的应用字典（与ListModel.get用法相同）"""
+        if 0 <= row < len(self._apps):
+            return dict(self._apps[row])
+        return {}
+
+    @Slot(str, result=int)
+    def index_of(self, app_id: str) -> int:
+        """获取应用所在的行，不在列表中时返回-1"""
+        return self._rows.get(app_id, -1)
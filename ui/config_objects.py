@@ -0,0 +1,96 @@
+"""
+类型化配置对象
+将配置数据类以QObject的形式提供给QML，每个字段是带独立通知信号的属性，
+修改某个字段只会让依赖该字段的绑定重新求值
+"""
+
+import typing
+from dataclasses import fields
+from typing import Dict, List, Any, Callable, Optional
+from PySide6.QtCore import QObject, Signal, Property
+
+from core.config_manager import QuickWindowConfig, MainWindowConfig
+
+
+class ConfigObject(QObject):
+    """配置对象基类"""
+
+    # 由create_config_object_class填充
+    _field_names: tuple = ()
+
+    def __init__(self, values: Optional[Dict[str, Any]] = None,
+                 writer: Optional[Callable[[str, Any], Any]] = None, parent=None):
+        super().__init__(parent)
+        self._values: Dict[str, Any] = dict(values or {})
+        # QML写入属性时调用，负责持久化（持久化后通过sync回写）
+        self._writer = writer
+        # 各属性被读取的次数，用于统计绑定求值
+        self.read_counts: Dict[str, int] = {}
+
+    def _read(self, name: str) -> Any:
+        self.read_counts[name] = self.read_counts.get(name, 0) + 1
+        return self._values.get(name)
+
+    def _write(self, name: str, value: Any):
+        if self._values.get(name) == value:
+            return
+        if self._writer is not None:
+            self._writer(name, value)
+        else:
+            self.sync({name: value})
+
+    def sync(self, values: Dict[str, Any]) -> List[str]:
+        """用新配置更新属性，只为实际变化的字段发出通知，返回变化的字段"""
+        changed = []
+        for name in self._field_names:
+            if name in values and self._values.get(name) != values[name]:
+                self._values[name] = values[name]
+                changed.append(name)
+
+        for name in changed:
+            getattr(self, f"{name}_changed").emit()
+        return changed
+
+    def to_dict(self) -> Dict[str, Any]:
+        """导出为普通字典"""
+        return dict(self._values)
+
+    def reset_read_counts(self):
+        """清空读取统计"""
+        self.read_counts.clear()
+
+
+def _qt_type(field_type) -> Any:
+    """数据类字段类型对应的Qt属性类型"""
+    if field_type in (bool, int, float, str):
+        return field_type
+    if typing.get_origin(field_type) is list:
+        return 'QVariantList'
+    if typing.get_origin(field_type) is dict:
+        return 'QVariantMap'
+    return 'QVariant'
+
+
+def create_config_object_class(class_name: str, config_type) -> type:
+    """根据配置数据类生成带通知信号的QObject类"""
+    attrs: Dict[str, Any] = {'_field_names': tuple(f.name for f in fields(config_type))}
+
+    for config_field in fields(config_type):
+        name = config_field.name
+        notify = Signal()
+        attrs[f"{name}_changed"] = notify
+        attrs[name] = Property(
+            _qt_type(config_field.type),
+            lambda self, name=name: self._read(name),
+            lambda self, value, name=name: self._write(name, value),
+            notify=notify
+        )
+
+    return type(ConfigObject)(class_name, (ConfigObject,), attrs)
+
+
+# 快捷窗口配置对象
+QuickWindowConfigObject = create_config_object_class("QuickWindowConfigObject", QuickWindowConfig)
+
+# 主窗口配置对象
+MainWindowConfigObject = create_config_object_class("MainWindowConfigObject", MainWindowConfig)
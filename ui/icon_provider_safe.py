@@ -11,14 +11,17 @@ import urllib.parse
 import threading
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from PySide6.QtQuick import QQuickImageProvider
-from PySide6.QtGui import QPixmap, QPainter, QColor, QPen, QFont, QLinearGradient, QBrush
-from PySide6.QtCore import Qt, QSize, QRect, QObject, Signal, Slot
+from PySide6.QtGui import QPixmap
+from PySide6.QtCore import QSize, QObject, Signal, Slot
 
 # 导入资源路径处理工具
 from utils.resource_path import get_cache_path
+from core.placeholder_icons import get_placeholder_icons
+from core.path_index import SystemPathIndex
+from core.svg_rasterizer import dpr_bucket
 
 # 配置日志
 logging.basicConfig(
@@ -39,6 +42,10 @@ class IconProviderSignals(QObject):
 class SafeIconProvider(QQuickImageProvider):
     """安全图标提供者 - 优化版本"""
 
+    # 不存在的路径的负缓存有效期（秒）
+    MISSING_PATH_TTL = 30.0
+    # 请求ID解码结果和负缓存的最大条目数
+    MAX_DECODED_IDS = 4096
 
     def __init__(self, cache_dir: str = cache_dir0):
         super().__init__(QQuickImageProvider.Pixmap)
@@ -56,6 +63,11 @@ class SafeIconProvider(QQuickImageProvider):
             self.cache_available = False
             self.cache = None
 
+        # 占位图标（全局共享），在工作线程中预先绘制常用尺寸
+        self.placeholders = get_placeholder_icons()
+        self.placeholders.prewarm()
+        self._placeholder_pixmaps: Dict[tuple, QPixmap] = {}
+
         # 性能统计
         self.stats = {
             'total_requests': 0,
@@ -63,10 +75,17 @@ class SafeIconProvider(QQuickImageProvider):
             'failed': 0,
             'cache_hits': 0,
             'avg_response_time': 0,
+            'fs_checks': 0,
+            'negative_hits': 0,
             'start_time': time.time()
         }
         self.response_times = []
 
+        # 请求ID解码缓存、不存在路径的负缓存 (过期时间, 系统路径查找结果) 和系统路径索引
+        self._decoded_ids: Dict[str, str] = {}
+        self._missing_paths: Dict[str, Tuple[float, Optional[str]]] = {}
+        self.path_index = SystemPathIndex()
+
         # 请求队列（用于去重）
         self.pending_requests = set()
         self.request_lock = threading.Lock()
@@ -82,29 +101,31 @@ class SafeIconProvider(QQuickImageProvider):
         self.stats['total_requests'] += 1
 
         try:
-            # 解码路径
-            file_path = self._decode_request_id(id)
+            # 解码路径和设备像素比
+            request_path, dpr = self._split_request_id(id)
+            file_path = self._decode_request_id(request_path)
 
             if not file_path:
                 logger.warning(f"无效的图标请求ID: {id}")
                 self.stats['failed'] += 1
                 return self._create_error_icon(requestedSize)
 
-            # 确定图标大小
-            icon_size = self._determine_icon_size(size, requestedSize)
+            # 确定图标大小：Qt Quick请求的是乘以设备像素比后的像素尺寸，换算回逻辑尺寸
+            icon_size = max(1, round(self._determine_icon_size(size, requestedSize) / dpr))
 
             # 检查是否在请求中（防止重复请求）
-            request_key = f"{file_path}_{icon_size}"
+            request_key = f"{file_path}_{icon_size}@{dpr:g}x"
             with self.request_lock:
                 if request_key in self.pending_requests:
                     # 正在请求中，返回加载中图标
-                    return self._create_loading_icon(icon_size)
+                    return self._create_loading_icon(icon_size, dpr)
                 self.pending_requests.add(request_key)
 
             try:
                 # 获取图标
                 if self.cache_available and self.cache:
-                    pixmap = self.cache.get_icon(file_path, icon_size)
+                    # 缓存中保存的是QImage，在GUI线程中转换为QPixmap（保留设备像素比）
+                    pixmap = QPixmap.fromImage(self.cache.get_icon_image(file_path, icon_size, dpr))
                 else:
                     # 缓存不可用时使用备用方法
                     pixmap = self._create_backup_icon(file_path, icon_size)
@@ -129,7 +150,7 @@ class SafeIconProvider(QQuickImageProvider):
                 else:
                     self.stats['failed'] += 1
                     logger.warning(f"无法获取图标: {file_path}")
-                    return self._create_filetype_icon(file_path, icon_size)
+                    return self._create_filetype_icon(file_path, icon_size, dpr)
 
             finally:
                 with self.request_lock:
@@ -141,8 +162,35 @@ class SafeIconProvider(QQuickImageProvider):
             self.signals.errorOccurred.emit(str(e))
             return self._create_error_icon(requestedSize)
 
+    @staticmethod
+    def _split_request_id(id_str: str) -> Tuple[str, float]:
+        """拆分请求ID中的设备像素比参数，如 <路径>?dpr=2（路径中的?已被URL编码）"""
+        request_path, _, query = id_str.partition('?')
+        dpr = 1.0
+        for name, _, value in (item.partition('=') for item in query.split('&') if item):
+            if name == 'dpr':
+                try:
+                    dpr = dpr_bucket(float(value))
+                except ValueError:
+                    pass
+        return request_path, dpr
+
     def _decode_request_id(self, id_str: str) -> Optional[str]:
         """解码请求ID为文件路径"""
+        # 请求ID到路径字符串的解码结果只计算一次
+        decoded = self._decoded_ids.get(id_str)
+        if decoded is None:
+            decoded = self._decode_path(id_str)
+            if decoded is None:
+                return None
+            if len(self._decoded_ids) >= self.MAX_DECODED_IDS:
+                self._decoded_ids.clear()
+            self._decoded_ids[id_str] = decoded
+
+        return self._resolve_path(decoded)
+
+    def _decode_path(self, id_str: str) -> Optional[str]:
+        """将请求ID解码为路径字符串（不访问文件系统）"""
         try:
             # 移除URL编码，使用UTF-8编码处理中文字符
             decoded = urllib.parse.unquote(id_str, encoding='utf-8')
@@ -169,23 +217,7 @@ class SafeIconProvider(QQuickImageProvider):
                 decoded = decoded.replace('\\', '/')
 
             # 清理路径
-            decoded = decoded.strip()
-
-            # 检查是否为绝对路径
-            if os.path.isabs(decoded):
-                # 使用原始路径检查是否存在，确保中文路径正确处理
-                if os.path.exists(decoded):
-                    return decoded
-                else:
-                    # 尝试在系统路径中查找
-                    return self._find_in_system_path(decoded)
-
-            # 相对路径
-            abs_path = os.path.abspath(decoded)
-            if os.path.exists(abs_path):
-                return abs_path
-
-            return None
+            return decoded.strip()
 
         except UnicodeDecodeError as e:
             logger.error(f"解码请求ID失败，路径包含无法解码的字符: {id_str}, 错误: {e}")
@@ -194,44 +226,37 @@ class SafeIconProvider(QQuickImageProvider):
             logger.error(f"解码请求ID失败: {id_str}, 错误: {e}")
             return None
 
-    def _find_in_system_path(self, filename: str) -> Optional[str]:
-        """在系统路径中查找文件"""
-        try:
-            # 如果是完整路径但不存在，尝试仅用文件名查找
-            basename = os.path.basename(filename)
+    def _resolve_path(self, decoded: str) -> Optional[str]:
+        """确认路径存在；不存在的路径在一段时间内直接使用上次的查找结果"""
+        missing = self._missing_paths.get(decoded)
+        if missing is not None and missing[0] > time.monotonic():
+            self.stats['negative_hits'] += 1
+            return missing[1]
+
+        # 检查是否为绝对路径
+        self.stats['fs_checks'] += 1
+        if os.path.isabs(decoded):
+            # 使用原始路径检查是否存在，确保中文路径正确处理
+            if os.path.exists(decoded):
+                return decoded
+            # 尝试在系统路径中查找
+            result = self._find_in_system_path(decoded)
+        else:
+            # 相对路径
+            abs_path = os.path.abspath(decoded)
+            if os.path.exists(abs_path):
+                return abs_path
+            result = None
 
-            # 检查常见系统目录
-            system_dirs = []
-            if sys.platform == 'win32':
-                system_dirs = [
-                    os.environ.get("SystemRoot", r"C:\Windows"),
-                    os.environ.get("SystemRoot", r"C:\Windows") + r"\System32",
-                    os.environ.get("ProgramFiles", r"C:\Program Files"),
-                    os.environ.get("ProgramFiles(x86)", r"C:\Program Files (x86)"),
-                ]
-            else:
-                system_dirs = [
-                    "/usr/bin",
-                    "/usr/local/bin",
-                    "/usr/share/applications",
-                    os.path.expanduser("~/.local/share/applications")
-                ]
-
-            for sys_dir in system_dirs:
-                if os.path.exists(sys_dir):
-                    potential_path = os.path.join(sys_dir, basename)
-                    if os.path.exists(potential_path):
-                        return potential_path
-
-            # 在PATH环境变量中查找
-            path_dirs = os.environ.get("PATH", "").split(os.pathsep)
-            for path_dir in path_dirs:
-                if path_dir:
-                    potential_path = os.path.join(path_dir, basename)
-                    if os.path.exists(potential_path):
-                        return potential_path
+        if len(self._missing_paths) >= self.MAX_DECODED_IDS:
+            self._missing_paths.clear()
+        self._missing_paths[decoded] = (time.monotonic() + self.MISSING_PATH_TTL, result)
+        return result
 
-            return None
+    def _find_in_system_path(self, filename: str) -> Optional[str]:
+        """在系统目录和PATH中按文件名查找（使用文件名索引）"""
+        try:
+            return self.path_index.lookup(filename)
         except Exception as e:
             logger.debug(f"系统路径查找失败: {e}")
             return None
@@ -278,221 +303,33 @@ class SafeIconProvider(QQuickImageProvider):
             logger.error(f"创建备用图标失败: {e}")
             return self._create_default_icon(size)
 
-    def _create_loading_icon(self, size: int) -> QPixmap:
-        """创建加载中图标"""
-        try:
-            pixmap = QPixmap(size, size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            # 绘制背景
-            gradient = QLinearGradient(0, 0, size, size)
-            gradient.setColorAt(0, QColor(240, 240, 240, 200))
-            gradient.setColorAt(1, QColor(220, 220, 220, 200))
-
-            margin = max(2, size // 16)
-            rect = pixmap.rect().adjusted(margin, margin, -margin, -margin)
-
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, size // 8, size // 8)
-
-            # 绘制加载动画（旋转圆点）
-            import time
-            current_time = time.time()
-            angle = (current_time * 360) % 360
-
-            dot_size = size // 8
-            center = rect.center()
-            radius = rect.width() // 3
-
-            painter.setBrush(QColor(66, 133, 244, 200))
-
-            for i in range(4):
-                dot_angle = angle + (i * 90)
-                rad = dot_angle * 3.14159 / 180
-                x = center.x() + radius * (rad.cos())
-                y = center.y() + radius * (rad.sin())
-
-                dot_rect = QRect(
-                    int(x - dot_size // 2),
-                    int(y - dot_size // 2),
-                    dot_size, dot_size
-                )
-                painter.drawEllipse(dot_rect)
-
-            # 绘制"加载中"文字
-            if size >= 32:
-                font = QFont()
-                font.setPixelSize(max(size // 6, 8))
-                font.setBold(True)
-                painter.setFont(font)
-                painter.setPen(QColor(100, 100, 100, 200))
-                painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "...")
-
-            painter.end()
-            return pixmap
+    def _placeholder_pixmap(self, kind: str, size: int, ext: str = '', dpr: float = 1.0) -> QPixmap:
+        """共享的占位图标，每种图标只在GUI线程转换一次QPixmap"""
+        key = (kind, ext.lower(), size, dpr)
+        pixmap = self._placeholder_pixmaps.get(key)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(self.placeholders.get(kind, size, ext, dpr))
+            self._placeholder_pixmaps[key] = pixmap
+        return pixmap
 
-        except Exception as e:
-            logger.error(f"创建加载图标失败: {e}")
-            return self._create_default_icon(size)
+    def _create_loading_icon(self, size: int, dpr: float = 1.0) -> QPixmap:
+        """创建加载中图标"""
+        return self._placeholder_pixmap('loading', size, dpr=dpr)
 
-    def _create_filetype_icon(self, path: str, size: int) -> QPixmap:
+    def _create_filetype_icon(self, path: str, size: int, dpr: float = 1.0) -> QPixmap:
         """创建文件类型图标"""
-        try:
-            # 文件类型颜色映射
-            filetype_colors = {
-                '.exe': QColor(0, 120, 215),  # Windows蓝
-                '.lnk': QColor(255, 165, 0),  # 橙色
-                '.msi': QColor(16, 124, 16),  # 深绿
-                '.dll': QColor(106, 0, 95),  # 紫红
-                '.sys': QColor(178, 0, 32),  # 深红
-                '.bat': QColor(64, 64, 64),  # 深灰
-                '.cmd': QColor(64, 64, 64),
-                '.ps1': QColor(0, 51, 153),  # PowerShell蓝
-                '.zip': QColor(251, 140, 0),
-                '.rar': QColor(251, 140, 0),
-                '.7z': QColor(251, 140, 0),
-                '.iso': QColor(139, 195, 74),  # 浅绿
-            }
-
-            ext = os.path.splitext(path)[1].lower()
-            color = filetype_colors.get(ext, QColor(96, 125, 139))
-
-            pixmap = QPixmap(size, size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            # 绘制背景
-            margin = max(2, size // 16)
-            rect = pixmap.rect().adjusted(margin, margin, -margin, -margin)
-
-            # 创建渐变
-            gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
-            gradient.setColorAt(0, color.lighter(120))
-            gradient.setColorAt(1, color.darker(120))
-
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, size // 8, size // 8)
-
-            # 绘制扩展名
-            if ext and len(ext) > 1:
-                ext_text = ext[1:].upper()
-                if len(ext_text) > 4:
-                    ext_text = ext_text[:4]
-
-                font = QFont()
-                font.setPixelSize(max(size // 3, 8))
-                font.setBold(True)
-                painter.setFont(font)
-                painter.setPen(QColor(255, 255, 255))
-
-                painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, ext_text)
-
-            painter.end()
-            return pixmap
-
-        except Exception as e:
-            logger.error(f"创建文件类型图标失败: {e}")
-            return self._create_default_icon(size)
+        return self._placeholder_pixmap('filetype', size, os.path.splitext(path)[1], dpr)
 
     def _create_default_icon(self, size: int) -> QPixmap:
         """创建默认图标"""
-        try:
-            pixmap = QPixmap(size, size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            # 绘制背景
-            gradient = QLinearGradient(0, 0, size, size)
-            gradient.setColorAt(0, QColor(66, 133, 244, 180))
-            gradient.setColorAt(1, QColor(26, 115, 232, 180))
-
-            margin = max(2, size // 16)
-            rect = pixmap.rect().adjusted(margin, margin, -margin, -margin)
-
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, size // 8, size // 8)
-
-            # 绘制应用图标
-            painter.setPen(QPen(QColor(255, 255, 255), max(1, size // 32)))
-            painter.setBrush(QColor(255, 255, 255, 100))
-
-            # 绘制窗口
-            inner_margin = size // 6
-            inner_rect = rect.adjusted(inner_margin, inner_margin, -inner_margin, -inner_margin)
-            painter.drawRoundedRect(inner_rect, size // 16, size // 16)
-
-            painter.end()
-            return pixmap
-
-        except Exception as e:
-            logger.error(f"创建默认图标失败: {e}")
-            pixmap = QPixmap(size, size)
-            pixmap.fill(QColor(66, 133, 244))
-            return pixmap
+        return self._placeholder_pixmap('app', size)
 
     def _create_error_icon(self, size: QSize) -> QPixmap:
         """创建错误图标"""
         icon_size = 32
         if size.isValid():
             icon_size = min(size.width(), size.height()) if size.width() > 0 and size.height() > 0 else 32
-
-        try:
-            pixmap = QPixmap(icon_size, icon_size)
-            pixmap.fill(Qt.GlobalColor.transparent)
-
-            painter = QPainter(pixmap)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            # 绘制背景
-            gradient = QLinearGradient(0, 0, icon_size, icon_size)
-            gradient.setColorAt(0, QColor(244, 67, 54, 180))
-            gradient.setColorAt(1, QColor(211, 47, 47, 180))
-
-            margin = max(2, icon_size // 16)
-            rect = pixmap.rect().adjusted(margin, margin, -margin, -margin)
-
-            painter.setBrush(QBrush(gradient))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawRoundedRect(rect, icon_size // 8, icon_size // 8)
-
-            # 绘制感叹号
-            painter.setPen(QPen(QColor(255, 255, 255), max(2, icon_size // 16)))
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-
-            # 绘制感叹号竖线
-            line_x = rect.center().x()
-            line_top = rect.top() + rect.height() // 4
-            line_bottom = rect.bottom() - rect.height() // 4
-            painter.drawLine(line_x, line_top, line_x, line_bottom)
-
-            # 绘制感叹号点
-            dot_radius = max(2, icon_size // 32)
-            painter.setBrush(QColor(255, 255, 255))
-            painter.drawEllipse(
-                line_x - dot_radius,
-                line_bottom + dot_radius,
-                dot_radius * 2,
-                dot_radius * 2
-            )
-
-            painter.end()
-            return pixmap
-
-        except Exception as e:
-            logger.error(f"创建错误图标失败: {e}")
-            pixmap = QPixmap(icon_size, icon_size)
-            pixmap.fill(QColor(244, 67, 54))
-            return pixmap
+        return self._placeholder_pixmap('error', icon_size)
 
     def _log_performance_stats(self):
         """记录性能统计"""
@@ -523,6 +360,9 @@ class SafeIconProvider(QQuickImageProvider):
     def clear_cache(self):
         """清理缓存"""
         try:
+            self._placeholder_pixmaps.clear()
+            self._missing_paths.clear()
+            self.path_index.invalidate()
             if self.cache_available and self.cache:
                 self.cache.clear_cache()
             self.signals.cacheCleared.emit()
@@ -551,8 +391,11 @@ class SafeIconProvider(QQuickImageProvider):
                     'successful_requests': provider_stats['successful'],
                     'failed_requests': provider_stats['failed'],
                     'success_rate': round(success_rate, 2),
-                    'average_response_time': round(provider_stats['avg_response_time'], 3)
+                    'average_response_time': round(provider_stats['avg_response_time'], 3),
+                    'fs_checks_per_request': round(provider_stats['fs_checks'] / total_requests, 2) if total_requests > 0 else 0,
+                    'negative_hits': provider_stats['negative_hits']
                 },
+                'path_index': self.path_index.get_stats(),
                 'cache': cache_stats,
                 'performance': {
                     'uptime_hours': round((time.time() - self.stats['start_time']) / 3600, 2)
@@ -591,6 +434,14 @@ class SafeIconProvider(QQuickImageProvider):
             logger.error(f"预加载图标失败: {e}")
             self.signals.errorOccurred.emit(f"预加载图标失败: {e}")
 
+    def prefetch_icons(self, file_paths: list, sizes: list, dpr: float = 1.0):
+        """预取并保留界面当前显示的图标变体（如快捷窗口的静止和悬停尺寸）"""
+        try:
+            if self.cache_available and self.cache:
+                self.cache.pin_icons(file_paths, sizes, dpr)
+        except Exception as e:
+            logger.error(f"预取图标失败: {e}")
+
     @Slot(int, int)
     def cleanup_cache(self, max_age_days: int = 7, max_size_mb: int = 500):
         """清理缓存"""
@@ -613,6 +464,7 @@ class SafeIconProvider(QQuickImageProvider):
         try:
             if self.cache_available and self.cache:
                 self.cache.shutdown()
+            self.placeholders.shutdown()
             logger.info("图标提供者已关闭")
         except Exception as e:
             logger.error(f"关闭图标提供者失败: {e}")
@@ -633,4 +485,4 @@ def register_icon_provider(engine, cache_dir: str = cache_dir0):
         return provider
     except Exception as e:
         logger.error(f"注册图标提供者失败: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -8,12 +8,19 @@ import sys
 import json
 import traceback
 import os
+import threading
 from pathlib import Path
 from typing import List, Dict, Any
+from dataclasses import asdict
 from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
-from PySide6.QtCore import QObject, Signal, Slot, QTimer, QUrl, QThread
+from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer, QUrl, QThread, QSize
 from core.app_manager import AppManager
 from core.config_manager import ConfigManager
+from core.background_cache import BackgroundCache, BackgroundParams
+from core.image_variants import ImageVariantCache
+from concurrent.futures import ThreadPoolExecutor
+from ui.config_objects import QuickWindowConfigObject, MainWindowConfigObject
+from ui.app_list_model import AppListModel
 from utils.file_handler import FileHandler
 from utils.logger_config import app_logger
 
@@ -37,6 +44,22 @@ class MainWindowBackend(QObject):
     operation_status = Signal(str, str)  # (操作类型, 状态消息)
     show_message = Signal(str, str, str)  # (标题, 内容, 类型)
     import_export_status = Signal(str, bool, str)  # (操作, 成功, 消息)
+    blurred_background_changed = Signal()
+    background_source_changed = Signal()
+    background_upload_finished = Signal('QVariantMap')  # 异步上传背景图片完成
+    _background_upload_prepared = Signal(dict, str)  # 工作线程准备好的上传结果, 旧图片路径
+    cleanup_progress = Signal(int, int)  # 清理不存在应用：已检查数, 总数
+    cleanup_finished = Signal('QVariantMap')  # 异步清理不存在应用完成
+    _cleanup_swept = Signal(dict)  # 工作线程完成检查的结果
+    discoverable_apps_changed = Signal()  # 应用目录索引有变化
+    search_results_changed = Signal(str, int, bool)  # 搜索结果更新：查询, 当前结果数, 是否已完成
+    _search_chunk_ready = Signal(int, str, object, bool)  # 工作线程的一块搜索结果：代号, 查询, 应用列表, 是否已完成
+
+    # 影响预渲染背景的主窗口配置项
+    BACKGROUND_KEYS = (
+        'background_image', 'radius_blur', 'background_color', 'background_opacity',
+        'opacity', 'luminosity', 'opacity_noise', 'enable_noise', 'static_background'
+    )
 
     def __init__(self):
         super().__init__()
@@ -48,17 +71,71 @@ class MainWindowBackend(QObject):
         self.cache_available = self.app_manager.cache_available
         self.icon_cache = self.app_manager.icon_cache
 
+        # 类型化配置对象，QML绑定只在对应字段变化时重新求值
+        self._quick_config_object = QuickWindowConfigObject(
+            asdict(self.config_manager.quick_config), writer=self.update_quick_window_config, parent=self
+        )
+        self._main_config_object = MainWindowConfigObject(
+            asdict(self.config_manager.main_window_config), writer=self.update_main_window_config, parent=self
+        )
+
         # 连接配置更新信号
         # 主窗口需要接收快捷窗口配置更新以保持同步
         self.config_manager.quick_config_updated.connect(self._on_quick_config_updated)
         self.config_manager.main_window_config_updated.connect(self._on_main_window_config_updated)
         self.config_manager.app_list_updated.connect(self._on_app_list_updated)
         self.config_manager.config_saved.connect(self._on_config_saved)
+        # 应用文件被删除或恢复时刷新列表中的存在状态
+        self.app_manager.path_status.status_changed.connect(self._on_app_paths_changed)
 
         # 定时自动保存 - 优化为60秒一次，减少磁盘写入频率
         self.auto_save_timer = QTimer()
         self.auto_save_timer.timeout.connect(self._auto_save)
         self.auto_save_timer.start(60000)  # 60秒自动保存一次，减少频繁保存
+
+        # 背景图片按窗口尺寸和设备像素比生成缩放变体，QML不再解码原始大图
+        self.image_variants = ImageVariantCache()
+        self.image_variants.variant_ready.connect(self._on_background_variant_ready)
+        self._background_dpr = 1.0
+        self._variant_key = ""
+        self._variant_path = ""
+        self._background_source = ""
+        self._background_source_size = QSize()
+
+        # 预渲染毛玻璃背景：背景图片、窗口尺寸或效果参数变化时在工作线程中重新渲染
+        self.background_cache = BackgroundCache()
+        self.background_cache.background_ready.connect(self._on_background_ready)
+        self._background_size = (0, 0)
+        self._background_key = ""
+        self._blurred_background = ""
+        self._last_background_config = None
+        self._background_timer = QTimer(self)
+        self._background_timer.setSingleShot(True)
+        self._background_timer.setInterval(150)  # 调整窗口大小时合并请求
+        self._background_timer.timeout.connect(self._refresh_background)
+
+        # 背景图片上传（校验、压缩、复制）在工作线程中进行
+        self._upload_executor = ThreadPoolExecutor(max_workers=1)
+        self._background_upload_prepared.connect(self._on_background_upload_prepared)
+
+        # 清理不存在应用：并发检查在守护线程中进行（无响应的路径不阻止程序退出），删除在主线程中一次性完成
+        self._cleanup_running = False
+        self._cleanup_swept.connect(self._on_cleanup_swept)
+
+        # 异步搜索：每次输入递增代号，工作线程发现代号过期即停止，结果分块更新搜索模型
+        self._search_model = AppListModel(self)
+        self._search_executor = ThreadPoolExecutor(max_workers=1)
+        self._search_generation = 0
+        self._search_received = False
+        self._search_query = ""
+        # 标签/收藏/最近使用的组合筛选条件，与搜索文本同时生效
+        self._search_filters: Dict[str, Any] = {}
+        self._search_chunk_ready.connect(self._on_search_chunk_ready)
+
+        # Linux下在后台增量扫描XDG应用目录
+        self._index_executor = ThreadPoolExecutor(max_workers=1)
+        if self.app_manager.app_indexer is not None:
+            self._index_executor.submit(self._rescan_app_index)
         app_logger.debug("主窗口后端初始化完成")
 
     def _on_main_window_config_updated(self):
@@ -67,6 +144,8 @@ class MainWindowBackend(QObject):
             print("【DEBUG】开始执行主窗口配置更新")
             config = self.get_main_window_config()
             print(f"【DEBUG】获取到的配置: {config}")
+            self._main_config_object.sync(config)
+            self._schedule_background_update(config)
             self.main_window_config_updated.emit(config)
             print(f"【DEBUG】主窗口配置更新信号已发出，配置项: {list(config.keys()) if isinstance(config, dict) else 'N/A'}")
             app_logger.info(f"主窗口配置更新信号已发出，配置项: {list(config.keys()) if isinstance(config, dict) else 'N/A'}")
@@ -81,11 +160,167 @@ class MainWindowBackend(QObject):
         try:
             # 快捷窗口配置更新时发出专门的信号
             config = self.get_quick_window_config()
+            self._quick_config_object.sync(config)
             self.quick_window_config_updated.emit(config)
         except Exception as e:
             app_logger.error(f"快捷窗口配置更新处理失败: {e}")
             print(f"快捷窗口配置更新处理失败: {e}")
 
+    def _get_quick_config_object(self) -> QuickWindowConfigObject:
+        return self._quick_config_object
+
+    def _get_main_config_object(self) -> MainWindowConfigObject:
+        return self._main_config_object
+
+    def _get_search_model(self) -> AppListModel:
+        return self._search_model
+
+    # 类型化配置对象
+    quickConfig = Property(QObject, _get_quick_config_object, constant=True)
+    mainConfig = Property(QObject, _get_main_config_object, constant=True)
+    # 应用管理列表（异步搜索结果）
+    searchModel = Property(QObject, _get_search_model, constant=True)
+
+    def _schedule_background_update(self, config: Dict[str, Any]):
+        """只有影响背景的配置变化时才重新请求预渲染背景"""
+        background_config = tuple(config.get(key) for key in self.BACKGROUND_KEYS)
+        if background_config != self._last_background_config:
+            self._last_background_config = background_config
+            self._background_timer.start()
+
+    def _background_params(self):
+        """根据当前配置和窗口尺寸生成预渲染参数，不需要预渲染时返回None"""
+        config = self.config_manager.main_window_config
+        width, height = self._background_size
+        if not config.static_background or not config.background_image or width <= 0 or height <= 0:
+            return None
+
+        # 与MainWindow.qml中GlassEffect的绑定保持一致
+        opacity_tint = config.background_opacity if config.background_opacity is not None else config.opacity
+        return BackgroundParams(
+            image_path=self._variant_path or config.background_image,
+            width=int(width),
+            height=int(height),
+            radius_blur=int(config.radius_blur if config.radius_blur is not None else 20),
+            color_tint=config.background_color or "#808080",
+            opacity_tint=float(opacity_tint if opacity_tint is not None else 0.3),
+            luminosity=float(config.luminosity if config.luminosity is not None else 0.1),
+            opacity_noise=float(config.opacity_noise if config.opacity_noise is not None else 0.02),
+            enable_noise=bool(config.enable_noise),
+            corner_radius=8
+        )
+
+    def _set_blurred_background(self, path: str):
+        url = QUrl.fromLocalFile(path).toString() if path else ""
+        if url != self._blurred_background:
+            self._blurred_background = url
+            self.blurred_background_changed.emit()
+
+    def _refresh_background(self):
+        """窗口尺寸或背景配置变化后，先取得图片变体，再请求预渲染背景"""
+        if self._request_background_variant():
+            self._request_blurred_background()
+
+    def _set_background_source(self, url: str, size: QSize):
+        if url != self._background_source or size != self._background_source_size:
+            self._background_source = url
+            self._background_source_size = size
+            self.background_source_changed.emit()
+
+    def _request_background_variant(self) -> bool:
+        """请求与窗口尺寸匹配的图片变体，已有变体时返回True"""
+        config = self.config_manager.main_window_config
+        width, height = self._background_size
+        image_path = BackgroundCache.resolve_image_path(config.background_image) if config.background_image else ""
+        if not image_path or width <= 0 or height <= 0:
+            # 没有背景图片，或窗口尺寸未知时不加载（避免解码完整分辨率的原图）
+            self._variant_key = ""
+            self._variant_path = ""
+            self._set_background_source("", QSize())
+            return True
+
+        try:
+            self._variant_key, variant = self.image_variants.request(image_path, width, height, self._background_dpr)
+        except Exception as e:
+            app_logger.error(f"请求背景图片变体失败: {e}")
+            variant = None
+
+        if variant:
+            self._apply_background_variant(*variant)
+            return True
+
+        # 变体生成前先加载原图，由QML按窗口物理尺寸解码（不解码完整分辨率）
+        self._variant_path = ""
+        physical_size = QSize(round(width * self._background_dpr), round(height * self._background_dpr))
+        self._set_background_source(QUrl.fromLocalFile(image_path).toString(), physical_size)
+        return False
+
+    def _apply_background_variant(self, path: str, width: int, height: int):
+        self._variant_path = path
+        self._set_background_source(QUrl.fromLocalFile(path).toString(), QSize(width, height))
+
+    @Slot(str, str, int, int)
+    def _on_background_variant_ready(self, key: str, path: str, width: int, height: int):
+        """工作线程生成变体完成（通过队列连接回到主线程）"""
+        if key != self._variant_key:
+            return
+        if path:
+            self._apply_background_variant(path, width, height)
+        self._request_blurred_background()
+
+    def _get_background_source(self) -> str:
+        return self._background_source
+
+    def _get_background_source_size(self) -> QSize:
+        return self._background_source_size
+
+    # 背景图片URL（与窗口尺寸最接近的变体）及其解码尺寸
+    backgroundSource = Property(str, _get_background_source, notify=background_source_changed)
+    backgroundSourceSize = Property(QSize, _get_background_source_size, notify=background_source_changed)
+
+    def _request_blurred_background(self):
+        """请求预渲染背景，已缓存时立即使用，否则渲染完成前保持实时模糊"""
+        try:
+            params = self._background_params()
+            if params is None:
+                self._background_key = ""
+                self._set_blurred_background("")
+                return
+
+            self._background_key = self.background_cache.cache_key(params)
+            path = self.background_cache.request(params)
+            self._set_blurred_background(path or "")
+        except Exception as e:
+            app_logger.error(f"请求预渲染背景失败: {e}")
+            self._set_blurred_background("")
+
+    @Slot(str, str)
+    def _on_background_ready(self, key: str, path: str):
+        """工作线程渲染完成（通过队列连接回到主线程）"""
+        if key == self._background_key:
+            self._set_blurred_background(path)
+
+    @Slot(int, int, float)
+    def set_background_size(self, width: int, height: int, device_pixel_ratio: float = 1.0):
+        """主窗口尺寸或屏幕变化时调用，背景变体和预渲染背景按窗口尺寸生成"""
+        size = (int(width), int(height))
+        device_pixel_ratio = float(device_pixel_ratio) if device_pixel_ratio and device_pixel_ratio > 0 else 1.0
+        if size != self._background_size or device_pixel_ratio != self._background_dpr:
+            first_size = self._background_size == (0, 0)
+            self._background_size = size
+            self._background_dpr = device_pixel_ratio
+            if first_size:
+                # 窗口首次显示时立即加载背景，之后的尺寸变化合并处理
+                self._refresh_background()
+            else:
+                self._background_timer.start()
+
+    def _get_blurred_background(self) -> str:
+        return self._blurred_background
+
+    # 预渲染的毛玻璃背景图片URL，为空时GlassEffect使用实时模糊
+    blurredBackground = Property(str, _get_blurred_background, notify=blurred_background_changed)
+
     def _on_app_list_updated(self):
         """应用列表更新时发出信号"""
         try:
@@ -94,6 +329,10 @@ class MainWindowBackend(QObject):
         except Exception as e:
             print(f"应用列表更新处理失败: {e}")
 
+    def _on_app_paths_changed(self, paths: list):
+        """应用路径存在状态变化"""
+        self._on_app_list_updated()
+
     def _on_config_saved(self, success: bool):
         """配置保存完成"""
         if success:
@@ -304,6 +543,63 @@ class MainWindowBackend(QObject):
             print(f"搜索应用失败: {e}")
             return []
 
+    @Slot(str)
+    def start_search(self, query: str):
+        """异步搜索应用（空查询为全部应用），结果分块更新searchModel，之前未完成的搜索被取消"""
+        self._search_generation += 1
+        self._search_received = False
+        self._search_query = query
+        self._search_executor.submit(self._search_job, self._search_generation, query, dict(self._search_filters))
+
+    @Slot('QVariantMap')
+    def set_search_filters(self, filters: Dict[str, Any]):
+        """设置标签（tags_all/tags_any/tags_none）、收藏（favorite）和最近使用（recent）的组合筛选，并重新搜索"""
+        self._search_filters = {key: value for key, value in (filters or {}).items() if value not in (None, [], "")}
+        self.start_search(self._search_query)
+
+    @Slot('QVariantMap', result='QVariantMap')
+    def get_tag_facets(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """筛选结果中各标签、收藏和最近使用的应用数量（即再加上该条件后的结果数）"""
+        try:
+            return self.config_manager.get_tag_facets(filters)
+        except Exception as e:
+            app_logger.error(f"获取标签分面计数失败: {e}")
+            return {}
+
+    @Slot('QVariantMap', result='QVariantMap')
+    def filter_applications(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """按标签、收藏和最近使用的组合筛选应用，同时返回分面计数"""
+        return self.app_manager.filter_applications(filters)
+
+    def _search_job(self, generation: int, query: str, filters: Dict[str, Any]):
+        """工作线程：分块搜索，代号过期时停止"""
+        def is_stale() -> bool:
+            return generation != self._search_generation
+
+        try:
+            # 限制搜索只在应用名称中进行
+            for apps in self.app_manager.iter_search_results(query, search_fields=["name"], is_cancelled=is_stale,
+                                                             filters=filters):
+                if is_stale():
+                    return
+                self._search_chunk_ready.emit(generation, query, apps, False)
+        except Exception as e:
+            app_logger.error(f"搜索应用失败: {e}")
+        if not is_stale():
+            self._search_chunk_ready.emit(generation, query, [], True)
+
+    @Slot(int, str, object, bool)
+    def _on_search_chunk_ready(self, generation: int, query: str, apps: list, finished: bool):
+        """主线程：第一块结果替换旧结果（在此之前旧结果保持显示），之后的块追加"""
+        if generation != self._search_generation:
+            return
+        if not self._search_received:
+            self._search_received = True
+            self._search_model.set_apps(apps)
+        else:
+            self._search_model.append_apps(apps)
+        self.search_results_changed.emit(query, self._search_model.rowCount(), finished)
+
     @Slot(str, 'QVariant', result=bool)
     def update_quick_window_config(self, key: str, value: Any) -> bool:
         """更新快捷窗口配置"""
@@ -445,7 +741,7 @@ class MainWindowBackend(QObject):
             
             # 发出配置更新信号，以便前端界面更新
             # 重要：只在主窗口相关的配置改变时才发出信号，避免影响快捷窗口
-            if key in ["opacity", "background_image", "opacity_noise", "opacity_tint", "radius_blur", "background_opacity", "background_color", "luminosity", "enable_noise", "auto_start", "show_on_startup", "hide_on_startup_if_auto"]:
+            if key in ["opacity", "background_image", "opacity_noise", "opacity_tint", "radius_blur", "background_opacity", "background_color", "luminosity", "enable_noise", "static_background", "auto_start", "show_on_startup", "hide_on_startup_if_auto"]:
                 self._on_main_window_config_updated()  # 调用正确的主窗口配置更新方法
             
             # 记录配置更新
@@ -678,81 +974,80 @@ class MainWindowBackend(QObject):
                 except Exception as file_error:
                     app_logger.warning(f"删除旧背景图片文件失败: {file_error}")
 
+    def _prepare_background_upload(self, image_path: str) -> Dict[str, Any]:
+        """校验、压缩并复制背景图片到缓存目录（不访问界面，可在工作线程中执行）"""
+        app_logger.info(f"开始上传背景图片: {image_path}")
+
+        # 验证图片路径
+        validation_result = self._validate_image_path(image_path)
+        if not validation_result["success"]:
+            app_logger.error(f"图片路径验证失败: {validation_result['message']}")
+            return validation_result
+
+        image_path = validation_result["path"]
+        app_logger.debug(f"验证后的图片路径: {image_path}")
+
+        # 优化图片
+        optimized_path, needs_cleanup = self._optimize_image(image_path)
+        app_logger.debug(f"优化后的图片路径: {optimized_path}, 需要清理: {needs_cleanup}")
+
+        # 获取缓存目录
+        cache_dir = self._get_background_cache_dir()
+        app_logger.debug(f"背景图片缓存目录: {cache_dir}")
+
+        # 验证缓存目录是否可写
+        if not os.access(cache_dir, os.W_OK):
+            error_msg = f"缓存目录不可写: {cache_dir}"
+            app_logger.error(error_msg)
+            return {"success": False, "message": error_msg}
+
+        # 上传文件到缓存目录
+        allowed_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
+        max_size = 10 * 1024 * 1024  # 10MB
+        result = FileHandler.upload_file(
+            optimized_path,
+            str(cache_dir),
+            allowed_extensions=allowed_extensions,
+            max_size=max_size
+        )
+
+        app_logger.debug(f"文件上传结果: {result}")
+
+        # 清理临时文件（如果需要）
+        if needs_cleanup and os.path.exists(optimized_path) and optimized_path != image_path:
+            try:
+                os.remove(optimized_path)
+                app_logger.debug(f"已删除临时优化后的图片: {optimized_path}")
+            except Exception as e:
+                app_logger.warning(f"删除临时文件失败: {e}")
+
+        return result
+
+    def _apply_background_upload(self, result: Dict[str, Any], old_image_path: str):
+        """上传成功后更新配置（主线程）"""
+        if result['success']:
+            app_logger.info(f"背景图片上传成功: {result['path']}")
+
+            # 删除旧的背景图片文件（如果存在且与新文件不同）
+            self._delete_old_background_image(old_image_path)
+
+            # 更新配置中的背景图片路径
+            # 注意：配置中存储相对路径，前端使用协议前缀加载
+            app_logger.info(f"正在更新配置中的背景图片路径: {result['path']}")
+            self.config_manager.update_main_window_config(background_image=result['path'])
+
+            # 发出配置更新信号，以便前端界面更新
+            self._on_main_window_config_updated()
+        else:
+            app_logger.error(f"背景图片上传失败: {result['message']}")
+
     @Slot(str, result='QVariantMap')
     def upload_background_image(self, image_path: str) -> Dict[str, Any]:
-        """上传背景图片"""
+        """上传背景图片（同步，界面中使用upload_background_image_async）"""
         try:
-            app_logger.info(f"开始上传背景图片: {image_path}")
-            
-            # 验证图片路径
-            validation_result = self._validate_image_path(image_path)
-            if not validation_result["success"]:
-                app_logger.error(f"图片路径验证失败: {validation_result['message']}")
-                return validation_result
-            
-            image_path = validation_result["path"]
-            app_logger.debug(f"验证后的图片路径: {image_path}")
-            
-            # 优化图片
-            optimized_path, needs_cleanup = self._optimize_image(image_path)
-            app_logger.debug(f"优化后的图片路径: {optimized_path}, 需要清理: {needs_cleanup}")
-            
-            # 获取当前配置以获取旧的背景图片路径
-            current_config = self.get_main_window_config()
-            old_image_path = current_config.get('background_image', '')
-            app_logger.debug(f"当前配置中的旧背景图片路径: {old_image_path}")
-            
-            # 获取缓存目录
-            cache_dir = self._get_background_cache_dir()
-            app_logger.debug(f"背景图片缓存目录: {cache_dir}")
-            
-            # 验证缓存目录是否可写
-            if not os.access(cache_dir, os.W_OK):
-                error_msg = f"缓存目录不可写: {cache_dir}"
-                app_logger.error(error_msg)
-                return {"success": False, "message": error_msg}
-            
-            # 上传文件到缓存目录
-            allowed_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.gif']
-            max_size = 10 * 1024 * 1024  # 10MB
-            result = FileHandler.upload_file(
-                optimized_path,
-                str(cache_dir),
-                allowed_extensions=allowed_extensions,
-                max_size=max_size
-            )
-            
-            app_logger.debug(f"文件上传结果: {result}")
-            
-            # 清理临时文件（如果需要）
-            if needs_cleanup and os.path.exists(optimized_path) and optimized_path != image_path:
-                try:
-                    os.remove(optimized_path)
-                    app_logger.debug(f"已删除临时优化后的图片: {optimized_path}")
-                except Exception as e:
-                    app_logger.warning(f"删除临时文件失败: {e}")
-            
-            if result['success']:
-                app_logger.info(f"背景图片上传成功: {result['path']}")
-                
-                # 删除旧的背景图片文件（如果存在且与新文件不同）
-                self._delete_old_background_image(old_image_path)
-                
-                # 更新配置中的背景图片路径
-                # 注意：配置中存储相对路径，前端使用协议前缀加载
-                app_logger.info(f"正在更新配置中的背景图片路径: {result['path']}")
-                self.config_manager.update_main_window_config(background_image=result['path'])
-                
-                # 验证配置是否已更新
-                updated_config = self.get_main_window_config()
-                new_background_image = updated_config.get('background_image', '')
-                app_logger.info(f"更新后的背景图片路径: {new_background_image}")
-                
-                # 发出配置更新信号，以便前端界面更新
-                self._on_main_window_config_updated()
-            else:
-                app_logger.error(f"背景图片上传失败: {result['message']}")
-                
+            old_image_path = self.get_main_window_config().get('background_image', '')
+            result = self._prepare_background_upload(image_path)
+            self._apply_background_upload(result, old_image_path)
             return result
         except Exception as e:
             error_msg = f"上传背景图片失败: {str(e)}"
@@ -760,6 +1055,32 @@ class MainWindowBackend(QObject):
             self.show_message.emit("错误", error_msg, "error")
             return {"success": False, "message": error_msg}
 
+    @Slot(str)
+    def upload_background_image_async(self, image_path: str):
+        """在工作线程中上传背景图片，完成后发出background_upload_finished，不阻塞界面"""
+        old_image_path = self.get_main_window_config().get('background_image', '')
+
+        def job():
+            try:
+                result = self._prepare_background_upload(image_path)
+            except Exception as e:
+                app_logger.error(f"上传背景图片失败: {e}", exc_info=True)
+                result = {"success": False, "message": f"上传背景图片失败: {str(e)}"}
+            self._background_upload_prepared.emit(result, old_image_path)
+
+        self._upload_executor.submit(job)
+
+    @Slot(dict, str)
+    def _on_background_upload_prepared(self, result: Dict[str, Any], old_image_path: str):
+        """工作线程上传完成（通过队列连接回到主线程）"""
+        try:
+            self._apply_background_upload(result, old_image_path)
+        except Exception as e:
+            error_msg = f"上传背景图片失败: {str(e)}"
+            app_logger.error(error_msg, exc_info=True)
+            result = {"success": False, "message": error_msg}
+        self.background_upload_finished.emit(result)
+
     @Slot(str, result='QVariantMap')
     def update_background_image(self, image_path: str) -> Dict[str, Any]:
         """更新背景图片（与上传功能相同，保持API一致性）"""
@@ -988,17 +1309,8 @@ class MainWindowBackend(QObject):
         """清理不存在的应用"""
         try:
             result = self.app_manager.cleanup_missing_apps()
-
-            if result["success"]:
-                self.app_list_updated.emit(self.get_applications())
-                if result.get("cleaned_count", 0) > 0:
-                    message = f"已清理 {result['cleaned_count']} 个不存在的应用"
-                else:
-                    message = "没有发现不存在的应用"
-                self.show_message.emit("成功", message, "success")
-            else:
-                self.show_message.emit("错误", result.get("message", "清理失败"), "error")
-
+            # 批量删除后配置管理器只发出一次列表更新信号，这里不再重复发出
+            self._report_cleanup_result(result)
             return result
 
         except Exception as e:
@@ -1006,6 +1318,68 @@ class MainWindowBackend(QObject):
             self.show_message.emit("错误", error_msg, "error")
             return {"success": False, "message": error_msg}
 
+    def _rescan_app_index(self, verify_files: bool = True):
+        """工作线程：扫描应用目录，有变化时通知"""
+        result = self.app_manager.rescan_app_index(verify_files)
+        if result.get("success"):
+            app_logger.info(f"应用目录索引: {result}")
+            if result.get("parsed", 0) > 0 or result.get("dirs_reused", 0) < result.get("dirs", 0):
+                self.discoverable_apps_changed.emit()
+
+    @Slot()
+    def rescan_discoverable_apps(self):
+        """重新扫描应用目录"""
+        if self.app_manager.app_indexer is not None:
+            self._index_executor.submit(self._rescan_app_index)
+
+    @Slot(str, result=list)
+    def search_discoverable_apps(self, query: str) -> List[Dict[str, Any]]:
+        """搜索尚未添加的可发现应用"""
+        return self.app_manager.discover_applications(query)
+
+    @Slot(result=bool)
+    def cleanup_missing_apps_async(self) -> bool:
+        """在后台并发检查应用路径，通过cleanup_progress报告进度，完成后发出cleanup_finished"""
+        if self._cleanup_running:
+            return False
+        self._cleanup_running = True
+        threading.Thread(target=self._sweep_missing_apps, name="CleanupMissingApps", daemon=True).start()
+        return True
+
+    def _sweep_missing_apps(self):
+        """工作线程：检查所有应用路径"""
+        try:
+            sweep = self.app_manager.sweep_missing_apps(progress=self.cleanup_progress.emit)
+        except Exception as e:
+            app_logger.error(f"检查不存在应用失败: {e}")
+            sweep = {"error": str(e)}
+        self._cleanup_swept.emit(sweep)
+
+    @Slot(dict)
+    def _on_cleanup_swept(self, sweep: dict):
+        """主线程：一次性删除不存在的应用"""
+        self._cleanup_running = False
+        if "error" in sweep:
+            result = {"success": False, "message": f"清理不存在应用失败: {sweep['error']}"}
+        else:
+            result = self.app_manager.remove_missing_apps(sweep)
+        self._report_cleanup_result(result)
+        self.cleanup_finished.emit(result)
+
+    def _report_cleanup_result(self, result: Dict[str, Any]):
+        """显示清理结果"""
+        if result["success"]:
+            if result.get("cleaned_count", 0) > 0:
+                message = f"已清理 {result['cleaned_count']} 个不存在的应用"
+            else:
+                message = "没有发现不存在的应用"
+            if result.get("timed_out_count", 0) > 0:
+                message += f"，{result['timed_out_count']} 个路径检查超时，已保留"
+            result["message"] = message
+            self.show_message.emit("成功", message, "success")
+        else:
+            self.show_message.emit("错误", result.get("message", "清理失败"), "error")
+
     @Slot(str, result='QVariantMap')
     def toggle_favorite(self, app_id: str) -> Dict[str, Any]:
         """切换收藏状态"""
@@ -14,13 +14,28 @@ Item {
     property alias radiusBg: background.radius  // 通过外部控制圆角半径
     property Item sourceItem: null
     property bool enableNoise: false  // 添加开关来控制是否启用噪声效果
+    // 预渲染的背景图片（已模糊并叠加色调和噪声），加载完成后不再每帧实时模糊
+    property url cachedSource: ""
+    readonly property bool liveBlur: __cached.status !== Image.Ready
+
+    // 预渲染背景
+    Image {
+        id: __cached
+        anchors.fill: parent
+        source: control.cachedSource
+        visible: !control.liveBlur
+        asynchronous: true
+        cache: false  // 背景按窗口尺寸生成，不需要进入全局图片缓存
+        smooth: false
+    }
 
     // 捕获背景图像
     ShaderEffectSource {
         id: __source
         anchors.fill: parent
         visible: false
-        sourceItem: control.sourceItem || parent // 如果未指定sourceItem，则使用parent作为源
+        live: control.liveBlur
+        sourceItem: control.liveBlur ? (control.sourceItem || parent) : null // 如果未指定sourceItem，则使用parent作为源
         sourceRect: Qt.rect(control.x, control.y, control.width, control.height)
         // smooth: true
         // hideSource: true
@@ -31,6 +46,7 @@ Item {
         id: __blur
         anchors.fill: parent
         source: __source
+        visible: control.liveBlur
         radius: control.radiusBlur
         samples: control.radiusBlur * 2 + 1  // 增加采样数以提高模糊质量
         transparentBorder: true
@@ -40,6 +56,7 @@ Item {
     Rectangle {
         id: background
         anchors.fill: parent
+        visible: control.liveBlur
         color: Qt.rgba(1, 1, 1, control.luminosity)
         radius: control.radiusBg  // 使用外部传入的圆角半径
         clip: true  // 确保内容被圆角裁剪
@@ -48,6 +65,7 @@ Item {
     // 颜色色调层
     Rectangle {
         anchors.fill: parent
+        visible: control.liveBlur
         color: Qt.rgba(control.colorTint.r, control.colorTint.g, control.colorTint.b, control.opacityTint)
         radius: background.radius
         clip: true  // 确保色调层也被圆角裁剪
@@ -60,11 +78,11 @@ Item {
         source: "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAACAAAAAgCAYAAABzenr0AAAAAXNSR0IArs4c6QAAAARnQU1BAACxjwv8YQUAAAAJcEhZcwAAEnQAABJ0Ad5mH3gAAAGHaVRYdFhNTDpjb20uYWRvYmUueG1wAAAAAAA8P3hwYWNrZXQgYmVnaW49J++7vycgaWQ9J1c1TTBNcENlaGlIenJlU3pOVGN6a2M5ZCc/Pg0KPHg6eG1wbWV0YSB4bWxuczp4PSJhZG9iZTpuczptZXRhLyI+PHJkZjpSREYgeG1sbnM6cmRmPSJodHRwOi8vd3d3LnczLm9yZy8xOTk5LzAyLzIyLXJkZi1zeW50YXgtbnMjIj48cmRmOkRlc2NyaXB0aW9uIHJkZjphYm91dD0idXVpZDpmYWY1YmRkNS1iYTNkLTExZGEtYWQzMS1kMzNkNzUxODJmMWIiIHhtbG5zOnRpZmY9Imh0dHA6Ly9ucy5hZG9iZS5jb20vdGlmZi8xLjAvIj48dGlmZjpPcmllbnRhdGlvbj4xPC90aWZmOk9yaWVudGF0aW9uPjwvcmRmOkRlc2NyaXB0aW9uPjwvcmRmOlJERj48L3g6eG1wbWV0YT4NCjw/eHBhY2tldCBlbmQ9J3cnPz4slJgLAAAMNElEQVRYR02XW1NTd9vGf0nYZEFMVha7JBAIYYihEQVSUQS0VpV2ppV22h48aHvUg2Y8aMfTtjNtT9vT2Zk6bUfa4QFEKZWIsgm7ECKQHZu1FpiQQAx5DnyfzHv6n//Jvbl+13Vrvv/++5zRaOSPP/7giy++wGQyMTw8TCgUoquri2QySSgUorm5mcbGRh4/fozT6cTtdvPgwQMMBgPnzp0DYHR0FEmSiEag=="  // 噪声图片的base64编码
         fillMode: Image.Tile
         opacity: control.opacityNoise
-        visible: control.enableNoise
+        visible: control.enableNoise && control.liveBlur
         clip: true  // 确保噪声层也被圆角裁剪
     }
 
-    // 将模糊效果应用到整个组件
-    layer.enabled: true
+    // 将模糊效果应用到整个组件（使用预渲染背景时不需要）
+    layer.enabled: control.liveBlur
     layer.effect: __blur
 }
\ No newline at end of file
@@ -16,8 +16,8 @@ ApplicationWindow {
     color: "transparent"  // 改为透明以支持背景效果
     flags: Qt.FramelessWindowHint | Qt.Window | Qt.WindowSystemMenuHint | Qt.WindowMinMaxButtonsHint
 
-    // 主窗口配置属性
-    property var mainWindowConfig: ({})
+    // 主窗口配置属性 - 类型化配置对象，字段变化单独通知
+    property var mainWindowConfig: mainWindowBackend ? mainWindowBackend.mainConfig : ({})
 
     // 毛玻璃效果背景层 - 放在最底层
     Item {
@@ -28,12 +28,15 @@ ApplicationWindow {
         Image {
             id: backgroundImage
             anchors.fill: parent
-            source: mainWindowConfig.background_image
+            // 后端按窗口尺寸和设备像素比提供缩放后的变体，sourceSize限制解码尺寸
+            source: mainWindowBackend ? mainWindowBackend.backgroundSource : ""
+            sourceSize: mainWindowBackend ? mainWindowBackend.backgroundSourceSize : Qt.size(0, 0)
             fillMode: Image.PreserveAspectCrop
-            visible: mainWindowConfig.background_image && mainWindowConfig.background_image !== ""
+            visible: source != ""
             clip: true
             asynchronous: true
             cache: true
+            opacity: mainGlassEffect.liveBlur ? 1.0 : 0.0  // 使用预渲染背景时不再绘制原图
             z: 0  // 确保背景图片在最底层
         }
 
@@ -53,6 +56,22 @@ ApplicationWindow {
             opacityNoise: (mainWindowConfig.opacity_noise !== undefined && mainWindowConfig.opacity_noise !== null) ? mainWindowConfig.opacity_noise : 0.02
             luminosity: (mainWindowConfig.luminosity !== undefined && mainWindowConfig.luminosity !== null) ? mainWindowConfig.luminosity : 0.1
             radiusBg: 8  // 与主窗口一致的圆角
+            // 后端在工作线程中按窗口尺寸预渲染背景，渲染完成前使用实时模糊
+            cachedSource: mainWindowBackend ? mainWindowBackend.blurredBackground : ""
+
+            // 窗口移动到不同缩放比例的屏幕时重新选择背景变体
+            property real devicePixelRatio: Screen.devicePixelRatio
+
+            onWidthChanged: updateBackgroundSize()
+            onHeightChanged: updateBackgroundSize()
+            onDevicePixelRatioChanged: updateBackgroundSize()
+            Component.onCompleted: updateBackgroundSize()
+
+            function updateBackgroundSize() {
+                if (mainWindowBackend && width > 0 && height > 0) {
+                    mainWindowBackend.set_background_size(Math.round(width), Math.round(height), Screen.devicePixelRatio)
+                }
+            }
             enableNoise: (mainWindowConfig.enable_noise !== undefined && mainWindowConfig.enable_noise !== null) ? mainWindowConfig.enable_noise : true  // 启用噪声效果以增加磨砂质感
         }
 
@@ -262,7 +281,6 @@ ApplicationWindow {
                 function onMain_window_config_updated(newConfig) {
                     console.log("【QML DEBUG】收到主窗口配置更新信号")
                     console.log("【QML DEBUG】新的配置: " + JSON.stringify(newConfig))
-                    mainWindowConfig = newConfig
                     updateMainWindowEffects()
                     
                     // 确保界面立即更新 - 更新所有毛玻璃效果组件
@@ -294,25 +312,7 @@ ApplicationWindow {
                         console.log("【QML DEBUG】更新背景颜色: " + newConfig.background_color)
                     }
                     
-                    // 如果背景图片路径发生变化，需要重新加载图片
-                    if (newConfig.background_image !== undefined) {
-                        console.log("【QML DEBUG】更新背景图片路径: " + newConfig.background_image)
-                        // 配置中的路径是相对路径，需要正确处理为file://URL
-                        var imagePath = newConfig.background_image;
-                        if (imagePath && imagePath !== "") {
-                            // 确保路径格式正确 - 如果不是file://协议，则添加协议前缀
-                            if (imagePath.startsWith("file://")) {
-                                backgroundImage.source = imagePath;
-                            } else {
-                                // 使用相对路径，转换为绝对路径
-                                backgroundImage.source = "file://" + imagePath;
-                            }
-                        } else {
-                            backgroundImage.source = "";
-                        }
-                        backgroundImage.visible = (imagePath && imagePath !== "");
-                        console.log("【QML DEBUG】背景图片可见性: " + backgroundImage.visible)
-                    }
+                    // 背景图片由backgroundImage绑定到后端提供的变体，这里无需处理
                 }
             }
 
@@ -331,9 +331,8 @@ ApplicationWindow {
             Component.onCompleted: {
                 console.log("主窗口初始化完成")
 
-                // 获取主窗口配置
-                mainWindowConfig = mainWindowBackend.get_main_window_config()
-                console.log("主窗口配置:", JSON.stringify(mainWindowConfig))
+                // 主窗口配置已绑定到后端配置对象
+                console.log("主窗口配置: 背景图片", mainWindowConfig.background_image)
 
                 // 获取初始应用列表
                 var apps = mainWindowBackend.get_applications()
@@ -344,21 +343,6 @@ ApplicationWindow {
                 
                 // 更新主窗口效果
                 updateMainWindowEffects()
-                
-                // 设置背景图片
-                if (mainWindowConfig.background_image && mainWindowConfig.background_image !== "") {
-                    var imagePath = mainWindowConfig.background_image;
-                    // 确保路径格式正确 - 如果不是file://协议，则添加协议前缀
-                    if (imagePath.startsWith("file://")) {
-                        backgroundImage.source = imagePath;
-                    } else {
-                        backgroundImage.source = "file://" + imagePath;
-                    }
-                    backgroundImage.visible = true;
-                } else {
-                    backgroundImage.source = "";
-                    backgroundImage.visible = false;
-                }
             }
             
             // 更新主窗口效果
@@ -371,21 +355,6 @@ ApplicationWindow {
                     mainWindowConfig.background_color = "#FFFFFF"
                 }
                 
-                // 更新背景图片
-                if (mainWindowConfig.background_image && mainWindowConfig.background_image !== "") {
-                    var imagePath = mainWindowConfig.background_image;
-                    // 确保路径格式正确 - 如果不是file://协议，则添加协议前缀
-                    if (imagePath.startsWith("file://")) {
-                        backgroundImage.source = imagePath;
-                    } else {
-                        backgroundImage.source = "file://" + imagePath;
-                    }
-                    backgroundImage.visible = true;
-                } else {
-                    backgroundImage.source = "";
-                    backgroundImage.visible = false;
-                }
-                
                 // 创建一个更新函数来避免重复代码
                 function updateGlassEffect(effect, config) {
                     if (config.radius_blur !== undefined && config.radius_blur !== null) {
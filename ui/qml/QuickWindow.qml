@@ -1,6 +1,7 @@
 import QtQuick
 import QtQuick.Controls
 import QtQuick.Layouts
+import QtQuick.Window
 import Qt5Compat.GraphicalEffects
 
 
@@ -13,12 +14,23 @@ ApplicationWindow {
     visible: true
     // 注意：不再直接设置窗口透明度，而是通过背景层控制
 
-    // 配置属性
-    property var config: ({})
+    // 配置属性 - 后端的类型化配置对象，每个字段单独通知，只有依赖变化字段的绑定会重新求值
+    property var config: quickWindowBackend ? quickWindowBackend.configObject : ({})
     property var apps: []
 
+    // 网格布局信息 - 由后端缓存，只在布局参数变化时更新
+    property var layoutInfo: quickWindowBackend ? quickWindowBackend.layoutInfo : ({})
+
     property int currentAppIndex: -1
     property bool labelsVisible: false
+
+    // 所在屏幕的设备像素比，变化时后端预取对应的图标变体
+    property real screenDevicePixelRatio: Screen.devicePixelRatio
+    onScreenDevicePixelRatioChanged: {
+        if (quickWindowBackend) {
+            quickWindowBackend.set_device_pixel_ratio(screenDevicePixelRatio)
+        }
+    }
     
     // 透明度属性 - 确保圆角窗口的整体透明度正确显示
     property real windowOpacity: 1.0
@@ -91,7 +103,7 @@ ApplicationWindow {
         
         // 计算最大网格尺寸
         property int maxGridWidth: {
-            var layoutInfo = quickWindowBackend ? quickWindowBackend.get_grid_layout_info() : {};
+            var layoutInfo = quickWindow.layoutInfo || {};
             var cols = layoutInfo.cols || (config.cols || 5);
             var iconSize = config.icon_size || 48;
             var spacing = config.icon_spacing || 10;
@@ -99,7 +111,7 @@ ApplicationWindow {
             return spacing + iconSize + (spacing + iconSize) * (cols - 1) + spacing;
         }
         property int maxGridHeight: {
-            var layoutInfo = quickWindowBackend ? quickWindowBackend.get_grid_layout_info() : {};
+            var layoutInfo = quickWindow.layoutInfo || {};
             var rows = layoutInfo.rows || 1;
             var iconSize = config.icon_size || 48;
             var labelHeight = labelsVisible ? 20 : 0;
@@ -113,7 +125,7 @@ ApplicationWindow {
             id: appLayoutContainer
             anchors.centerIn: parent
             width: {
-                var layoutInfo = quickWindowBackend ? quickWindowBackend.get_grid_layout_info() : {};
+                var layoutInfo = quickWindow.layoutInfo || {};
                 var cols = layoutInfo.cols || (config.cols || 5);
                 var iconSize = config.icon_size || 48;
                 var spacing = 5; // 间隙固定为5
@@ -122,7 +134,7 @@ ApplicationWindow {
                 return margin + iconSize + (spacing + iconSize) * (cols - 1) + margin;
             }
             height: {
-                var layoutInfo = quickWindowBackend ? quickWindowBackend.get_grid_layout_info() : {};
+                var layoutInfo = quickWindow.layoutInfo || {};
                 var rows = layoutInfo.rows || 1;
                 var iconSize = config.icon_size || 48;
                 var labelHeight = labelsVisible ? 20 : 0;
@@ -135,129 +147,21 @@ ApplicationWindow {
             // 动态创建应用图标项
             Repeater {
                 id: appRepeater
-                model: {
-                    if (quickWindowBackend) {
-                        var allApps = quickWindowBackend.get_apps();
-                        var appOrder = config.app_order || [];
-                        // 根据配置的app_order排序并限制数量
-                        var orderedApps = [];
-                        for (var i = 0; i < appOrder.length; i++) {
-                            for (var j = 0; j < allApps.length; j++) {
-                                if (allApps[j].id === appOrder[i]) {
-                                    orderedApps.push(allApps[j]);
-                                    break;
-                                }
-                            }
-                        }
-                        
-                        // 获取配置的行数和列数
-                        var rows = config.rows || 1;
-                        var cols = config.cols || 5;
-                        var maxApps = rows * cols;
-                        
-                        // 应用数量限制：只显示前n×m个应用
-                        if (orderedApps.length > maxApps) {
-                            console.log("应用数量超出限制，只显示前", maxApps, "个应用")
-                            orderedApps = orderedApps.slice(0, maxApps);
-                        }
-                        
-                        return orderedApps;
-                    } else if (mainWindowBackend) {
-                        var allApps = mainWindowBackend.get_applications();
-                        var appOrder = config.app_order || [];
-                        // 根据配置的app_order排序并限制数量
-                        var orderedApps = [];
-                        for (var i = 0; i < appOrder.length; i++) {
-                            for (var j = 0; j < allApps.length; j++) {
-                                if (allApps[j].id === appOrder[i]) {
-                                    orderedApps.push(allApps[j]);
-                                    break;
-                                }
-                            }
-                        }
-                        
-                        // 获取配置的行数和列数
-                        var rows = config.rows || 1;
-                        var cols = config.cols || 5;
-                        var maxApps = rows * cols;
-                        
-                        // 应用数量限制：只显示前n×m个应用
-                        if (orderedApps.length > maxApps) {
-                            console.log("应用数量超出限制，只显示前", maxApps, "个应用")
-                            orderedApps = orderedApps.slice(0, maxApps);
-                        }
-                        
-                        return orderedApps;
-                    }
-                    return [];
-                }
+                // 后端提供已排序、已截断到 行数×列数（分页时为当前页）的可见应用模型
+                model: quickWindowBackend ? quickWindowBackend.quickAppsModel : []
                 
                 Item {
                     id: gridItem
                     width: config.icon_size || 48
                     height: (config.icon_size || 48) + (labelsVisible ? 20 : 0)
                     
-                    // 获取网格布局信息
-                    property var layoutInfo: quickWindowBackend ? quickWindowBackend.get_grid_layout_info() : {}
-                    
-                    // 从布局信息中获取当前应用的行和列
-                    property var appPosition: (layoutInfo.app_positions && index < layoutInfo.app_positions.length) ? 
-                                             layoutInfo.app_positions[index] : {row: 0, col: 0};
-                    property int currentRow: appPosition.row || 0;
-                    property int currentCol: appPosition.col || 0;
-                    
-                    // 确定当前项是否在特殊行（顶部位置的最后一行或底部位置的第一行）
-                    property bool isSpecialRow: {
-                        if (layoutInfo.special_row_info && Object.keys(layoutInfo.special_row_info).length > 0) {
-                            if (config.position === "top_center") {
-                                // 顶部位置：最后一行需要居中
-                                return currentRow === layoutInfo.special_row_info.special_row;
-                            } else if (config.position === "bottom_center") {
-                                // 底部位置：第一行需要居中
-                                return currentRow === layoutInfo.special_row_info.special_row;
-                            }
-                        }
-                        return false;
-                    }
-                    
-                    // 计算特殊行的居中偏移
-                    property real centerOffset: {
-                        if (!isSpecialRow || !layoutInfo.special_row_info) {
-                            return 0;  // 不是特殊行，无需偏移
-                        }
-                        
-                        var itemsInSpecialRow = layoutInfo.special_row_info.apps_in_special_row || 0;
-                        var totalCells = layoutInfo.special_row_info.items_per_row || (config.cols || 5);
-                        var occupiedCells = itemsInSpecialRow;
-                        var cellWidth = (config.icon_size || 48) + 5; // 图标大小+间隙
-                        var offset = (totalCells - occupiedCells) * cellWidth / 2;
-                        return offset;
-                    }
-                    
+                    // 行列和像素偏移（含特殊行的居中偏移）由后端预先计算，作为模型角色提供
+                    property int currentRow: model.gridRow
+                    property int currentCol: model.gridCol
+
                     // 计算位置
-                    x: {
-                        var iconSize = config.icon_size || 48;
-                        var spacing = 5; // 间隙固定为5
-                        var margin = config.icon_spacing || 10; // 边距
-                        
-                        if (isSpecialRow) {
-                            // 特殊行需要居中偏移
-                            var baseX = margin + (currentCol * (iconSize + spacing)) + centerOffset;
-                            return baseX;
-                        } else {
-                            // 普通行正常计算位置
-                            return margin + (currentCol * (iconSize + spacing));
-                        }
-                    }
-                    y: {
-                        var iconSize = config.icon_size || 48;
-                        var labelHeight = labelsVisible ? 20 : 0;
-                        var spacing = 5; // 间隙固定为5
-                        var margin = config.icon_spacing || 10; // 边距
-                        
-                        // 计算行位置
-                        return margin + (currentRow * (iconSize + labelHeight + spacing));
-                    }
+                    x: model.cellX
+                    y: model.cellY
                     
                     // 应用图标容器
                     Rectangle {
@@ -269,16 +173,40 @@ ApplicationWindow {
                         color: "#00000000"  // 完全透明，但保持容器结构
                         radius: 8
                         
-                        // 应用图标
-                        Image {
+                        // 附带屏幕的设备像素比，窗口移到不同缩放比例的屏幕时使用对应的缓存变体
+                        property string iconSource: model.iconPath ? model.iconPath : ("image://icon/" + encodeURIComponent(model.path) + "?dpr=" + Screen.devicePixelRatio)
+                        property real hoverScale: (config.hover_scale !== undefined && config.hover_scale !== null) ? config.hover_scale : 1.2
+
+                        // 应用图标：静止尺寸和悬停尺寸两个变体在创建时一起加载（后端已预取），
+                        // 悬停时只切换显示的纹理，不再请求图标提供者
+                        Item {
                             id: iconImage
                             anchors.centerIn: parent
                             width: parent.width * 0.9
                             height: parent.width * 0.9
-                            source: modelData.icon_path ? modelData.icon_path : ("image://icon/" + encodeURIComponent(modelData.path))
-                            fillMode: Image.PreserveAspectFit
-                            sourceSize.width: config.icon_size || 48
-                            sourceSize.height: config.icon_size || 48
+
+                            Image {
+                                id: baseIcon
+                                anchors.fill: parent
+                                source: iconContainer.iconSource
+                                fillMode: Image.PreserveAspectFit
+                                asynchronous: true
+                                sourceSize.width: config.icon_size || 48
+                                sourceSize.height: config.icon_size || 48
+                                visible: !hoverIcon.visible
+                            }
+
+                            Image {
+                                id: hoverIcon
+                                anchors.fill: parent
+                                source: iconContainer.hoverScale > 1.0 ? iconContainer.iconSource : ""
+                                fillMode: Image.PreserveAspectFit
+                                asynchronous: true
+                                smooth: true
+                                sourceSize.width: Math.round((config.icon_size || 48) * iconContainer.hoverScale)
+                                sourceSize.height: Math.round((config.icon_size || 48) * iconContainer.hoverScale)
+                                visible: iconImage.scale > 1.0 && status === Image.Ready
+                            }
 
                             // 悬停放大效果
                             scale: 1.0
@@ -298,12 +226,8 @@ ApplicationWindow {
                             cursorShape: Qt.PointingHandCursor
 
                             onEntered: {
-                                // 确保配置已加载并应用悬停放大效果
-                                if (config.hover_scale !== undefined && config.hover_scale !== null) {
-                                    iconImage.scale = config.hover_scale
-                                } else {
-                                    iconImage.scale = 1.2  // 默认放大比例
-                                }
+                                // 应用悬停放大效果（未配置时默认放大1.2倍）
+                                iconImage.scale = iconContainer.hoverScale
                                 currentAppIndex = index
                             }
 
@@ -325,7 +249,7 @@ ApplicationWindow {
                             top: iconContainer.bottom
                             horizontalCenter: iconContainer.horizontalCenter
                         }
-                        text: modelData.name
+                        text: model.name
                         color: "white"
                         font.pixelSize: 10
                         font.bold: true
@@ -394,12 +318,42 @@ ApplicationWindow {
         enabled: quickWindow.visible
         propagateComposedEvents: true
         z: 3  // 确保鼠标区域在所有内容之上
+
+        // 分页模式下滚轮翻页，只替换模型中的一页应用，委托数量不随应用总数增长
+        onWheel: (wheel) => {
+            if (!quickWindowBackend || !config.paged || quickWindowBackend.pageCount <= 1) {
+                wheel.accepted = false
+                return
+            }
+            if (wheel.angleDelta.y < 0 || wheel.angleDelta.x < 0) {
+                quickWindowBackend.next_page()
+            } else if (wheel.angleDelta.y > 0 || wheel.angleDelta.x > 0) {
+                quickWindowBackend.previous_page()
+            }
+        }
+    }
+
+    // 分页指示
+    Text {
+        visible: config.paged === true && quickWindowBackend && quickWindowBackend.pageCount > 1
+        text: quickWindowBackend ? (quickWindowBackend.currentPage + 1) + "/" + quickWindowBackend.pageCount : ""
+        color: "#888888"
+        font.pixelSize: 10
+        anchors.right: parent.right
+        anchors.bottom: parent.bottom
+        anchors.rightMargin: 6
+        anchors.bottomMargin: 2
+        z: 4
     }
 
     // 初始化应用列表
     Component.onCompleted: {
         console.log("QuickWindow初始化完成")
 
+        if (quickWindowBackend) {
+            quickWindowBackend.set_device_pixel_ratio(screenDevicePixelRatio)
+        }
+
         // 加载配置
         loadConfig()
 
@@ -443,13 +397,12 @@ ApplicationWindow {
 
     // 加载配置
     function loadConfig() {
-        if (quickWindowBackend) {
-            config = quickWindowBackend.get_config()
-        } else if (mainWindowBackend) {
+        // 有快捷窗口后端时config直接绑定到配置对象，无需重新获取
+        if (!quickWindowBackend && mainWindowBackend) {
             config = mainWindowBackend.get_quick_window_config()
         }
 
-        console.log("快捷窗口配置:", JSON.stringify(config))
+        console.log("快捷窗口配置: 行数", config.rows, "列数", config.cols, "位置", config.position)
 
         // 确保配置值有效
         if (config.opacity === undefined || config.opacity === null) {
@@ -525,7 +478,9 @@ ApplicationWindow {
     // 加载应用列表
     function loadApps() {
         if (quickWindowBackend) {
-            apps = quickWindowBackend.get_apps()
+            // 可见应用由后端模型提供，只需更新窗口大小
+            updateWindowSize()
+            return
         } else if (mainWindowBackend) {
             apps = mainWindowBackend.get_applications()
         }
@@ -565,7 +520,7 @@ ApplicationWindow {
     function updateWindowSize() {
         // 从后端获取网格布局信息
         if (quickWindowBackend) {
-            var layoutInfo = quickWindowBackend.get_grid_layout_info()
+            var layoutInfo = quickWindowBackend.layoutInfo
             
             if (layoutInfo && layoutInfo.width && layoutInfo.height) {
                 quickWindow.width = layoutInfo.width
@@ -695,7 +650,7 @@ ApplicationWindow {
     function launchApp(index) {
         var appOrder = config.app_order || [];
         if (index >= 0 && index < appOrder.length) {
-            var appId = appOrder[index];
+            var appId = quickWindowBackend ? quickWindowBackend.quickAppsModel.app_id_at(index) : appOrder[index];
             
             if (quickWindowBackend) {
                 // 直接使用应用ID启动，而不是使用索引
@@ -734,9 +689,9 @@ ApplicationWindow {
     Connections {
         target: quickWindowBackend ? quickWindowBackend : null
 
-        function onConfig_updated(newConfig) {
-            console.log("收到配置更新信号")
-            config = newConfig
+        function onConfig_updated(newConfig, changedKeys) {
+            // config绑定到后端配置对象，发出信号前已同步，无需重新赋值
+            console.log("收到配置更新信号，变化项:", changedKeys)
 
             // 确保配置值有效
             if (config.opacity === undefined || config.opacity === null) {
@@ -790,6 +745,18 @@ ApplicationWindow {
             // 立即更新边框颜色
             borderRect.border.color = Qt.darker(config.background_color, 1.2)
 
+            // 只有影响布局的配置变化时才重新计算窗口尺寸和位置
+            var layoutKeys = ["app_order", "auto_order", "rows", "cols", "position", "icon_size", "icon_spacing", "show_labels"]
+            var layoutChanged = !changedKeys || changedKeys.length === 0
+            for (var i = 0; !layoutChanged && i < changedKeys.length; i++) {
+                if (layoutKeys.indexOf(changedKeys[i]) >= 0) {
+                    layoutChanged = true
+                }
+            }
+            if (!layoutChanged) {
+                return
+            }
+
             // 更新窗口大小
             updateWindowSize()
 
@@ -802,9 +769,8 @@ ApplicationWindow {
             loadApps()
         }
 
-        function onApps_changed(newApps) {
+        function onApps_changed() {
             console.log("收到应用列表更新信号")
-            apps = newApps
             loadApps()
         }
 
@@ -829,6 +795,10 @@ ApplicationWindow {
 
         function onConfig_updated(newConfig) {
             console.log("收到配置更新信号（主窗口）")
+            if (quickWindowBackend) {
+                // 已绑定到快捷窗口后端的配置对象
+                return
+            }
             config = newConfig
 
             // 确保配置值有效
@@ -8,6 +8,9 @@ Item {
     id: appManagementRoot
     anchors.fill: parent
 
+    // 应用列表由后端异步搜索分块填充
+    property var appModel: mainWindowBackend.searchModel
+
     // 应用信息编辑对话框
     Dialog {
         id: editDialog
@@ -414,24 +417,39 @@ Item {
 
             ListView {
                 id: appListView
+                objectName: "appListView"
                 anchors.fill: parent
                 anchors.margins: 2
                 clip: true
 
-                model: ListModel { id: appModel }
+                model: appModel
+
+                // 虚拟化：只创建可见区域及上下缓冲区内的委托，滚出的委托回收复用
+                reuseItems: true
+                cacheBuffer: 280
 
                 // 存储选中的应用
                 property ListModel selectedApps: ListModel {}
                 property string currentAppId: ""
 
+                // 选中状态以selectedApps为准，委托被复用后仍能显示正确的状态
+                function isAppSelected(appId) {
+                    for (var i = 0; i < selectedApps.count; i++) {
+                        if (selectedApps.get(i).id === appId) {
+                            return true
+                        }
+                    }
+                    return false
+                }
+
                 delegate: Rectangle {
                     id: appDelegate
                     width: ListView.view.width-appListScrollbar.width
                     height: 70
                     color: isSelected ? "#094771" : (index % 2 ? "#F0F0F0" : "#E0E0E0")
 
-                    // 选中效果
-                    property bool isSelected: false
+                    // 选中效果（selectedApps.count变化时重新求值）
+                    property bool isSelected: appListView.selectedApps.count > 0 && appListView.isAppSelected(model.id)
 
                     Rectangle {
                         anchors.fill: parent
@@ -454,6 +472,7 @@ Item {
                             fillMode: Image.PreserveAspectFit
                             sourceSize.width: 48
                             sourceSize.height: 48
+                            asynchronous: true
 
                             onStatusChanged: {
                                 if (status === Image.Error) {
@@ -541,9 +560,7 @@ Item {
 
                     // 选择/取消选择函数
                     function toggleSelection() {
-                        isSelected = !isSelected
-
-                        if (isSelected) {
+                        if (!isSelected) {
                             // 添加到选中列表
                             appListView.selectedApps.append({
                                 id: model.id,
@@ -563,18 +580,7 @@ Item {
                     }
 
                     function clearSelections() {
-                        // 清空所有选择
-                        for (var i = 0; i < appListView.selectedApps.count; i++) {
-                            var appId = appListView.selectedApps.get(i).id
-                            // 找到对应的delegate并取消选择
-                            for (var j = 0; j < appListView.contentItem.children.length; j++) {
-                                var child = appListView.contentItem.children[j]
-                                if (child.model && child.model.id === appId) {
-                                    child.isSelected = false
-                                    break
-                                }
-                            }
-                        }
+                        // 清空所有选择，委托的isSelected绑定会自动更新
                         appListView.selectedApps.clear()
                     }
                 }
@@ -750,52 +756,17 @@ Item {
         }
     }
 
-    // 刷新应用列表函数
+    // 刷新应用列表函数：在后台搜索，结果分块到达appModel，输入过快时旧的搜索被取消
     function refreshAppList() {
-        try {
-            var query = searchInput.text
-            var apps
-
-            if (query) {
-                apps = mainWindowBackend.search_applications(query)
-            } else {
-                apps = mainWindowBackend.get_applications()
-            }
-
-            console.log("刷新应用列表，数量:", apps.length)
-
-            // 保存当前选中状态
-            var selectedIds = []
-            for (var i = 0; i < appListView.selectedApps.count; i++) {
-                selectedIds.push(appListView.selectedApps.get(i).id)
-            }
+        mainWindowBackend.start_search(searchInput.text)
+    }
 
-            // 清空并重新填充模型
-            appModel.clear()
-            for (var i = 0; i < apps.length; i++) {
-                var app = apps[i]
-                // 确保每个应用都有必需的字段
-                if (!app.icon_path) {
-                    app.icon_path = "image://icon/" + encodeURIComponent(app.path)
-                }
-                appModel.append(app)
+    // 搜索完成后只保留仍在结果中的选中项
+    function pruneSelections() {
+        for (var i = appListView.selectedApps.count - 1; i >= 0; i--) {
+            if (appModel.index_of(appListView.selectedApps.get(i).id) < 0) {
+                appListView.selectedApps.remove(i)
             }
-
-            // 恢复选中状态
-            appListView.selectedApps.clear()
-            for (var j = 0; j < selectedIds.length; j++) {
-                for (var k = 0; k < appModel.count; k++) {
-                    if (appModel.get(k).id === selectedIds[j]) {
-                        appListView.selectedApps.append(appModel.get(k))
-                        break
-                    }
-                }
-            }
-
-        } catch (e) {
-            console.log("刷新应用列表时出错:", e)
-            // 使用正确的信号方法
-            mainWindowBackend.show_message("错误", "刷新应用列表失败: " + e, "error")
         }
     }
 
@@ -884,6 +855,13 @@ Item {
         function onShow_message(title, message, type) {
             console.log("显示消息:", title, message, type)
         }
+
+        function onSearch_results_changed(query, count, finished) {
+            if (finished) {
+                console.log("刷新应用列表，数量:", count)
+                pruneSelections()
+            }
+        }
     }
 
     // 初始化应用列表
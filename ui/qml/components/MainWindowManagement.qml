@@ -70,28 +70,8 @@ Item {
                 console.log("【QML DEBUG】处理后的图片路径: " + imagePath)
                 console.log("【QML DEBUG】当前配置: " + JSON.stringify(mainWindowConfig))
                 
-                var result = mainWindowBackend.upload_background_image(imagePath)
-                
-                console.log("【QML DEBUG】上传结果: " + JSON.stringify(result))
-                
-                if (result.success) {
-                    // 背景图片路径已在Python后端更新并发出配置更新信号
-                    backgroundImageLabel.text = result.path
-                    // 同时更新本地mainWindowConfig属性，以便保存配置时使用正确的值
-                    if (mainWindowConfig === undefined || mainWindowConfig === null) {
-                        mainWindowConfig = {};
-                    }
-                    mainWindowConfig.background_image = result.path;
-                    mainWindowBackend.showMessage("成功", result.message, "success")
-                    console.log("【QML DEBUG】背景图片上传并设置成功: " + result.path)
-                    
-                    // 发出配置更新信号以确保界面同步
-                    console.log("【QML DEBUG】发出配置更新信号...")
-                    // 注意：配置更新信号由Python后端自动发出，不需要在此处手动发出
-                } else {
-                    mainWindowBackend.showMessage("错误", result.message, "error")
-                    console.log("【QML DEBUG】背景图片上传失败: " + result.message)
-                }
+                // 在后端工作线程中处理，完成后通过background_upload_finished信号返回结果
+                mainWindowBackend.upload_background_image_async(imagePath)
             } catch (error) {
                 console.error("【QML DEBUG】上传背景图片时发生错误: " + error)
                 console.error("【QML DEBUG】错误堆栈: " + error.stack)
@@ -153,33 +133,8 @@ Item {
                 mainWindowConfig = mainWindowBackend.get_main_window_config()
                 console.log("【QML DEBUG】当前配置: " + JSON.stringify(mainWindowConfig))
                 
-                // 根据后端是否支持update_background_image方法来调用
-                var result;
-                if (typeof mainWindowBackend.update_background_image === 'function') {
-                    result = mainWindowBackend.update_background_image(imagePath)
-                } else {
-                    result = mainWindowBackend.upload_background_image(imagePath)
-                }
-                
-                console.log("【QML DEBUG】更新结果: " + JSON.stringify(result))
-                
-                if (result.success) {
-                    // 背景图片路径已在Python后端更新并发出配置更新信号
-                    backgroundImageLabel.text = result.path
-                    // 同时更新本地mainWindowConfig属性，以便保存配置时使用正确的值
-                    if (mainWindowConfig === undefined || mainWindowConfig === null) {
-                        mainWindowConfig = {};
-                    }
-                    mainWindowConfig.background_image = result.path;
-                    mainWindowBackend.showMessage("成功", result.message, "success")
-                    console.log("【QML DEBUG】背景图片更新并设置成功: " + result.path)
-                    
-                    // 发出配置更新信号以确保界面同步
-                    console.log("【QML DEBUG】发出配置更新信号...")
-                } else {
-                    mainWindowBackend.showMessage("错误", result.message, "error")
-                    console.log("【QML DEBUG】背景图片更新失败: " + result.message)
-                }
+                // 在后端工作线程中处理，完成后通过background_upload_finished信号返回结果
+                mainWindowBackend.upload_background_image_async(imagePath)
             } catch (error) {
                 console.error("【QML DEBUG】更新背景图片时发生错误: " + error)
                 console.error("【QML DEBUG】错误堆栈: " + error.stack)
@@ -252,6 +207,10 @@ Item {
                             anchors.fill: parent
                             anchors.margins: 1
                             source: mainWindowConfig.background_image ? "file://" + mainWindowConfig.background_image : ""
+                            // 预览只需按缩略图尺寸解码
+                            sourceSize.width: width * 2
+                            sourceSize.height: height * 2
+                            asynchronous: true
                             fillMode: Image.PreserveAspectCrop
                             clip: true
                             visible: mainWindowConfig.background_image && mainWindowConfig.background_image !== ""
@@ -738,6 +697,30 @@ Item {
                     }
                 }
 
+                // 预渲染背景开关（关闭后每帧实时模糊）
+                RowLayout {
+                    spacing: 10
+
+                    Text {
+                        text: "预渲染背景:"
+                        Layout.minimumWidth: 80
+                        color: "#000"
+                    }
+
+                    Switch {
+                        id: staticBackgroundSwitch
+                        checked: true
+
+                        onCheckedChanged: {
+                            mainWindowBackend.update_main_window_config("static_background", checked)
+                        }
+                    }
+
+                    Item {
+                        Layout.fillWidth: true
+                    }
+                }
+
                 // 重置和保存按钮
                 RowLayout {
                     spacing: 10
@@ -869,6 +852,9 @@ Item {
             } else {
                 enableNoiseSwitch.checked = true  // 默认值
             }
+            if (mainWindowConfig.static_background !== undefined && mainWindowConfig.static_background !== null) {
+                staticBackgroundSwitch.checked = mainWindowConfig.static_background
+            }
         } catch (error) {
             console.error("加载配置失败: " + error)
             console.error("错误堆栈: " + error.stack)
@@ -876,6 +862,18 @@ Item {
         }
     }
 
+    // 处理异步上传背景图片的结果
+    function handleBackgroundUploadResult(result) {
+        console.log("【QML DEBUG】上传结果: " + JSON.stringify(result))
+        if (result.success) {
+            // 背景图片路径已在Python后端更新并发出配置更新信号
+            backgroundImageLabel.text = result.path
+            mainWindowBackend.showMessage("成功", result.message, "success")
+        } else {
+            mainWindowBackend.showMessage("错误", result.message, "error")
+        }
+    }
+
     // 保存所有配置
     function saveAllConfig() {
         // 保存当前配置
@@ -887,6 +885,7 @@ Item {
         mainWindowBackend.update_main_window_config("background_color", mainWindowConfig.background_color || "#FFFFFF")
         mainWindowBackend.update_main_window_config("luminosity", parseFloat(luminositySlider.value))
         mainWindowBackend.update_main_window_config("enable_noise", enableNoiseSwitch.checked)
+        mainWindowBackend.update_main_window_config("static_background", staticBackgroundSwitch.checked)
 
         mainWindowBackend.showMessage("成功", "所有配置已保存", "success")
     }
@@ -900,6 +899,7 @@ Item {
         opacityNoiseSlider.value = 0.02
         luminositySlider.value = 0.1
         enableNoiseSwitch.checked = true
+        staticBackgroundSwitch.checked = true
 
         // 重置配置
         var defaultConfig = {
@@ -910,6 +910,7 @@ Item {
             opacity_noise: 0.02,
             luminosity: 0.1,
             enable_noise: true,
+            static_background: true,
             background_color: "#FFFFFF"
         }
 
@@ -925,6 +926,10 @@ Item {
     Connections {
         target: mainWindowBackend
 
+        function onBackground_upload_finished(result) {
+            handleBackgroundUploadResult(result)
+        }
+
         function onMain_window_config_updated(newConfig) {
             console.log("收到主窗口配置更新信号")
             mainWindowConfig = newConfig
@@ -204,6 +204,98 @@ Item {
                         }
                     }
 
+                    // 按使用频率自动排序
+                    ColumnLayout {
+                        spacing: 5
+
+                        Text {
+                            text: "自动排序"
+                            color: "#000"
+                            font.pixelSize: 12
+                        }
+
+                        Rectangle {
+                            id: autoOrderCheckbox
+                            width: 40
+                            height: 20
+                            radius: 10
+                            color: autoOrderCheckbox.checked ? "#4CAF50" : "#666"
+
+                            property bool checked: false
+
+                            Rectangle {
+                                id: autoOrderHandle
+                                width: 16
+                                height: 16
+                                radius: 8
+                                color: "white"
+                                anchors.verticalCenter: parent.verticalCenter
+                                x: autoOrderCheckbox.checked ? parent.width - width - 2 : 2
+
+                                Behavior on x {
+                                    NumberAnimation {
+                                        duration: 200
+                                    }
+                                }
+                            }
+
+                            MouseArea {
+                                anchors.fill: parent
+                                onClicked: {
+                                    autoOrderCheckbox.checked = !autoOrderCheckbox.checked
+                                    mainWindowBackend.update_quick_window_config("auto_order", autoOrderCheckbox.checked)
+                                }
+                                cursorShape: Qt.PointingHandCursor
+                            }
+                        }
+                    }
+
+                    // 分页显示，应用数量超过 行数×列数 时滚轮翻页
+                    ColumnLayout {
+                        spacing: 5
+
+                        Text {
+                            text: "分页显示"
+                            color: "#000"
+                            font.pixelSize: 12
+                        }
+
+                        Rectangle {
+                            id: pagedCheckbox
+                            width: 40
+                            height: 20
+                            radius: 10
+                            color: pagedCheckbox.checked ? "#4CAF50" : "#666"
+
+                            property bool checked: false
+
+                            Rectangle {
+                                id: pagedHandle
+                                width: 16
+                                height: 16
+                                radius: 8
+                                color: "white"
+                                anchors.verticalCenter: parent.verticalCenter
+                                x: pagedCheckbox.checked ? parent.width - width - 2 : 2
+
+                                Behavior on x {
+                                    NumberAnimation {
+                                        duration: 200
+                                    }
+                                }
+                            }
+
+                            MouseArea {
+                                anchors.fill: parent
+                                onClicked: {
+                                    pagedCheckbox.checked = !pagedCheckbox.checked
+                                    mainWindowBackend.update_quick_window_config("paged", pagedCheckbox.checked)
+                                }
+                                cursorShape: Qt.PointingHandCursor
+                            }
+                        }
+                    }
+
                     Item {
                         Layout.fillWidth: true
                     }
@@ -769,6 +861,10 @@ Item {
                                     id: allAppsModel
                                 }
 
+                                // 虚拟化：只创建可见行及上下两行缓冲内的委托，滚出的委托回收复用
+                                reuseItems: true
+                                cacheBuffer: 120
+
                                 // 启用拖拽（虽然主要用于右侧，但为了保持一致性设置）
                                 interactive: true
 
@@ -791,6 +887,7 @@ Item {
                                             fillMode: Image.PreserveAspectFit
                                             sourceSize.width: 48
                                             sourceSize.height: 48
+                                            asynchronous: true
                                             anchors.verticalCenter: parent.verticalCenter
                                         }
                                     }
@@ -976,6 +1073,9 @@ Item {
                                         id: quickAppsModel
                                     }
 
+                                    // 只预先创建可见区域左右各两个图标，拖拽中的委托不参与回收
+                                    cacheBuffer: 116
+
                                     // 启用拖拽功能
                                     interactive: true
 
@@ -1007,6 +1107,7 @@ Item {
                                                 fillMode: Image.PreserveAspectFit
                                                 sourceSize.width: 48
                                                 sourceSize.height: 48
+                                                asynchronous: true
                                                 anchors.horizontalCenter: parent.horizontalCenter
                                             }
 
@@ -1372,6 +1473,12 @@ Item {
         if (config.show_labels !== undefined) {
             showLabelsCheckbox.checked = config.show_labels
         }
+        if (config.auto_order !== undefined) {
+            autoOrderCheckbox.checked = config.auto_order
+        }
+        if (config.paged !== undefined) {
+            pagedCheckbox.checked = config.paged
+        }
         if (config.position !== undefined) {
             positionSelector.currentIndex = config.position === "top_center" ? 0 : 1
         }
@@ -1488,6 +1595,8 @@ Item {
         mainWindowBackend.update_quick_window_config("auto_start", Boolean(autoStartCheckbox.checked))
         mainWindowBackend.update_quick_window_config("show_on_startup", Boolean(showOnStartupCheckbox.checked))
         mainWindowBackend.update_quick_window_config("show_labels", Boolean(showLabelsCheckbox.checked))
+        mainWindowBackend.update_quick_window_config("auto_order", Boolean(autoOrderCheckbox.checked))
+        mainWindowBackend.update_quick_window_config("paged", Boolean(pagedCheckbox.checked))
         mainWindowBackend.update_quick_window_config("position", positionSelector.currentIndex === 0 ? "top_center" : "bottom_center")
         mainWindowBackend.update_quick_window_config("opacity_noise", parseFloat(opacityNoiseSlider.value))
         mainWindowBackend.update_quick_window_config("opacity_tint", parseFloat(opacityTintSlider.value))
@@ -1508,6 +1617,8 @@ Item {
         autoStartCheckbox.checked = false
         showOnStartupCheckbox.checked = true
         showLabelsCheckbox.checked = false
+        autoOrderCheckbox.checked = false
+        pagedCheckbox.checked = false
         positionSelector.currentIndex = 1
         opacityNoiseSlider.value = 0.01
         opacityTintSlider.value = 0.15
@@ -1518,6 +1629,8 @@ Item {
             auto_start: false,
             show_on_startup:true,
             show_labels: false,
+            auto_order: false,
+            paged: false,
             position: "bottom_center",
             size: 64,
             opacity: 0.25,
@@ -0,0 +1,170 @@
+"""
+快捷窗口应用列表模型
+只包含快捷窗口中实际显示的应用（已排序并截断到行数×列数），增量更新；
+每个应用的行、列和像素偏移来自窗口算法生成的位置表，作为模型角色提供给委托
+"""
+
+from typing import List, Dict, Any
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal, Slot, Property, QByteArray
+from core.window_algorithm import PositionTable
+
+# 图标提供者地址前缀，应用管理器为没有自定义图标的应用填入的默认值
+ICON_PROVIDER_PREFIX = "image://icon/"
+
+
+def custom_icon_path(app: Dict[str, Any]) -> str:
+    """应用的自定义图标，默认的图标提供者地址视为没有自定义图标"""
+    icon_path = app.get('icon_path') or ''
+    if icon_path.startswith(ICON_PROVIDER_PREFIX):
+        return ''
+    return icon_path
+
+
+class QuickAppListModel(QAbstractListModel):
+    """快捷窗口可见应用模型"""
+
+    AppIdRole = Qt.UserRole + 1
+    NameRole = Qt.UserRole + 2
+    PathRole = Qt.UserRole + 3
+    IconPathRole = Qt.UserRole + 4
+    ExistsRole = Qt.UserRole + 5
+    GridRowRole = Qt.UserRole + 6
+    GridColRole = Qt.UserRole + 7
+    CellXRole = Qt.UserRole + 8
+    CellYRole = Qt.UserRole + 9
+
+    # 角色 -> 应用字典中的字段
+    _ROLE_FIELDS = {
+        AppIdRole: 'id',
+        NameRole: 'name',
+        PathRole: 'path',
+        IconPathRole: 'icon_path',
+        ExistsRole: 'exists',
+    }
+
+    # 角色 -> 位置表中的列
+    _POSITION_COLUMNS = {
+        GridRowRole: 'rows',
+        GridColRole: 'cols',
+        CellXRole: 'xs',
+        CellYRole: 'ys',
+    }
+
+    count_changed = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._apps: List[Dict[str, Any]] = []
+        self._positions = PositionTable()
+
+    def roleNames(self):
+        return {
+            self.AppIdRole: QByteArray(b"appId"),
+            self.NameRole: QByteArray(b"name"),
+            self.PathRole: QByteArray(b"path"),
+            self.IconPathRole: QByteArray(b"iconPath"),
+            self.ExistsRole: QByteArray(b"exists"),
+            self.GridRowRole: QByteArray(b"gridRow"),
+            self.GridColRole: QByteArray(b"gridCol"),
+            self.CellXRole: QByteArray(b"cellX"),
+            self.CellYRole: QByteArray(b"cellY"),
+        }
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._apps)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._apps):
+            return None
+
+        row = index.row()
+        column = self._POSITION_COLUMNS.get(role)
+        if column is not None:
+            values = getattr(self._positions, column)
+            return int(values[row]) if row < len(values) else 0
+
+        app = self._apps[row]
+        if role == Qt.DisplayRole:
+            return app.get('name', '')
+        if role == self.IconPathRole:
+            # 只返回自定义图标，其余由QML编码路径并按屏幕设备像素比拼接图标提供者地址
+            return custom_icon_path(app)
+        field = self._ROLE_FIELDS.get(role)
+        if field is not None:
+            return app.get(field)
+        return None
+
+    def set_apps(self, apps: List[Dict[str, Any]]):
+        """增量替换应用列表，只通知实际变化的部分"""
+        old_apps = self._apps
+        old_ids = [app.get('id') for app in old_apps]
+        new_ids = [app.get('id') for app in apps]
+        old_count = len(old_ids)
+        new_count = len(new_ids)
+
+        # 公共前缀和公共后缀保持不变，只替换中间变化的部分
+        prefix = 0
+        limit = min(old_count, new_count)
+        while prefix < limit and old_ids[prefix] == new_ids[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix
+               and old_ids[old_count - 1 - suffix] == new_ids[new_count - 1 - suffix]):
+            suffix += 1
+
+        old_end = old_count - suffix
+        new_end = new_count - suffix
+        replaced_in_place = old_end - prefix == 1 and new_end - prefix == 1
+
+        if replaced_in_place:
+            # 同一位置替换为另一个应用，作为数据变化处理
+            self._apps = list(apps)
+        else:
+            if old_end > prefix:
+                self.beginRemoveRows(QModelIndex(), prefix, old_end - 1)
+                self._apps = old_apps[:prefix] + old_apps[old_end:]
+                self.endRemoveRows()
+            if new_end > prefix:
+                self.beginInsertRows(QModelIndex(), prefix, new_end - 1)
+                self._apps = list(apps)
+                self.endInsertRows()
+            self._apps = list(apps)
+
+        # 位置未变的应用如果内容有变化（如名称、图标），通知数据变化
+        changed_rows = [row for row in range(prefix) if old_apps[row] != apps[row]]
+        changed_rows.extend(
+            row for row in range(new_end, new_count)
+            if old_apps[row - new_end + old_end] != apps[row]
+        )
+        if replaced_in_place:
+            changed_rows.append(prefix)
+
+        for row in changed_rows:
+            model_index = self.index(row)
+            self.dataChanged.emit(model_index, model_index)
+
+        if old_count != new_count:
+            self.count_changed.emit()
+
+    def set_positions(self, table: PositionTable):
+        """替换位置表，只通知位置角色变化（委托不会重建）"""
+        if table is self._positions:
+            return
+        self._positions = table
+        if self._apps:
+            self.dataChanged.emit(self.index(0), self.index(len(self._apps) - 1),
+                                  list(self._POSITION_COLUMNS))
+
+    def _get_count(self) -> int:
+        return len(self._apps)
+
+    count = Property(int, _get_count, notify=count_changed)
+
+    @Slot(int, result=str)
+    def app_id_at(self, index: int) -> str:
+        """获取指定位置的应用ID"""
+        if 0 <= index < len(self._apps):
+            return self._apps[index].get('id', '')
+        return ''
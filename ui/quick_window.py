@@ -3,23 +3,35 @@
 处理快捷窗口的显示、隐藏和交互
 """
 
-from PySide6.QtCore import QObject, Signal, Slot, QTimer, Qt, QPoint, QSize
+import math
+
+from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer, Qt, QPoint, QSize
 from PySide6.QtGui import QPixmap, QGuiApplication, QScreen
 from PySide6.QtWidgets import QWidget, QApplication
 from core.app_manager import AppManager
 from core.config_manager import ConfigManager, QuickWindowConfig
 from core.window_algorithm import WindowAlgorithm
+from ui.quick_app_model import QuickAppListModel, custom_icon_path
+from ui.config_objects import QuickWindowConfigObject
 from dataclasses import asdict
 
 
 class QuickWindowBackend(QObject):
     """快捷窗口后端逻辑"""
 
+    # 影响网格布局和窗口尺寸的配置项
+    LAYOUT_KEYS = frozenset({
+        'app_order', 'auto_order', 'paged', 'rows', 'cols', 'position',
+        'icon_size', 'icon_spacing', 'show_labels'
+    })
+
     # 信号定义
     apps_changed = Signal(list)
-    config_updated = Signal(dict)
+    config_updated = Signal(dict, list)  # 配置字典, 变化的配置项
     position_changed = Signal(str)
     visibility_changed = Signal(bool)
+    layout_info_changed = Signal()
+    page_changed = Signal()
 
     def __init__(self):
         super().__init__()
@@ -27,12 +39,45 @@ class QuickWindowBackend(QObject):
         self.config_manager = ConfigManager()
         self.window_algorithm = WindowAlgorithm()
 
+        # 网格布局缓存，只有布局参数变化时才重新计算并通知QML
+        self._layout_info = {}
+
+        # 快捷窗口中实际显示的应用（已排序、已截断）
+        self._quick_apps = []
+        self._quick_apps_model = QuickAppListModel(self)
+
+        # 可见图标的静止和悬停尺寸由图标提供者预取并保留，悬停时不再请求图标
+        self._icon_provider = None
+        self._device_pixel_ratio = 1.0
+        self._prefetch_state = None
+
+        # 分页模式下的当前页，模型中始终只有一页（行数×列数）的应用
+        self._page = 0
+        self._page_state = (0, 1)
+
         # 应用列表缓存
         self._cached_apps = []
         self._load_apps()
 
+        # 配置变化合并：同一轮事件循环内的多次修改只发出一次config_updated
+        self._last_config = self.get_config()
+
+        # 类型化配置对象，每个字段单独通知，QML只重新计算依赖变化字段的绑定
+        self._config_object = QuickWindowConfigObject(
+            self._last_config, writer=self._write_config_value, parent=self
+        )
+        self._previous_position = self._last_config.get('position', 'bottom_center')
+        self._force_layout_refresh = False
+        self._config_flush_timer = QTimer(self)
+        self._config_flush_timer.setSingleShot(True)
+        self._config_flush_timer.setInterval(0)
+        self._config_flush_timer.timeout.connect(self._flush_config_changes)
+        self.config_emit_count = 0
+        self.layout_update_count = 0
+
         # 监听配置变化
         self.config_manager.quick_config_updated.connect(self._on_config_updated)
+        self.app_manager.path_status.status_changed.connect(self._on_app_paths_changed)
 
         # 性能优化：延迟加载
         self._initialized = False
@@ -44,49 +89,59 @@ class QuickWindowBackend(QObject):
             self._initialized = True
             print("快捷窗口延迟初始化完成")
 
+    def _on_app_paths_changed(self, paths: list):
+        """应用路径存在状态变化时重新加载应用列表"""
+        self._load_apps()
+
     def _on_config_updated(self):
-        """配置更新时发出信号"""
+        """配置更新时安排合并后的通知"""
+        self._schedule_config_flush()
+
+    def _schedule_config_flush(self, force_layout: bool = False):
+        """在下一轮事件循环统一处理本轮所有配置变化"""
+        if force_layout:
+            self._force_layout_refresh = True
+        if not self._config_flush_timer.isActive():
+            self._config_flush_timer.start()
+
+    def _flush_config_changes(self):
+        """比较配置快照，发出一次配置更新信号"""
         try:
             config = self.get_config()
-            old_position = getattr(self, '_previous_position', config.get('position', 'bottom_center'))
-            new_position = config.get('position', 'bottom_center')
-            self._previous_position = new_position
-            
-            self.config_updated.emit(config)
-
-            # 根据配置更新窗口位置
-            if 'position' in config:
+            changed_keys = sorted(
+                key for key in config
+                if self._last_config.get(key) != config.get(key)
+            )
+            force_layout = self._force_layout_refresh
+            self._force_layout_refresh = False
+
+            if not changed_keys and not force_layout:
+                return
+
+            self._last_config = config
+            self._config_object.sync(config)
+
+            # 只有影响布局的配置变化时才重新计算布局
+            if force_layout or self.LAYOUT_KEYS.intersection(changed_keys):
+                if 'app_order' in changed_keys or 'auto_order' in changed_keys:
+                    # 应用顺序变化时重新加载应用列表（内部会更新布局）
+                    self._load_apps()
+                else:
+                    self._update_layout_info()
+                    self._refresh_visible_apps()
+                self.layout_update_count += 1
+
+            # 悬停比例变化时预取新的悬停尺寸
+            if 'hover_scale' in changed_keys:
+                self._prefetch_visible_icons()
+
+            if 'position' in changed_keys:
+                print(f"位置从 {self._previous_position} 变更为 {config['position']}，正在重新计算布局")
+                self._previous_position = config['position']
                 self.position_changed.emit(config['position'])
-                
-            # 如果应用顺序更新，重新加载应用列表以确保顺序正确
-            if 'app_order' in config:
-                # 重新加载应用列表以确保快捷窗口应用顺序正确
-                self._load_apps()
-                
-            # 如果背景颜色或透明度更新，发出配置更新信号以确保界面更新
-            if 'background_color' in config or 'opacity' in config:
-                self.config_updated.emit(config)
-                
-            # 如果行数或列数更新，发出配置更新信号以确保界面更新
-            if 'rows' in config or 'cols' in config:
-                self.config_updated.emit(config)
-                
-            # 如果位置发生变化，需要临时设置行数为1，然后恢复，以确保布局计算正确
-            if old_position != new_position:
-                print(f"位置从 {old_position} 变更为 {new_position}，正在重新计算布局")
-                # 临时将行数设为1，然后恢复原始行数，以确保布局计算正确
-                original_rows = config.get('rows', 1)
-                self.config_manager.update_quick_config(rows=1)
-                
-                # 立即发出配置更新信号
-                QTimer.singleShot(10, lambda: self.config_updated.emit(self.get_config()))
-                
-                # 恢复原始行数并重新计算
-                QTimer.singleShot(50, lambda: self.config_manager.update_quick_config(rows=original_rows))
-                QTimer.singleShot(100, lambda: self.config_updated.emit(self.get_config()))
-            
-            # 每次配置更新时，都要确保窗口尺寸根据新配置进行调整
-            self.config_updated.emit(config)
+
+            self.config_emit_count += 1
+            self.config_updated.emit(config, changed_keys)
         except Exception as e:
             print(f"配置更新处理失败: {e}")
 
@@ -96,33 +151,158 @@ class QuickWindowBackend(QObject):
             # 获取所有应用
             all_apps = self.app_manager.get_applications()
             
-            # 获取快捷窗口配置中的应用顺序
-            quick_app_ids = self.config_manager.quick_config.app_order
+            # 获取快捷窗口配置中的应用顺序（开启自动排序时按使用频率排列）
+            quick_app_ids = self.config_manager.get_quick_app_order()
             
             # 按照快捷窗口顺序排列的应用
-            ordered_apps = []
-            remaining_apps = []
-            
-            # 先按快捷窗口顺序排列
-            for app_id in quick_app_ids:
-                for app in all_apps:
-                    if app.get('id') == app_id:
-                        ordered_apps.append(app)
-                        break
-            
-            # 添加不在快捷窗口中的其他应用
-            for app in all_apps:
-                if app.get('id') not in quick_app_ids:
-                    remaining_apps.append(app)
+            ordered_apps, remaining_apps = self._order_apps(all_apps, quick_app_ids)
             
             # 合并列表：快捷窗口应用在前，其他应用在后
             self._cached_apps = ordered_apps + remaining_apps
+            self._quick_apps = ordered_apps
+            self._update_layout_info()
+            self._refresh_visible_apps()
             self.apps_changed.emit(self._cached_apps)
         except Exception as e:
             print(f"加载应用列表失败: {e}")
             self._cached_apps = []
+            self._quick_apps = []
+            self._refresh_visible_apps()
             self.apps_changed.emit([])
 
+    @staticmethod
+    def _order_apps(all_apps: list, quick_app_ids: list):
+        """按快捷窗口顺序拆分应用列表，返回 (快捷窗口应用, 其他应用)"""
+        apps_by_id = {app.get('id'): app for app in all_apps}
+        ordered_apps = [apps_by_id[app_id] for app_id in quick_app_ids if app_id in apps_by_id]
+        quick_id_set = set(quick_app_ids)
+        remaining_apps = [app for app in all_apps if app.get('id') not in quick_id_set]
+        return ordered_apps, remaining_apps
+
+    def _page_count(self) -> int:
+        """快捷窗口总页数，未开启分页时只有一页"""
+        quick_config = self.config_manager.quick_config
+        max_apps = max(0, quick_config.rows * quick_config.cols)
+        if not quick_config.paged or max_apps == 0:
+            return 1
+        return max(1, -(-len(self._quick_apps) // max_apps))
+
+    def _page_range(self) -> tuple:
+        """当前页对应的应用下标范围 (start, end)，同时把页码限制在有效范围内"""
+        quick_config = self.config_manager.quick_config
+        max_apps = max(0, quick_config.rows * quick_config.cols)
+        self._page = min(max(self._page, 0), self._page_count() - 1)
+        start = self._page * max_apps
+        return start, start + max_apps
+
+    def _layout_app_count(self) -> int:
+        """参与网格布局的应用数量，多页时按整页布局，翻页时窗口尺寸不变"""
+        start, end = self._page_range()
+        total = len(self._quick_apps)
+        if self._page_count() > 1:
+            return end - start
+        return max(0, min(total, end) - start)
+
+    def _refresh_visible_apps(self):
+        """更新快捷窗口可见应用模型，只保留当前页（前 行数×列数 个）应用"""
+        start, end = self._page_range()
+        self._quick_apps_model.set_apps(self._quick_apps[start:end])
+
+        page_state = (self._page, self._page_count())
+        if page_state != self._page_state:
+            self._page_state = page_state
+            self.page_changed.emit()
+
+        self._prefetch_visible_icons()
+
+    def set_icon_provider(self, provider):
+        """设置图标提供者，用于预取可见图标的静止和悬停尺寸"""
+        self._icon_provider = provider
+        self._prefetch_state = None
+        self._prefetch_visible_icons()
+
+    @Slot(float)
+    def set_device_pixel_ratio(self, dpr: float):
+        """快捷窗口所在屏幕的设备像素比变化时预取对应的图标变体"""
+        if dpr > 0 and dpr != self._device_pixel_ratio:
+            self._device_pixel_ratio = dpr
+            self._prefetch_visible_icons()
+
+    @staticmethod
+    def hover_icon_size(icon_size: int, hover_scale: float) -> int:
+        """悬停放大后的图标尺寸（与QML中的Math.round取整一致）"""
+        return int(math.floor(icon_size * hover_scale + 0.5))
+
+    def _prefetch_visible_icons(self):
+        """预取当前页应用图标的静止和悬停尺寸，保留在图标缓存的保留层"""
+        if self._icon_provider is None:
+            return
+
+        quick_config = self.config_manager.quick_config
+        icon_size = quick_config.icon_size or 48
+        sizes = [icon_size]
+        if quick_config.hover_scale and quick_config.hover_scale > 1.0:
+            sizes.append(self.hover_icon_size(icon_size, quick_config.hover_scale))
+
+        start, end = self._page_range()
+        paths = [app.get('path') for app in self._quick_apps[start:end]
+                 if app.get('path') and not custom_icon_path(app)]
+
+        state = (tuple(paths), tuple(sizes), self._device_pixel_ratio)
+        if state == self._prefetch_state:
+            return
+        self._prefetch_state = state
+        self._icon_provider.prefetch_icons(paths, sizes, self._device_pixel_ratio)
+
+    def _get_current_page(self) -> int:
+        return self._page
+
+    def _get_page_count(self) -> int:
+        return self._page_count()
+
+    # 分页模式的当前页和总页数
+    currentPage = Property(int, _get_current_page, notify=page_changed)
+    pageCount = Property(int, _get_page_count, notify=page_changed)
+
+    @Slot(int, result=bool)
+    def set_page(self, page: int) -> bool:
+        """切换到指定页，只替换模型中的一页应用，委托数量保持不变"""
+        if not self.config_manager.quick_config.paged:
+            return False
+        page = min(max(page, 0), self._page_count() - 1)
+        if page == self._page:
+            return False
+        self._page = page
+        self._update_layout_info()
+        self._refresh_visible_apps()
+        return True
+
+    @Slot(result=bool)
+    def next_page(self) -> bool:
+        """下一页"""
+        return self.set_page(self._page + 1)
+
+    @Slot(result=bool)
+    def previous_page(self) -> bool:
+        """上一页"""
+        return self.set_page(self._page - 1)
+
+    def _get_quick_apps_model(self) -> QuickAppListModel:
+        return self._quick_apps_model
+
+    # 快捷窗口可见应用模型，QML直接使用，无需传递和合并完整应用列表
+    quickAppsModel = Property(QObject, _get_quick_apps_model, constant=True)
+
+    def _write_config_value(self, key: str, value):
+        """QML修改配置对象属性时写入配置管理器"""
+        self.config_manager.update_quick_config(**{key: value})
+
+    def _get_config_object(self) -> QuickWindowConfigObject:
+        return self._config_object
+
+    # 类型化配置对象
+    configObject = Property(QObject, _get_config_object, constant=True)
+
     @Slot(result='QVariantList')
     def get_apps(self) -> list:
         """获取应用列表"""
@@ -132,7 +312,9 @@ class QuickWindowBackend(QObject):
     def get_config(self) -> dict:
         """获取配置"""
         try:
-            return asdict(self.config_manager.quick_config)
+            config = asdict(self.config_manager.quick_config)
+            config['app_order'] = self.config_manager.get_quick_app_order()
+            return config
         except Exception as e:
             print(f"获取配置失败: {e}")
             return asdict(QuickWindowConfig())
@@ -156,7 +338,9 @@ class QuickWindowBackend(QObject):
     def launch_app_by_id(self, app_id: str) -> bool:
         """根据ID启动应用"""
         try:
-            return self.app_manager.launch_application(app_id)
+            result = self.app_manager.launch_application(app_id)
+            self._refresh_auto_order()
+            return result
         except Exception as e:
             print(f"启动应用失败 {app_id}: {e}")
             return False
@@ -168,11 +352,18 @@ class QuickWindowBackend(QObject):
             if 0 <= index < len(self._cached_apps):
                 app = self._cached_apps[index]
                 if 'id' in app:
-                    return self.app_manager.launch_application(app['id'])
+                    result = self.app_manager.launch_application(app['id'])
+                    self._refresh_auto_order()
+                    return result
         except Exception as e:
             print(f"启动应用失败: {e}")
         return False
 
+    def _refresh_auto_order(self):
+        """开启自动排序时，启动应用后按新的使用频率刷新顺序"""
+        if self.config_manager.quick_config.auto_order:
+            self._schedule_config_flush()
+
     @Slot(str, result=dict)
     def get_app_position(self, position: str = None) -> dict:
         """获取应用窗口位置"""
@@ -183,24 +374,20 @@ class QuickWindowBackend(QObject):
             screen = QGuiApplication.primaryScreen()
             screen_geometry = screen.availableGeometry()
 
-            config = self.get_config()
-            icon_size = config.get('icon_size', 64)
-            icon_spacing = config.get('icon_spacing', 10)
-            rows = config.get('rows', 1)
-            cols = config.get('cols', 5)
-            show_labels = config.get('show_labels', False)
-
-            # 获取快捷窗口中配置的应用数量
-            quick_app_ids = self.config_manager.quick_config.app_order
-            app_count = len(quick_app_ids)
-            
-            # 使用窗口算法计算布局信息
-            layout_info = self.window_algorithm.calculate_layout(app_count, rows, cols, position)
-            
-            # 计算窗口尺寸
-            window_width, window_height = self.window_algorithm.calculate_window_size(
-                layout_info, icon_size, icon_spacing, show_labels
+            quick_config = self.config_manager.quick_config
+
+            # 使用窗口算法计算布局信息（带缓存）
+            layout_info = self.window_algorithm.compute_grid_layout(
+                self._layout_app_count(),
+                quick_config.rows,
+                quick_config.cols,
+                position,
+                quick_config.icon_size,
+                quick_config.icon_spacing,
+                quick_config.show_labels
             )
+            window_width = layout_info['width']
+            window_height = layout_info['height']
 
             # 根据位置计算坐标
             if position == "top_center":
@@ -257,7 +444,7 @@ class QuickWindowBackend(QObject):
 
             if isinstance(processed_app_order, list):
                 # 验证所有ID都存在
-                valid_ids = [app.get('id', '') for app in self._cached_apps]
+                valid_ids = {app.get('id', '') for app in self._cached_apps}
                 filtered_order = [id for id in processed_app_order if id in valid_ids]
 
                 # 更新配置
@@ -266,32 +453,21 @@ class QuickWindowBackend(QObject):
 
                 # 重新排序缓存的应用列表
                 # 现在确保快捷窗口中显示的应用按照正确的顺序排列在缓存列表的前面
-                ordered_apps = []
-                remaining_apps = []
-                
-                # 获取所有应用的副本
-                all_apps = self._cached_apps.copy()
-                
-                # 按照快捷窗口顺序排列的应用
-                for app_id in filtered_order:
-                    for app in all_apps:
-                        if app.get('id') == app_id:
-                            ordered_apps.append(app)
-                            break
-                
-                # 添加不在快捷窗口中的其他应用
-                for app in all_apps:
-                    if app.get('id') not in filtered_order:
-                        remaining_apps.append(app)
+                ordered_apps, remaining_apps = self._order_apps(
+                    self._cached_apps, self.config_manager.get_quick_app_order()
+                )
                 
                 # 重新构建缓存列表：快捷应用在前，其他应用在后
                 self._cached_apps = ordered_apps + remaining_apps
+                self._quick_apps = ordered_apps
+                self._update_layout_info()
+                self._refresh_visible_apps()
 
                 # 发出信号
                 self.apps_changed.emit(self._cached_apps)
                 
-                # 发出配置更新信号以确保窗口尺寸更新
-                self.config_updated.emit(self.get_config())
+                # 合并发出配置更新信号以确保窗口尺寸更新
+                self._schedule_config_flush()
                 
                 return True
 
@@ -326,58 +502,59 @@ class QuickWindowBackend(QObject):
                 'background_color': '#FFFFFF'
             }
 
+    def _compute_layout_info(self) -> dict:
+        """根据当前配置计算网格布局信息（由窗口算法缓存）"""
+        quick_config = self.config_manager.quick_config
+        return self.window_algorithm.compute_grid_layout(
+            self._layout_app_count(),
+            quick_config.rows,
+            quick_config.cols,
+            quick_config.position,
+            quick_config.icon_size,
+            quick_config.icon_spacing,
+            quick_config.show_labels
+        )
+
+    def _update_layout_info(self):
+        """布局参数变化时更新缓存并发出通知"""
+        try:
+            layout_info = self._compute_layout_info()
+            quick_config = self.config_manager.quick_config
+            self._quick_apps_model.set_positions(self.window_algorithm.build_position_table(
+                self._layout_app_count(),
+                quick_config.rows,
+                quick_config.cols,
+                quick_config.position,
+                quick_config.icon_size,
+                quick_config.icon_spacing,
+                quick_config.show_labels
+            ))
+        except Exception as e:
+            print(f"计算网格布局信息失败: {e}")
+            return
+
+        # 布局未变化时无需通知QML
+        if layout_info is self._layout_info or layout_info == self._layout_info:
+            return
+        self._layout_info = layout_info
+        self.layout_info_changed.emit()
+
+    def _get_layout_info(self) -> dict:
+        return self._layout_info
+
+    # QML绑定使用的缓存布局信息，只在布局参数变化时通知
+    layoutInfo = Property('QVariantMap', _get_layout_info, notify=layout_info_changed)
+
     @Slot(result=dict)
     def get_grid_layout_info(self) -> dict:
         """获取网格布局信息"""
         try:
-            config = self.get_config()
-            quick_app_ids = self.config_manager.quick_config.app_order
-            app_count = len(quick_app_ids)
-            rows = config.get('rows', 1)
-            cols = config.get('cols', 5)
-            position = config.get('position', 'bottom_center')
-            
-            # 使用窗口算法计算布局信息
-            layout_info = self.window_algorithm.calculate_layout(app_count, rows, cols, position)
-            
-            # 获取特殊行信息
-            special_row_info = self.window_algorithm.get_special_row_info(layout_info, position)
-            
-            # 计算应用分布
-            app_distribution = self.window_algorithm.calculate_app_distribution(app_count, rows, cols, position)
-            
-            # 计算窗口尺寸
-            icon_size = config.get('icon_size', 64)
-            icon_spacing = config.get('icon_spacing', 10)
-            show_labels = config.get('show_labels', False)
-            window_width, window_height = self.window_algorithm.calculate_window_size(
-                layout_info, icon_size, icon_spacing, show_labels
-            )
-            
-            # 确保窗口尺寸基于实际应用数量，而不是配置的最大网格
-            actual_rows = layout_info.rows
-            actual_cols = min(cols, max([pos[1] for pos in layout_info.app_positions], default=-1) + 1) if layout_info.app_positions else 0
-            
-            return {
-                'rows': actual_rows,
-                'cols': actual_cols if actual_cols > 0 else layout_info.cols,
-                'app_positions': [{'row': pos[0], 'col': pos[1]} for pos in layout_info.app_positions],
-                'max_apps': layout_info.max_apps,
-                'total_apps': layout_info.total_apps,
-                'special_row_info': special_row_info,
-                'app_distribution': app_distribution,
-                'can_add_row': self.window_algorithm.can_add_row(app_count, rows, cols, position),
-                'width': window_width,
-                'height': window_height,
-                'configured_rows': rows,
-                'configured_cols': cols
-            }
+            return dict(self._compute_layout_info())
         except Exception as e:
             print(f"获取网格布局信息失败: {e}")
             return {
                 'rows': 1,
                 'cols': 5,
-                'app_positions': [],
                 'max_apps': 5,
                 'total_apps': 0,
                 'special_row_info': {},
@@ -411,9 +588,6 @@ class QuickWindowBackend(QObject):
             update_data = {key: value}
             self.config_manager.update_quick_config(**update_data)
             
-            # 发出配置更新信号，以便前端重新计算布局
-            self.config_updated.emit(self.get_config())
-            
             return True
         except Exception as e:
             print(f"更新窗口配置失败: {e}")
@@ -435,8 +609,8 @@ class QuickWindowBackend(QObject):
             cols = self.config_manager.quick_config.cols
             max_apps = rows * cols
             
-            if len(current_order) >= max_apps:
-                return False  # 已达到最大应用数量限制
+            if not self.config_manager.quick_config.paged and len(current_order) >= max_apps:
+                return False  # 已达到最大应用数量限制（分页模式不限制）
                 
             # 添加应用到列表末尾
             current_order.append(app_id)
@@ -448,8 +622,8 @@ class QuickWindowBackend(QObject):
             # 重新加载应用列表
             self._load_apps()
             
-            # 发出配置更新信号以触发窗口尺寸更新
-            self.config_updated.emit(self.get_config())
+            # 合并发出配置更新信号以触发窗口尺寸更新
+            self._schedule_config_flush()
             
             return True
         except Exception as e:
@@ -477,8 +651,8 @@ class QuickWindowBackend(QObject):
             # 重新加载应用列表
             self._load_apps()
             
-            # 发出配置更新信号以触发窗口尺寸更新
-            self.config_updated.emit(self.get_config())
+            # 合并发出配置更新信号以触发窗口尺寸更新
+            self._schedule_config_flush()
             
             return True
         except Exception as e:
@@ -508,7 +682,13 @@ class QuickWindowBackend(QObject):
             return {
                 'app_count': len(self._cached_apps),
                 'cache_initialized': self._initialized,
-                'config_loaded': True
+                'config_loaded': True,
+                'config_emit_count': self.config_emit_count,
+                'layout_update_count': self.layout_update_count,
+                'layout_cache_hits': self.window_algorithm.cache_hits,
+                'layout_cache_misses': self.window_algorithm.cache_misses,
+                'save_request_count': self.config_manager.save_request_count,
+                'save_write_count': self.config_manager.save_write_count
             }
         except Exception as e:
             print(f"获取性能统计失败: {e}")
@@ -543,8 +723,8 @@ class QuickWindowBackend(QObject):
                     # 如果所需行数与当前配置不同，更新配置
                     self.config_manager.update_quick_config(rows=required_rows)
             
-            # 发出配置更新信号以确保界面更新
-            self.config_updated.emit(self.get_config())
+            # 合并发出配置更新信号以确保界面更新
+            self._schedule_config_flush(force_layout=True)
             
             return True
         except Exception as e:
@@ -553,31 +733,12 @@ class QuickWindowBackend(QObject):
 
     @Slot()
     def refresh_with_single_row(self):
-        """刷新快捷窗口，先将行数变为一行然后恢复原来的行数"""
-        try:
-            # 获取当前配置
-            config = self.get_config()
-            original_rows = config.get('rows', 1)
+        """刷新快捷窗口布局
 
-            
-            print(f"开始刷新快捷窗口，当前行数: {original_rows}")
-            
-            # 先将行数设为1
-            self.config_manager.update_quick_config(rows=1)
-            
-            # 发出配置更新信号，让前端界面更新
-            self.config_updated.emit(self.get_config())
-            
-            # 使用定时器在稍后恢复原来的行数
-            from PySide6.QtCore import QTimer
-            def restore_original_rows():
-                print(f"恢复原始行数: {original_rows}")
-                self.config_manager.update_quick_config(rows=original_rows)
-                self.config_updated.emit(self.get_config())
-            
-            # 延迟50毫秒后恢复原始行数，给界面足够时间更新
-            QTimer.singleShot(50, restore_original_rows)
-            
-            print("快捷窗口刷新流程已启动")
+        布局由缓存的纯函数计算，不再需要临时把行数改为1再恢复，
+        这里只强制重新计算布局并合并发出一次配置更新信号。
+        """
+        try:
+            self._schedule_config_flush(force_layout=True)
         except Exception as e:
             print(f"刷新快捷窗口失败: {e}")
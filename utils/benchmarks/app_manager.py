@@ -0,0 +1,87 @@
+"""
+基准测试：5000个应用，每次stat注入延迟，比较逐个检查与并发检查+批量删除；
+其中40个应用位于无响应的网络共享上（多于工作线程数），检查其他路径仍全部完成，且退出时不等待卡住的线程
+
+用法:
+    python -m utils.benchmarks.app_manager
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+
+if __name__ == "__main__":
+    os.environ["QUICKLAUNCHER_CONFIG_DIR"] = tempfile.mkdtemp(prefix="quicklauncher_sweep_")
+    from PySide6.QtCore import QCoreApplication
+    from core import path_status
+    from core.app_manager import AppManager
+    from core.config_manager import AppConfig
+
+    app = QCoreApplication(sys.argv)
+    manager = AppManager()
+    config_manager = manager.config_manager
+
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_sweep_apps_"))
+    for i in range(5000):
+        if i % 5 == 0:
+            path = work_dir / "removed" / f"app_{i}.exe"
+        elif i % 125 == 1:
+            # 无响应的网络共享
+            path = work_dir / "hung" / f"app_{i}.exe"
+        else:
+            path = work_dir / f"app_{i}.exe"
+            path.touch()
+        app_id = f"app-{i}"
+        config_manager._apps[app_id] = AppConfig(name=f"App {i}", path=str(path), id=app_id)
+
+    # 无响应的目录作为单独的挂载点
+    hung_dir = str(work_dir / "hung")
+    path_status._mount_points = lambda: [hung_dir]
+    hung_count = sum(1 for app_config in config_manager.get_all_apps().values() if hung_dir in app_config.path)
+
+    stat_latency = 0.002
+    real_stat = os.stat
+
+    def slow_stat(path, *args, **kwargs):
+        time.sleep(30 if "hung" in str(path) else stat_latency)
+        return real_stat(path, *args, **kwargs)
+
+    os.stat = slow_stat
+
+    # 原实现：在调用线程逐个检查（跳过无响应路径，否则会卡住30秒/个）
+    start = time.perf_counter()
+    serial_missing = [app_id for app_id, app_config in config_manager.get_all_apps().items()
+                      if "hung" not in app_config.path and not os.path.exists(app_config.path)]
+    serial = time.perf_counter() - start
+    print(f"逐个检查: {serial * 1000:.0f} ms, 不存在 {len(serial_missing)} 个, "
+          f"逐个删除需要 {len(serial_missing)} 次保存和列表刷新")
+
+    list_signals = []
+    config_manager.app_list_updated.connect(lambda: list_signals.append(1))
+    saves_before = config_manager.save_request_count
+    progress_calls = []
+
+    failures = []
+    for workers in (16, 64):
+        start = time.perf_counter()
+        sweep = manager.sweep_missing_apps(max_workers=workers, timeout=1.0,
+                                           progress=lambda done, total: progress_calls.append(done))
+        elapsed = time.perf_counter() - start
+        print(f"并发检查 {workers} 线程: {elapsed * 1000:.0f} ms, 已检查 {sweep['checked']}/{sweep['total']}, "
+              f"不存在 {len(sweep['missing_apps'])} 个, 超时 {len(sweep['timed_out_paths'])} 个, "
+              f"进度回调 {len(progress_calls)} 次")
+        progress_calls.clear()
+        if sweep['checked'] != sweep['total'] - hung_count or sorted(sweep['missing_apps']) != sorted(serial_missing):
+            failures.append(f"{workers} 线程: 无响应共享之外的路径没有全部检查")
+
+    result = manager.remove_missing_apps(sweep)
+    os.stat = real_stat
+    print(f"批量删除: {result['cleaned_count']} 个, 保存 {config_manager.save_request_count - saves_before} 次, "
+          f"列表更新信号 {len(list_signals)} 次")
+    for failure in failures:
+        print(f"失败: {failure}")
+    # 卡在无响应共享上的检查线程是守护线程，不阻止退出
+    sys.exit(1 if failures else 0)
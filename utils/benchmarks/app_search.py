@@ -0,0 +1,146 @@
+"""
+基准测试：模拟逐字输入，比较原来的同步搜索（扫描全部、转换全部结果并排序后才返回）
+与工作线程分块搜索（代号过期即取消）从按键到第一批结果的延迟
+
+用法:
+    python -m utils.benchmarks.app_search
+"""
+
+import time
+import queue
+import random
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from core.app_search import AppSearchIndex
+
+
+if __name__ == "__main__":
+    from core.frecency import FrecencyEngine
+
+    @dataclass
+    class BenchApp:
+        """与AppConfig相同的字段"""
+        name: str
+        path: str
+        icon_path: str = ""
+        arguments: str = ""
+        working_dir: str = ""
+        description: str = ""
+        tags: List[str] = field(default_factory=list)
+        added_time: float = 0.0
+        last_used: float = 0.0
+        usage_count: int = 0
+        id: str = ""
+        favorite: bool = False
+
+    words = ["studio", "visual", "code", "office", "word", "excel", "player", "media", "editor", "photo",
+             "viewer", "manager", "terminal", "browser", "chrome", "fire", "note", "pad", "music", "video",
+             "game", "steam", "mail", "chat", "cloud", "sync", "backup", "shell", "tool", "paint"]
+    keystroke_interval = 0.08  # 约每分钟750个字符的快速输入
+    typed = "visual studio"
+
+    def build_catalog(count: int):
+        rng = random.Random(count)
+        apps = {}
+        frecency = FrecencyEngine()
+        now = time.time()
+        for i in range(count):
+            app_id = f"app-{i}"
+            name = " ".join(rng.sample(words, 2)).title() + f" {i}"
+            apps[app_id] = BenchApp(name=name, path=f"/opt/apps/{app_id}/bin/{name.split()[0].lower()}",
+                                    description=f"{name} description", tags=rng.sample(words, 2), id=app_id)
+            if i % 5 == 0:
+                frecency.record(app_id, now - rng.uniform(0, 30 * 86400))
+        return apps, frecency
+
+    def to_dict(app_id: str, app: BenchApp, exists: Dict[str, bool]) -> Dict[str, Any]:
+        app_dict = asdict(app)
+        app_dict['id'] = app_id
+        app_dict['exists'] = exists[app.path]
+        if not app_dict.get('icon_path'):
+            app_dict['icon_path'] = f"image://icon/{app.path}"
+        return app_dict
+
+    def sync_search(apps, frecency, exists, query: str) -> List[Dict[str, Any]]:
+        """原实现：扫描全部应用，转换全部匹配结果后按使用频率排序"""
+        query_lower = query.lower().strip()
+        results = [to_dict(app_id, app, exists) for app_id, app in apps.items() if query_lower in app.name.lower()]
+        results.sort(key=lambda item: frecency.sort_key(item['id']), reverse=True)
+        return results
+
+    def summarize(samples: List[float]) -> str:
+        samples = sorted(samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return (f"中位数 {statistics.median(samples):.2f} ms, p95 {p95:.2f} ms, "
+                f"最长 {samples[-1]:.2f} ms")
+
+    for count in (10000, 100000):
+        apps, frecency = build_catalog(count)
+        exists = {app.path: True for app in apps.values()}
+        queries = [typed[:length] for length in range(1, len(typed) + 1)]
+
+        # 原实现：每次按键同步返回全部结果
+        sync_samples = []
+        for query in queries:
+            start = time.perf_counter()
+            sync_results = sync_search(apps, frecency, exists, query)
+            sync_samples.append((time.perf_counter() - start) * 1000)
+
+        # 新实现：工作线程分块搜索，按键时递增代号
+        index = AppSearchIndex(lambda: dict(apps), frecency.rank)
+        start = time.perf_counter()
+        index.snapshot().column("name")
+        prime = (time.perf_counter() - start) * 1000
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        chunks: "queue.Queue[Tuple[int, float, int, bool]]" = queue.Queue()
+        generation = [0]
+
+        def search_job(job_generation: int, query: str):
+            is_stale = lambda: job_generation != generation[0]
+            total = 0
+            for items in index.iter_search(query, ["name"], is_cancelled=is_stale):
+                apps_dicts = [to_dict(app_id, app, exists) for app_id, app in items]
+                if is_stale():
+                    return
+                total += len(apps_dicts)
+                chunks.put((job_generation, time.perf_counter(), total, False))
+            if not is_stale():
+                chunks.put((job_generation, time.perf_counter(), total, True))
+
+        first_samples = []
+        final_total = 0
+        final_done = 0.0
+        for query in queries:
+            typed_at = time.perf_counter()
+            generation[0] += 1
+            executor.submit(search_job, generation[0], query)
+            # 在下一次按键之前接收结果，丢弃过期代号的结果
+            deadline = typed_at + keystroke_interval
+            first = None
+            while True:
+                try:
+                    job_generation, stamp, total, done = chunks.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if job_generation != generation[0]:
+                    continue
+                if first is None:
+                    first = (stamp - typed_at) * 1000
+                final_total, final_done = total, stamp - typed_at
+                if done:
+                    break
+            if first is not None:
+                first_samples.append(first)
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+        executor.shutdown(wait=True)
+
+        print(f"{count} 个应用，逐字输入 \"{typed}\"（每 {keystroke_interval * 1000:.0f} ms 一个字符）")
+        print(f"  同步搜索（按键到全部结果）: {summarize(sync_samples)}，最后一次 {len(sync_results)} 个结果")
+        print(f"  异步分块（按键到第一批结果）: {summarize(first_samples)}，首次生成快照 {prime:.0f} ms")
+        print(f"  最后一次查询全部 {final_total} 个结果用时 {final_done * 1000:.2f} ms, {index.get_stats()}")
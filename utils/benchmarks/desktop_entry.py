@@ -0,0 +1,85 @@
+"""
+基准测试：逐行查找键的原实现、完整解析、缓存读取的吞吐量
+
+用法:
+    python -m utils.benchmarks.desktop_entry
+"""
+
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+from core.desktop_entry import DesktopEntry, DesktopEntryCache
+
+
+if __name__ == "__main__":
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_desktop_entry_"))
+    languages = ['de', 'fr', 'es', 'it', 'ja', 'ko', 'ru', 'pt_BR', 'zh_CN', 'zh_TW']
+    paths = []
+    for i in range(2000):
+        lines = ["[Desktop Entry]", "Type=Application", f"Name=Application {i}"]
+        lines += [f"Name[{lang}]=App {i} {lang}" for lang in languages]
+        lines += [f"Comment[{lang}]=Comment {i} {lang}" for lang in languages]
+        lines += [
+            f"Exec=\"/opt/app {i}/bin/app\" --name=%c --config \"$HOME/.app\\\\\\\\cfg\" %U",
+            f"Icon=app{i}",
+            f"Terminal={'true' if i % 20 == 0 else 'false'}",
+            "Categories=Utility;Development;",
+            "Keywords=edit\\;text;code;",
+            "Actions=new-window;",
+            "",
+            "[Desktop Action new-window]",
+            "Name=New Window",
+            f"Exec=/opt/app{i}/bin/app --new-window %f",
+        ]
+        path = work_dir / f"app{i}.desktop"
+        path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        paths.append(str(path))
+
+    def legacy_lookup(path: str, key: str) -> str:
+        """原实现：每次读取文件查找一行"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f.read().split('\n'):
+                if line.startswith(key + '='):
+                    return line[len(key) + 1:].strip()
+        return ''
+
+    # 每个应用一次快捷方式解析、一次图标查找、一次启动
+    lookups = ('Exec', 'Icon', 'Exec')
+    start = time.perf_counter()
+    for path in paths:
+        for key in lookups:
+            legacy_lookup(path, key)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in paths:
+        DesktopEntry.parse(path)
+    parse = time.perf_counter() - start
+
+    def cached_lookups(cache: DesktopEntryCache):
+        for path in paths:
+            cache.get(path).command()
+            cache.get(path).icon
+            cache.get(path).build_argv(['/tmp/a b.txt'])
+
+    cache = DesktopEntryCache(max_entries=len(paths))
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        cached_lookups(cache)
+        timings.append(time.perf_counter() - start)
+
+    total = len(paths) * len(lookups)
+    print(f"{len(paths)} 个.desktop文件, 每个 {len(lookups)} 次读取")
+    print(f"逐行查找: {legacy * 1000:.1f} ms ({total / legacy:.0f} 次/秒)")
+    print(f"完整解析: {parse * 1000:.1f} ms ({len(paths) / parse:.0f} 个文件/秒)")
+    print(f"缓存 首次: {timings[0] * 1000:.1f} ms, 之后: {timings[1] * 1000:.1f} ms "
+          f"({total / timings[1]:.0f} 次/秒), {cache.get_stats()}")
+
+    sample = cache.get(paths[0])
+    print(f"示例命令: {sample.build_argv(['/tmp/a b.txt'])}")
+    print(f"示例动作: {sample.build_argv(['/tmp/a b.txt'], action='new-window')}")
+    print(f"示例关键字: {sample.get_list('Keywords')}")
+    shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,39 @@
+"""
+基准测试：10k应用的记录和排序耗时
+
+用法:
+    python -m utils.benchmarks.frecency
+"""
+
+import time
+import random
+
+from core.frecency import FrecencyEngine
+
+
+if __name__ == "__main__":
+    engine = FrecencyEngine()
+    app_ids = [f"app_{i}" for i in range(10000)]
+    now = time.time()
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        engine.record(random.choice(app_ids), now - random.random() * 90 * 86400)
+    record_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = engine.rank(app_ids)
+    rank_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    best = engine.top(20)
+    top_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.load(engine.to_dict())
+    persist_time = time.perf_counter() - start
+
+    print(f"记录启动: {record_time / 100000 * 1e6:.2f} us/次")
+    print(f"排序10k应用: {rank_time * 1000:.2f} ms")
+    print(f"获取前20: {top_time * 1000:.2f} ms")
+    print(f"序列化+加载: {persist_time * 1000:.2f} ms")
@@ -0,0 +1,100 @@
+"""
+压力测试：多个线程同时预加载并读取同一批图标，检查结果一致且没有崩溃
+
+用法:
+    python -m utils.benchmarks.icon_cache
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+from PySide6.QtGui import QColor, QImage
+from core.icon_cache import IconCache
+
+
+if __name__ == "__main__":
+    from PySide6.QtGui import QGuiApplication
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication(sys.argv)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_icons_"))
+    paths = []
+    for i in range(40):
+        image_path = work_dir / f"icon_{i}.png"
+        image = QImage(256, 256, QImage.Format.Format_ARGB32)
+        image.fill(QColor((i * 37) % 256, (i * 91) % 256, (i * 53) % 256))
+        image.save(str(image_path))
+        paths.append(str(image_path))
+    # 不存在的文件走文件类型图标生成
+    paths += [str(work_dir / f"missing_{i}{ext}") for i, ext in enumerate(['.exe', '.lnk', '.bat', '.zip'])]
+
+    cache = IconCache(max_size=500, cache_dir=str(work_dir / "cache"))
+    sizes = [16, 32, 48, 64]
+    errors = []
+
+    def hammer(seed: int):
+        try:
+            cache.preload_icons(paths, sizes)
+            for offset in range(len(paths)):
+                path = paths[(seed + offset) % len(paths)]
+                for size in sizes:
+                    image = cache.get_icon_image(path, size)
+                    if image.isNull() or max(image.width(), image.height()) != size:
+                        errors.append(f"{path}@{size}: {image.width()}x{image.height()}")
+        except Exception as e:
+            errors.append(repr(e))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=hammer, args=(n * 7,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.thread_pool.shutdown(wait=True)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    stats = cache.get_stats()
+    print(f"线程池: {cache.thread_pool._max_workers} 个工作线程, 16 个请求线程, 耗时 {elapsed:.1f} ms")
+    print(f"请求 {stats['performance']['total_requests']}, 提取 {stats['extractions']['total']}, "
+          f"等待合并 {stats['extractions']['inflight_waits']}, 内存缓存 {stats['memory_cache']['size']}")
+    ref_files = list((work_dir / "cache").rglob("*.ref"))
+    print(f"磁盘引用文件 {len(ref_files)} (期望 {len(paths) * len(sizes)})")
+    print("错误:" if errors else "通过", *errors[:10], sep="\n  ")
+    cache.shutdown()
+
+    # 去重统计：合成目录中40%的条目与其他条目共享图标
+    catalog = []
+    for i in range(60):
+        image_path = work_dir / f"unique_{i}.png"
+        image = QImage(128, 128, QImage.Format.Format_ARGB32)
+        image.fill(QColor((i * 67) % 256, (i * 29) % 256, (i * 113) % 256))
+        image.save(str(image_path))
+        catalog.append(str(image_path))
+    shared_source = QImage(128, 128, QImage.Format.Format_ARGB32)
+    shared_source.fill(QColor(30, 144, 255))
+    for i in range(20):
+        # 多个快捷方式指向同一目标（图标内容相同）
+        image_path = work_dir / f"shortcut_{i}.png"
+        shared_source.save(str(image_path))
+        catalog.append(str(image_path))
+    # 同类脚本生成的文件类型图标完全相同
+    catalog += [str(work_dir / f"script_{i}.bat") for i in range(20)]
+
+    dedupe_cache = IconCache(max_size=500, cache_dir=str(work_dir / "dedupe_cache"))
+    for path in catalog:
+        for size in (32, 48):
+            dedupe_cache.get_icon_image(path, size)
+    dedupe = dedupe_cache.get_stats()['dedupe']
+    blob_bytes = sum(f.stat().st_size for f in (work_dir / "dedupe_cache" / "blobs").rglob("*.png"))
+    print(f"去重: 条目 {dedupe['path_entries']}, 唯一图标 {dedupe['unique_images']}, "
+          f"去重比 {dedupe['dedupe_ratio']}x, 共享引用 {dedupe['shared_refs']}")
+    print(f"节省内存 {dedupe['memory_bytes_saved'] / 1024:.1f} KB, "
+          f"节省磁盘 {dedupe['disk_bytes_saved'] / 1024:.1f} KB (实际占用 {blob_bytes / 1024:.1f} KB)")
+    dedupe_cache.shutdown()
+
+    sys.exit(1 if errors or len(ref_files) != len(paths) * len(sizes) else 0)
@@ -0,0 +1,68 @@
+"""
+基准测试：预加载2000个.desktop条目（图标分别为SVG和PNG），比较不同进程数
+
+用法:
+    python -m utils.benchmarks.icon_process_pool
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+from PySide6.QtGui import QImage
+
+
+if __name__ == "__main__":
+    from PySide6.QtGui import QGuiApplication, QColor
+
+    from core.icon_cache import IconCache
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication(sys.argv)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_icon_pool_"))
+    entries = []
+    for i in range(2000):
+        if i % 2:
+            icon_path = work_dir / f"icon_{i}.svg"
+            icon_path.write_text(
+                f'<svg xmlns="http://www.w3.org/2000/svg" width="256" height="256">'
+                f'<rect x="16" y="16" width="224" height="224" rx="40" fill="#{i * 2654435761 % 0xFFFFFF:06x}"/>'
+                f'<circle cx="128" cy="128" r="{40 + i % 60}" fill="white" fill-opacity="0.6"/></svg>',
+                encoding='utf-8'
+            )
+        else:
+            icon_path = work_dir / f"icon_{i}.png"
+            image = QImage(256, 256, QImage.Format.Format_ARGB32)
+            image.fill(QColor((i * 37) % 256, (i * 91) % 256, (i * 53) % 256))
+            image.save(str(icon_path))
+
+        desktop_path = work_dir / f"app_{i}.desktop"
+        desktop_path.write_text(
+            f"[Desktop Entry]\nType=Application\nName=App {i}\nExec=app{i}\nIcon={icon_path}\n",
+            encoding='utf-8'
+        )
+        entries.append(str(desktop_path))
+
+    def run(workers: int) -> float:
+        cache = IconCache(max_size=len(entries), cache_dir=str(work_dir / f"cache_{workers}"),
+                          process_workers=workers)
+        if cache.process_pool is not None:
+            # 进程启动时间不计入
+            cache.process_pool.extract(entries[0], 48)
+        start = time.perf_counter()
+        cache.preload_icons(entries, [48])
+        cache.thread_pool.shutdown(wait=True)
+        elapsed = time.perf_counter() - start
+        pool_stats = cache.process_pool.get_stats() if cache.process_pool else {}
+        cache.shutdown()
+        label = f"{workers} 个进程" if workers else "进程内线程池"
+        print(f"{label}: {elapsed * 1000:.0f} ms, {len(entries) / elapsed:.0f} 个/秒 {pool_stats}")
+        return elapsed
+
+    baseline = run(0)
+    for workers in (1, 2, 4, 8):
+        elapsed = run(workers)
+        print(f"  相对进程内: {baseline / elapsed:.2f}x")
@@ -0,0 +1,105 @@
+"""
+基准测试：20000个图标文件的合成主题（继承hicolor），比较逐目录查找与索引查找的未命中路径延迟
+
+用法:
+    python -m utils.benchmarks.icon_theme_index
+"""
+
+import os
+import time
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from core.icon_theme_index import ICON_EXTENSIONS, IconThemeIndex, parse_index_theme
+
+
+if __name__ == "__main__":
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_icon_theme_"))
+    base = work_dir / "icons"
+    sizes = (16, 22, 24, 32, 48, 64, 128, 256)
+    contexts = ('apps', 'mimetypes', 'places', 'status', 'actions')
+
+    def make_theme(theme: str, inherits: str, names: List[str]):
+        directories = [f"{size}x{size}/{context}" for size in sizes for context in contexts]
+        directories += [f"scalable/{context}" for context in contexts]
+        lines = ["[Icon Theme]", f"Name={theme}", f"Inherits={inherits}", f"Directories={','.join(directories)}"]
+        for directory in directories:
+            lines.append(f"\n[{directory}]")
+            if directory.startswith('scalable'):
+                lines += ["Size=64", "MinSize=8", "MaxSize=512", "Type=Scalable"]
+            else:
+                lines += [f"Size={directory.split('x')[0]}", "Type=Fixed"]
+            (base / theme / directory).mkdir(parents=True, exist_ok=True)
+        (base / theme / "index.theme").write_text("\n".join(lines) + "\n", encoding='utf-8')
+        for i, name in enumerate(names):
+            context = contexts[i % len(contexts)]
+            for size in sizes:
+                (base / theme / f"{size}x{size}" / context / f"{name}.png").touch()
+            if i % 4 == 0:
+                (base / theme / "scalable" / context / f"{name}.svg").touch()
+
+    theme_names = [f"app-{i}" for i in range(2200)]
+    hicolor_names = [f"legacy-{i}" for i in range(300)]
+    make_theme("Synthetic", "hicolor", theme_names)
+    make_theme("hicolor", "", hicolor_names)
+    file_count = sum(1 for _ in base.rglob("*.*")) - 2
+    print(f"合成主题: {file_count} 个图标文件")
+
+    def legacy_lookup(name: str, size: int) -> Optional[str]:
+        """原方式（模拟QIcon.fromTheme未命中时）：每次读取index.theme并逐目录检查文件"""
+        theme = "Synthetic"
+        visited = []
+        while theme and theme not in visited:
+            visited.append(theme)
+            inherits, theme_dirs = parse_index_theme(str(base / theme / "index.theme"))
+            best, best_distance = None, None
+            for theme_dir in theme_dirs:
+                for ext in ICON_EXTENSIONS:
+                    path = os.path.join(base, theme, theme_dir.subdir, name + ext)
+                    if os.path.isfile(path):
+                        distance = theme_dir.distance(size)
+                        if best is None or distance < best_distance:
+                            best, best_distance = path, distance
+            if best:
+                return best
+            theme = inherits[0] if inherits else ("hicolor" if theme != "hicolor" else None)
+        return None
+
+    rng = random.Random(7)
+    queries = [(rng.choice(theme_names + hicolor_names + [f"missing-{i}" for i in range(100)]),
+                rng.choice((24, 32, 48, 64))) for _ in range(300)]
+
+    start = time.perf_counter()
+    legacy_results = [legacy_lookup(name, size) for name, size in queries]
+    legacy = (time.perf_counter() - start) / len(queries)
+
+    index_file = work_dir / "icon_theme_index.json"
+    index = IconThemeIndex("Synthetic", index_file=str(index_file), search_paths=[str(base)], pixmap_dirs=[])
+    start = time.perf_counter()
+    index.lookup("app-0", 48)
+    cold = time.perf_counter() - start
+
+    reloaded = IconThemeIndex("Synthetic", index_file=str(index_file), search_paths=[str(base)], pixmap_dirs=[])
+    start = time.perf_counter()
+    reloaded.lookup("app-0", 48)
+    warm = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [index.lookup(name, size) for name, size in queries]
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    same = sum(1 for a, b in zip(legacy_results, results) if a == b)
+    print(f"逐目录查找: {legacy * 1000:.3f} ms/次")
+    print(f"索引: 建立 {cold * 1000:.0f} ms, 从磁盘加载 {warm * 1000:.0f} ms "
+          f"(索引文件 {index_file.stat().st_size / 1024:.0f} KB), 查找 {indexed * 1000:.4f} ms/次, "
+          f"加速 {legacy / indexed:.0f}x")
+    print(f"结果一致: {same}/{len(queries)}, {index.get_stats()}")
+
+    # 安装新图标后目录修改时间变化，下一次检查时重建
+    (base / "Synthetic" / "48x48" / "apps" / "new-app.png").touch()
+    index._last_check = 0.0
+    print(f"新增图标: {index.lookup('new-app', 48)}, 重建次数 {index.stats['builds']}")
+    shutil.rmtree(work_dir, ignore_errors=True)
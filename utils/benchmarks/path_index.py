@@ -0,0 +1,88 @@
+"""
+基准测试：30%应用不存在的目录，统计每次图标请求的文件系统调用次数
+
+用法:
+    python -m utils.benchmarks.path_index
+"""
+
+import os
+import time
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+from core.path_index import SystemPathIndex, _system_dirs
+
+
+if __name__ == "__main__":
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_path_index_"))
+    path_dirs = []
+    for i in range(16):
+        directory = work_dir / f"path_{i}"
+        directory.mkdir()
+        for j in range(50):
+            (directory / f"tool_{i}_{j}").touch()
+        path_dirs.append(str(directory))
+    os.environ["PATH"] = os.pathsep.join(path_dirs)
+
+    apps_dir = work_dir / "apps"
+    apps_dir.mkdir()
+    catalog = []
+    for i in range(1000):
+        app_path = apps_dir / f"app_{i}"
+        if i % 10 < 3:
+            # 不存在的应用，其中一部分能在PATH中按文件名找到
+            catalog.append(str(work_dir / "removed" / (f"tool_{i % 16}_{i % 50}" if i % 2 else f"gone_{i}")))
+        else:
+            app_path.touch()
+            catalog.append(str(app_path))
+
+    counts = {'stat': 0, 'scandir': 0}
+    real_stat, real_scandir = os.stat, os.scandir
+
+    def counting_stat(*args, **kwargs):
+        counts['stat'] += 1
+        return real_stat(*args, **kwargs)
+
+    def counting_scandir(*args, **kwargs):
+        counts['scandir'] += 1
+        return real_scandir(*args, **kwargs)
+
+    os.stat, os.scandir = counting_stat, counting_scandir
+
+    def legacy_resolve(path: str) -> Optional[str]:
+        """原实现：每次请求检查系统目录和PATH中的每个目录"""
+        if os.path.exists(path):
+            return path
+        basename = os.path.basename(path)
+        for directory in _system_dirs() + os.environ.get("PATH", "").split(os.pathsep):
+            if directory and os.path.exists(directory):
+                candidate = os.path.join(directory, basename)
+                if os.path.exists(candidate):
+                    return candidate
+        return None
+
+    index = SystemPathIndex()
+    missing: Dict[str, tuple] = {}
+
+    def indexed_resolve(path: str) -> Optional[str]:
+        """新实现：不存在的路径走负缓存和文件名索引"""
+        cached = missing.get(path)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        if os.path.exists(path):
+            return path
+        result = index.lookup(path)
+        missing[path] = (time.monotonic() + 30.0, result)
+        return result
+
+    for name, resolve in (("逐目录检查", legacy_resolve), ("索引+负缓存", indexed_resolve)):
+        for relayout in range(3):
+            counts.update(stat=0, scandir=0)
+            start = time.perf_counter()
+            results = [resolve(path) for path in catalog]
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name} 第{relayout + 1}次布局: stat {counts['stat'] / len(catalog):.2f} 次/请求, "
+                  f"scandir {counts['scandir']}, {elapsed:.1f} ms, 找到 {sum(1 for r in results if r)}")
+
+    os.stat, os.scandir = real_stat, real_scandir
@@ -0,0 +1,72 @@
+"""
+基准测试：模拟慢速文件系统（每次stat注入延迟），比较每次检查与读取缓存
+
+用法:
+    python -m utils.benchmarks.path_status
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+from PySide6.QtCore import QTimer
+from core.path_status import PathStatusCache
+
+
+if __name__ == "__main__":
+    from PySide6.QtCore import QCoreApplication
+
+    app = QCoreApplication(sys.argv)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_path_status_"))
+    paths = []
+    for i in range(300):
+        app_dir = work_dir / f"dir_{i % 12}"
+        app_dir.mkdir(exist_ok=True)
+        app_path = app_dir / f"app_{i}.exe"
+        if i % 10:
+            app_path.touch()
+        paths.append(str(app_path))
+
+    stat_latency = 0.002  # 2 ms，相当于较慢的网络驱动器
+    real_stat = os.stat
+
+    def slow_stat(*args, **kwargs):
+        time.sleep(stat_latency)
+        return real_stat(*args, **kwargs)
+
+    os.stat = slow_stat
+
+    # 一次列表刷新 + 20次搜索按键，每次返回全部应用
+    calls = 21
+    start = time.perf_counter()
+    for _ in range(calls):
+        flags = [os.path.exists(path) for path in paths]
+    direct = time.perf_counter() - start
+
+    cache = PathStatusCache()
+    start = time.perf_counter()
+    cache.track(paths)
+    prime = time.perf_counter() - start
+
+    stat_calls_before = cache.stats['stat_calls']
+    start = time.perf_counter()
+    for _ in range(calls):
+        cached_flags = [cache.exists(path) for path in paths]
+    cached = time.perf_counter() - start
+
+    os.stat = real_stat
+    print(f"{len(paths)} 个应用 × {calls} 次列表/搜索, stat延迟 {stat_latency * 1000:.0f} ms")
+    print(f"每次检查: {direct * 1000:.0f} ms")
+    print(f"缓存: 首次跟踪 {prime * 1000:.0f} ms, 之后 {cached * 1000:.2f} ms, "
+          f"stat调用 {cache.stats['stat_calls'] - stat_calls_before}, 结果一致: {flags == cached_flags}")
+
+    # 删除一个应用，确认目录监视能更新状态
+    Path(paths[1]).unlink()
+    cache.status_changed.connect(lambda changed: (print(f"状态变化: {len(changed)} 个路径"), app.quit()))
+    QTimer.singleShot(3000, app.quit)
+    app.exec()
+    print(f"删除后状态: exists={cache.exists(paths[1])}, {cache.get_stats()}")
+    cache.shutdown()
@@ -0,0 +1,45 @@
+"""
+基准测试：1000个不存在文件的请求风暴，每次绘制 与 共享缓存
+
+用法:
+    python -m utils.benchmarks.placeholder_icons
+"""
+
+import os
+import sys
+import time
+import random
+
+from core.placeholder_icons import FILETYPE_COLORS, PlaceholderIcons
+
+
+if __name__ == "__main__":
+    from PySide6.QtGui import QGuiApplication
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication(sys.argv)
+
+    rng = random.Random(42)
+    extensions = list(FILETYPE_COLORS) + ['.txt', '.sh', '']
+    requests = [(rng.choice(extensions), rng.choice((32, 48, 64))) for _ in range(1000)]
+
+    placeholders = PlaceholderIcons()
+
+    start = time.perf_counter()
+    for ext, size in requests:
+        placeholders.render('filetype', size, ext)
+    uncached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    placeholders._prewarm_job(PlaceholderIcons.COMMON_SIZES, 1.0)
+    prewarm = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for ext, size in requests:
+        placeholders.get('filetype', size, ext)
+    cached = time.perf_counter() - start
+
+    print(f"每次绘制: {uncached * 1000:.1f} ms ({len(requests) / uncached:.0f} 个/秒)")
+    print(f"启动预绘制: {prewarm * 1000:.1f} ms")
+    print(f"共享缓存: {cached * 1000:.2f} ms ({len(requests) / cached:.0f} 个/秒), "
+          f"加速 {uncached / cached:.0f}x, {placeholders.get_stats()}")
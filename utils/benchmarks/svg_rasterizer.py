@@ -0,0 +1,76 @@
+"""
+基准测试：一组复杂SVG在 16/32/48/64/96/128 px（以及2倍设备像素比）下的光栅化时间
+
+用法:
+    python -m utils.benchmarks.svg_rasterizer
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from PySide6.QtGui import QImage
+from core.svg_rasterizer import SvgRasterizer
+
+
+if __name__ == "__main__":
+    from PySide6.QtGui import QGuiApplication, QIcon
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication(sys.argv)
+
+    rng = random.Random(3)
+    work_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_svg_"))
+    paths = []
+    for i in range(24):
+        shapes = []
+        for j in range(400):
+            points = " ".join(f"{rng.uniform(0, 256):.1f},{rng.uniform(0, 256):.1f}" for _ in range(6))
+            shapes.append(f'<path d="M{points.split()[0]} C{" ".join(points.split()[1:4])} '
+                          f'S{" ".join(points.split()[4:6])} Z" fill="url(#g{j % 8})" '
+                          f'fill-opacity="0.5" stroke="#{rng.randrange(0xFFFFFF):06x}" stroke-width="1.5"/>')
+        gradients = "".join(
+            f'<radialGradient id="g{k}"><stop offset="0" stop-color="#{rng.randrange(0xFFFFFF):06x}"/>'
+            f'<stop offset="1" stop-color="#{rng.randrange(0xFFFFFF):06x}"/></radialGradient>'
+            for k in range(8))
+        path = work_dir / f"icon_{i}.svg"
+        path.write_text(f'<svg xmlns="http://www.w3.org/2000/svg" width="256" height="256" viewBox="0 0 256 256">'
+                        f'<defs>{gradients}</defs>{"".join(shapes)}</svg>', encoding='utf-8')
+        paths.append(str(path))
+
+    sizes = (16, 32, 48, 64, 96, 128)
+
+    def run(render, dpr: float = 1.0) -> Dict[int, float]:
+        timings = {}
+        for size in sizes:
+            start = time.perf_counter()
+            for path in paths:
+                render(path, size, dpr)
+            timings[size] = (time.perf_counter() - start) * 1000 / len(paths)
+        return timings
+
+    def qicon_render(path: str, size: int, dpr: float) -> QImage:
+        """原方式：每次请求都通过QIcon解析并光栅化"""
+        return QIcon(path).pixmap(size, size).toImage()
+
+    def fmt(timings: Dict[int, float]) -> str:
+        return ", ".join(f"{size}px {ms:.2f}" for size, ms in timings.items())
+
+    rasterizer = SvgRasterizer()
+    print(f"{len(paths)} 个复杂SVG（每个400条路径），每个尺寸的平均耗时 (ms/图标)")
+    print(f"QIcon每次解析: {fmt(run(qicon_render))}")
+    print(f"首次（解析一次+按档位光栅化）: {fmt(run(rasterizer.render))}")
+    print(f"再次请求（光栅缓存）: {fmt(run(rasterizer.render))}")
+    # 悬停放大1.5倍：48px -> 72px，与96px档位共用光栅图
+    start = time.perf_counter()
+    for path in paths:
+        rasterizer.render(path, 72)
+    print(f"悬停尺寸 72px: {(time.perf_counter() - start) * 1000 / len(paths):.2f}")
+    print(f"设备像素比2.0: {fmt(run(rasterizer.render, 2.0))}")
+    print(rasterizer.get_stats())
+    shutil.rmtree(work_dir, ignore_errors=True)
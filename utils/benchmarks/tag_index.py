@@ -0,0 +1,95 @@
+"""
+基准测试：10万个应用、500个标签，组合筛选（与/或/非 + 收藏 + 最近使用）和全部标签的分面计数，
+与逐个应用判断的扫描方式比较，并核对结果一致
+
+用法:
+    python -m utils.benchmarks.tag_index
+"""
+
+import time
+import random
+import statistics
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from core.tag_index import DAY_SECONDS, TagIndex
+
+
+if __name__ == "__main__":
+    @dataclass
+    class BenchApp:
+        """与AppConfig中被索引的字段相同"""
+        tags: List[str] = field(default_factory=list)
+        favorite: bool = False
+        last_used: float = 0.0
+
+    rng = random.Random(50)
+    now = time.time()
+    tag_names = [f"tag{i:03d}" for i in range(500)]
+    # 标签热度不均匀：少数标签很常用
+    weights = [1 / (rank + 1) for rank in range(len(tag_names))]
+    apps = {}
+    for i in range(100000):
+        tags = list(dict.fromkeys(rng.choices(tag_names, weights, k=rng.randint(1, 5))))
+        last_used = now - rng.uniform(0, 60 * DAY_SECONDS) if rng.random() < 0.3 else 0.0
+        apps[f"app-{i}"] = BenchApp(tags=tags, favorite=rng.random() < 0.1, last_used=last_used)
+
+    start = time.perf_counter()
+    index = TagIndex()
+    index.rebuild(apps)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = {
+        "tag001 与 tag002": {'tags_all': ["tag001", "tag002"]},
+        "(tag003 或 tag010 或 tag100) 且收藏": {'tags_any': ["tag003", "tag010", "tag100"], 'favorite': True},
+        "tag000 非 tag001 且最近使用": {'tags_all': ["tag000"], 'tags_none': ["tag001"], 'recent': True},
+        "未收藏 且最近使用 且 (tag005 或 tag006) 非 tag000": {
+            'tags_any': ["tag005", "tag006"], 'tags_none': ["tag000"], 'favorite': False, 'recent': True},
+        "非 tag000": {'tags_none': ["tag000"]},
+    }
+
+    def matches(app: BenchApp, filters: Dict[str, Any]) -> bool:
+        """扫描方式：逐个应用判断"""
+        tags = set(app.tags)
+        if not all(tag in tags for tag in filters.get('tags_all', ())):
+            return False
+        if filters.get('tags_any') and not any(tag in tags for tag in filters['tags_any']):
+            return False
+        if any(tag in tags for tag in filters.get('tags_none', ())):
+            return False
+        if filters.get('favorite') is not None and app.favorite != filters['favorite']:
+            return False
+        if filters.get('recent') is not None:
+            if (app.last_used > now - 7 * DAY_SECONDS) != filters['recent']:
+                return False
+        return True
+
+    def timed(func, repeat: int = 5) -> Tuple[float, Any]:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), result
+
+    print(f"{len(apps)} 个应用, {len(index.tags())} 个标签, 建立索引 {build_ms:.0f} ms")
+    all_same = True
+    for name, filters in queries.items():
+        scan_ms, scan_ids = timed(lambda: [app_id for app_id, app in apps.items() if matches(app, filters)])
+        mask_ms, mask = timed(lambda: index.filter_mask(filters, now))
+        ids_ms, ids = timed(lambda: index.ids(index.filter_mask(filters, now)))
+        facet_ms, facets = timed(lambda: index.facets(index.filter_mask(filters, now), now=now))
+        scan_facet_ms, counter = timed(lambda: Counter(
+            tag for app_id in scan_ids for tag in apps[app_id].tags))
+        same = ids == scan_ids and facets['total'] == len(scan_ids) and all(
+            counter[item['tag']] == item['count'] for item in facets['tags'])
+        all_same = all_same and same
+        print(f"{name}: {len(ids)} 个结果 | 扫描 {scan_ms:.1f} ms, 位图 {mask_ms:.3f} ms, "
+              f"位图+应用ID {ids_ms:.2f} ms | 分面计数 扫描 {scan_facet_ms:.1f} ms, "
+              f"位图 {facet_ms:.2f} ms（{len(facets['tags'])} 个标签） | 一致: {same}")
+
+    # 更新单个应用（如启动后最后使用时间变化、切换收藏）
+    update_ms, _ = timed(lambda: index.update("app-5", BenchApp(tags=["tag001"], favorite=True, last_used=now)), 20)
+    print(f"单个应用更新 {update_ms:.3f} ms, {index.get_stats()}")
+    print("通过" if all_same else "失败")
@@ -0,0 +1,40 @@
+"""
+基准测试：1000个单元格的重新布局耗时
+
+用法:
+    python -m utils.benchmarks.window_algorithm
+"""
+
+import time
+
+from core.window_algorithm import NUMPY_AVAILABLE, WindowAlgorithm
+
+
+if __name__ == "__main__":
+    algorithm = WindowAlgorithm()
+    iterations = 200
+
+    for rows, cols in [(20, 50), (10, 100)]:
+        app_count = rows * cols
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            algorithm.clear_cache()
+            algorithm.compute_grid_layout(app_count, rows, cols, "bottom_center", 48, 10, True)
+        layout_time = (time.perf_counter() - start) / iterations
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            algorithm.clear_cache()
+            algorithm.build_position_table(app_count, rows, cols, "bottom_center", 48, 10, True)
+        table_time = (time.perf_counter() - start) / iterations
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            algorithm.build_position_table(app_count, rows, cols, "bottom_center", 48, 10, True)
+        cached_time = (time.perf_counter() - start) / iterations
+
+        print(f"{rows}x{cols} ({app_count}个单元格), NumPy: {NUMPY_AVAILABLE}")
+        print(f"  字典布局: {layout_time * 1000:.3f} ms")
+        print(f"  位置表:   {table_time * 1000:.3f} ms")
+        print(f"  缓存命中: {cached_time * 1e6:.2f} us")
@@ -0,0 +1,825 @@
+"""
+QML界面性能基准测试
+在无界面（offscreen）环境下加载快捷窗口和应用管理界面，
+测量首帧时间、行列变化后的重新布局时间、搜索按键延迟和到第一批搜索结果的延迟、悬停动画帧时间和内存峰值，
+以及分页翻页耗时、滚动帧时间和实际创建的委托数量（虚拟化后应与应用总数无关），
+主窗口在实时模糊和预渲染背景两种模式下的单帧渲染时间和空闲CPU占用；
+并检查位置变化、行数变化各只发出一次config_updated、只写入一次配置（不符合时退出码为1）。
+
+每个应用数量在独立的子进程中运行（ConfigManager是单例，且便于统计内存峰值），
+配置文件写入临时目录，不会影响项目的config目录。
+
+另有单独运行的检查（失败时退出码为1）：
+    dpr    加载实际的快捷窗口，检查图标请求附带屏幕设备像素比，切换屏幕时不重新提取图标
+    hover  加载实际的快捷窗口，鼠标扫过全部图标，检查可见图标已预取、悬停时不再请求图标提供者
+
+用法:
+    python -m utils.qml_benchmark
+    python -m utils.qml_benchmark --sizes 10 1000 10000 --output benchmark.json
+    python -m utils.qml_benchmark --check dpr
+    python -m utils.qml_benchmark --check hover
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# 搜索时依次输入的查询（模拟逐字输入）
+SEARCH_KEYSTROKES = ["a", "ap", "app", "app ", "app 1", "app 12", "app 1", "app", ""]
+
+
+def _summarize(samples: List[float]) -> Dict[str, Any]:
+    """汇总耗时样本（毫秒）"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.mean(ordered), 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[p95_index], 3),
+        "max_ms": round(ordered[-1], 3)
+    }
+
+
+def _peak_rss_mb() -> float:
+    """获取当前进程的内存峰值（MB）"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS返回字节，Linux返回KB
+        return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 2)
+    except ImportError:
+        import psutil
+        memory_info = psutil.Process(os.getpid()).memory_info()
+        peak = getattr(memory_info, "peak_wset", memory_info.rss)
+        return round(peak / (1024 * 1024), 2)
+
+
+def write_synthetic_config(config_dir: Path, app_count: int, rows: int = 2, cols: int = 10,
+                           paths: Optional[List[str]] = None):
+    """生成包含指定数量应用的配置文件，paths指定时应用依次使用其中的路径（否则都使用Python解释器）"""
+    config_dir.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    apps = {}
+    app_ids = []
+
+    for i in range(app_count):
+        app_id = str(uuid.uuid4())
+        app_ids.append(app_id)
+        apps[app_id] = {
+            "name": f"App {i}",
+            "path": paths[i % len(paths)] if paths else sys.executable,
+            "icon_path": "",
+            "arguments": "",
+            "working_dir": "",
+            "description": f"Synthetic application {i}",
+            "tags": [f"tag{i % 20}", f"group{i % 7}"],
+            "added_time": now - i,
+            "last_used": now - i * 60,
+            "usage_count": i % 50,
+            "id": app_id,
+            "favorite": i % 10 == 0
+        }
+
+    config = {
+        "version": "1.0.0",
+        "apps": apps,
+        "quick_window": {
+            "auto_start": True,
+            "show_on_startup": True,
+            "show_labels": True,
+            "position": "bottom_center",
+            "app_order": app_ids[:rows * cols],
+            "rows": rows,
+            "cols": cols
+        },
+        "settings": {
+            "auto_save": True,
+            "min_save_interval": 0
+        }
+    }
+
+    with open(config_dir / "config.json", "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False)
+
+
+def _run_worker(app_count: int, config_dir: str) -> Dict[str, Any]:
+    """在当前进程中加载QML并测量，返回结果字典"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["QUICKLAUNCHER_CONFIG_DIR"] = config_dir
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+    from PySide6.QtCore import QUrl, QTimer, QEventLoop, QPoint, QObject
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtQml import QQmlApplicationEngine
+    from PySide6.QtQuick import QQuickWindow, QSGRendererInterface
+    from PySide6.QtTest import QTest
+
+    # 软件渲染，保证在没有GPU的环境中结果可复现
+    QQuickWindow.setGraphicsApi(QSGRendererInterface.GraphicsApi.Software)
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    from ui.main_window import MainWindowBackend
+    from ui.quick_window import QuickWindowBackend
+    from ui.icon_provider_safe import SafeIconProvider
+    from utils.resource_path import get_qml_path
+
+    def wait_for_frame(window, start: float, timeout_ms: int = 5000) -> Optional[float]:
+        """等待下一帧渲染完成，返回从start开始的耗时（毫秒）"""
+        loop = QEventLoop()
+        swapped = []
+        timer = QTimer()
+        timer.setSingleShot(True)
+        timer.timeout.connect(loop.quit)
+
+        def on_frame():
+            swapped.append(time.perf_counter())
+            loop.quit()
+
+        window.frameSwapped.connect(on_frame)
+        timer.start(timeout_ms)
+        window.update()
+        loop.exec()
+        timer.stop()
+        window.frameSwapped.disconnect(on_frame)
+        return (swapped[0] - start) * 1000 if swapped else None
+
+    def settle(ms: int = 50):
+        """处理事件，等待界面稳定"""
+        loop = QEventLoop()
+        QTimer.singleShot(ms, loop.quit)
+        loop.exec()
+
+    result: Dict[str, Any] = {"apps": app_count}
+
+    start = time.perf_counter()
+    main_backend = MainWindowBackend()
+    quick_backend = QuickWindowBackend()
+    result["backend_init_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    # 快捷窗口
+    engine = QQmlApplicationEngine()
+    engine.rootContext().setContextProperty("mainWindowBackend", main_backend)
+    engine.rootContext().setContextProperty("quickWindowBackend", quick_backend)
+    engine.addImageProvider("icon", SafeIconProvider())
+
+    start = time.perf_counter()
+    engine.load(QUrl.fromLocalFile(get_qml_path("QuickWindow.qml")))
+    if not engine.rootObjects():
+        raise RuntimeError("加载QuickWindow.qml失败")
+    quick_window = engine.rootObjects()[0]
+    quick_window.setProperty("visible", True)
+    quick_result: Dict[str, Any] = {
+        "startup_to_first_frame_ms": wait_for_frame(quick_window, start)
+    }
+    settle()
+
+    # 行列变化后的重新布局
+    relayout_samples = []
+    for cols in [9, 10, 8, 10, 5, 10] * 3:
+        start = time.perf_counter()
+        quick_backend.update_window_config("cols", cols)
+        elapsed = wait_for_frame(quick_window, start)
+        if elapsed is not None:
+            relayout_samples.append(elapsed)
+    quick_result["relayout"] = _summarize(relayout_samples)
+
+    # 单个配置项变化时的绑定求值次数（配置对象属性被读取的次数）
+    config_object = quick_backend.configObject
+    binding_reads = {}
+    for key, value in [("opacity", 0.8), ("background_color", "#202020"), ("icon_size", 56)]:
+        settle()
+        config_object.reset_read_counts()
+        start = time.perf_counter()
+        quick_backend.config_manager.update_quick_config(**{key: value})
+        elapsed = wait_for_frame(quick_window, start)
+        binding_reads[key] = {
+            "frame_ms": elapsed,
+            "total_reads": sum(config_object.read_counts.values()),
+            "reads": dict(config_object.read_counts)
+        }
+    quick_result["config_change_bindings"] = binding_reads
+
+    # 每个用户操作的config_updated发出次数和配置写入次数：位置变化、行数变化都应恰好各一次
+    config_manager = quick_backend.config_manager
+    emissions = []
+    quick_backend.config_updated.connect(lambda config, changed_keys: emissions.append(changed_keys))
+
+    def change_position():
+        position = "top_center" if config_object.property("position") != "top_center" else "bottom_center"
+        config_object.setProperty("position", position)
+
+    def change_rows():
+        quick_backend.update_window_config("rows", 3 if config_manager.quick_config.rows != 3 else 2)
+
+    action_counts = {}
+    for action, apply_action in [("position", change_position), ("rows", change_rows)]:
+        settle(300)
+        emissions.clear()
+        writes_before = config_manager.save_write_count
+        apply_action()
+        # 覆盖原实现中10/50/100 ms后的延迟恢复
+        settle(300)
+        action_counts[action] = {
+            "config_updated": len(emissions),
+            "changed_keys": emissions[0] if emissions else [],
+            "save_writes": config_manager.save_write_count - writes_before
+        }
+        if len(emissions) != 1 or action_counts[action]["save_writes"] != 1:
+            result.setdefault("failures", []).append(
+                f"{action}变化: config_updated {len(emissions)} 次, 保存 {action_counts[action]['save_writes']} 次（应各1次）")
+    quick_result["config_action_counts"] = action_counts
+
+    # 悬停动画期间的帧时间：鼠标横向扫过图标
+    frame_times = []
+    last_frame = [None]
+
+    def record_frame():
+        now = time.perf_counter()
+        if last_frame[0] is not None:
+            frame_times.append((now - last_frame[0]) * 1000)
+        last_frame[0] = now
+
+    quick_window.frameSwapped.connect(record_frame)
+    width = max(1, quick_window.width())
+    center_y = quick_window.height() // 2
+    for step in range(60):
+        x = int((step % 30) / 30 * width)
+        QTest.mouseMove(quick_window, QPoint(x, center_y))
+        quick_window.update()
+        settle(16)
+    quick_window.frameSwapped.disconnect(record_frame)
+    quick_result["hover_frame_times"] = _summarize(frame_times)
+
+    # 分页模式：所有应用加入快捷窗口，滚轮翻页只替换一页应用
+    all_ids = [app.get("id") for app in quick_backend.get_apps()]
+    quick_backend.config_manager.update_quick_config(app_order=all_ids, paged=True)
+    settle()
+    page_samples = []
+    for _ in range(min(30, max(0, quick_backend.pageCount - 1))):
+        start = time.perf_counter()
+        quick_backend.next_page()
+        elapsed = wait_for_frame(quick_window, start)
+        if elapsed is not None:
+            page_samples.append(elapsed)
+    quick_result["paging"] = {
+        "page_count": quick_backend.pageCount,
+        "page_flip": _summarize(page_samples),
+        "delegates": quick_backend.quickAppsModel.count
+    }
+    result["quick_window"] = quick_result
+
+    # 应用管理界面
+    management_engine = QQmlApplicationEngine()
+    management_engine.rootContext().setContextProperty("mainWindowBackend", main_backend)
+    management_engine.rootContext().setContextProperty("quickWindowBackend", quick_backend)
+    management_engine.addImageProvider("icon", SafeIconProvider())
+    component_url = QUrl.fromLocalFile(get_qml_path("components/AppManagement.qml")).toString()
+    wrapper = (
+        "import QtQuick\n"
+        "import QtQuick.Controls\n"
+        "ApplicationWindow {\n"
+        "    width: 1000; height: 700; visible: true\n"
+        f"    Loader {{ anchors.fill: parent; source: \"{component_url}\" }}\n"
+        "}\n"
+    )
+
+    start = time.perf_counter()
+    management_engine.loadData(wrapper.encode("utf-8"))
+    if not management_engine.rootObjects():
+        raise RuntimeError("加载AppManagement.qml失败")
+    management_window = management_engine.rootObjects()[0]
+    management_result: Dict[str, Any] = {
+        "startup_to_first_frame_ms": wait_for_frame(management_window, start)
+    }
+    settle()
+
+    # 查询 -> 收到第一批结果的时间（按键前清空）
+    search_arrivals: Dict[str, float] = {}
+    main_backend.search_results_changed.connect(
+        lambda query, count, finished: search_arrivals.setdefault(query, time.perf_counter()))
+
+    def wait_for_search(query: str, timeout_ms: int = 5000) -> bool:
+        """等待后端交出该查询的第一批搜索结果"""
+        deadline = time.perf_counter() + timeout_ms / 1000
+        while query not in search_arrivals and time.perf_counter() < deadline:
+            settle(1)
+        return query in search_arrivals
+
+    # 搜索按键延迟：从修改输入框文本到下一帧渲染完成（搜索在后台进行，不阻塞这一帧），
+    # 以及到显示第一批搜索结果的那一帧
+    search_input = None
+    for child in management_window.findChildren(QObject):
+        if child.property("placeholderText") == "搜索应用...":
+            search_input = child
+            break
+
+    search_samples = []
+    first_result_samples = []
+    if search_input is not None:
+        for _ in range(3):
+            for query in SEARCH_KEYSTROKES:
+                search_arrivals.clear()
+                start = time.perf_counter()
+                search_input.setProperty("text", query)
+                elapsed = wait_for_frame(management_window, start)
+                if elapsed is not None:
+                    search_samples.append(elapsed)
+                if wait_for_search(query):
+                    elapsed = wait_for_frame(management_window, start)
+                    if elapsed is not None:
+                        first_result_samples.append(elapsed)
+    management_result["search_keystroke"] = _summarize(search_samples)
+    management_result["search_first_result"] = _summarize(first_result_samples)
+    settle()
+
+    # 滚动整个列表：委托被回收复用，创建的委托数量只取决于可见高度和cacheBuffer
+    list_view = management_window.findChild(QObject, "appListView")
+    if list_view is not None:
+        content_item = list_view.property("contentItem")
+        management_result["delegates_initial"] = len(content_item.childItems())
+        scroll_samples = []
+        content_height = list_view.property("contentHeight") or 0
+        view_height = list_view.property("height") or 1
+        max_y = max(0.0, content_height - view_height)
+        for step in range(1, 41):
+            start = time.perf_counter()
+            list_view.setProperty("contentY", max_y * step / 40)
+            elapsed = wait_for_frame(management_window, start)
+            if elapsed is not None:
+                scroll_samples.append(elapsed)
+        management_result["scroll_frame_times"] = _summarize(scroll_samples)
+        management_result["delegates_after_scroll"] = len(content_item.childItems())
+    result["app_management"] = management_result
+
+    # 主窗口背景：实时模糊 与 预渲染背景 对比
+    from PySide6.QtGui import QImage, QPainter, QLinearGradient, QColor
+
+    background_path = str(Path(config_dir) / "benchmark_background.png")
+    gradient_image = QImage(1920, 1080, QImage.Format_RGB32)
+    painter = QPainter(gradient_image)
+    gradient = QLinearGradient(0, 0, 1920, 1080)
+    gradient.setColorAt(0, QColor("#2b5876"))
+    gradient.setColorAt(1, QColor("#4e4376"))
+    painter.fillRect(gradient_image.rect(), gradient)
+    painter.end()
+    gradient_image.save(background_path)
+
+    main_engine = QQmlApplicationEngine()
+    main_engine.rootContext().setContextProperty("mainWindowBackend", main_backend)
+    main_engine.rootContext().setContextProperty("quickWindowBackend", quick_backend)
+    main_engine.addImageProvider("icon", SafeIconProvider())
+    main_backend.config_manager.update_main_window_config(background_image=background_path, static_background=False)
+    main_engine.load(QUrl.fromLocalFile(get_qml_path("MainWindow.qml")))
+    if not main_engine.rootObjects():
+        raise RuntimeError("加载MainWindow.qml失败")
+    main_window = main_engine.rootObjects()[0]
+    settle(200)
+
+    def measure_main_window(static_background: bool) -> Dict[str, Any]:
+        """测量空闲时的帧数和CPU占用，以及强制重绘时每帧的渲染耗时"""
+        main_backend.config_manager.update_main_window_config(static_background=static_background)
+        deadline = time.perf_counter() + 10
+        while static_background and not main_backend.blurredBackground and time.perf_counter() < deadline:
+            settle(50)
+        settle(500)
+
+        # 空闲：不做任何交互
+        idle_frames = []
+
+        def count_idle_frame():
+            idle_frames.append(time.perf_counter())
+
+        main_window.frameSwapped.connect(count_idle_frame)
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        settle(2000)
+        cpu_percent = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start) * 100
+        main_window.frameSwapped.disconnect(count_idle_frame)
+
+        # 强制重绘：统计beforeRendering到afterRendering之间的耗时
+        render_samples = []
+        render_start = [0.0]
+
+        def before_rendering():
+            render_start[0] = time.perf_counter()
+
+        def after_rendering():
+            render_samples.append((time.perf_counter() - render_start[0]) * 1000)
+
+        main_window.beforeRendering.connect(before_rendering)
+        main_window.afterRendering.connect(after_rendering)
+        for _ in range(60):
+            main_window.update()
+            settle(16)
+        main_window.beforeRendering.disconnect(before_rendering)
+        main_window.afterRendering.disconnect(after_rendering)
+
+        return {
+            "blurred_background": bool(main_backend.blurredBackground),
+            "idle_frames_2s": len(idle_frames),
+            "idle_cpu_percent": round(cpu_percent, 2),
+            "render_frame": _summarize(render_samples)
+        }
+
+    result["main_window"] = {
+        "live_blur": measure_main_window(False),
+        "static_background": measure_main_window(True),
+        "background_cache": main_backend.background_cache.get_stats()
+    }
+
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result["layout_stats"] = quick_backend.get_performance_stats()
+
+    main_engine.deleteLater()
+    management_engine.deleteLater()
+    engine.deleteLater()
+    return result
+
+
+def _write_icon_files(directory: Path, count: int) -> List[str]:
+    """生成测试用的PNG图标，一半的文件名包含空格、#、%和?（覆盖请求ID的URL编码）"""
+    from PySide6.QtGui import QImage, QColor
+
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        image = QImage(256, 256, QImage.Format.Format_ARGB32)
+        image.fill(QColor.fromHsv(i * 17 % 360, 200, 220))
+        path = directory / (f"icon {i} #{i} 100%?.png" if i % 2 else f"icon_{i}.png")
+        image.save(str(path), "PNG")
+        paths.append(str(path))
+    return paths
+
+
+def _load_quick_window(provider):
+    """按main.py中的接法加载实际的QuickWindow.qml，返回 (快捷窗口后端, 引擎, 窗口)"""
+    from PySide6.QtCore import QUrl
+    from PySide6.QtQml import QQmlApplicationEngine
+    from ui.quick_window import QuickWindowBackend
+    from utils.resource_path import get_qml_path
+
+    quick_backend = QuickWindowBackend()
+    engine = QQmlApplicationEngine()
+    engine.rootContext().setContextProperty("quickWindowBackend", quick_backend)
+    engine.rootContext().setContextProperty("mainWindowBackend", None)
+    engine.addImageProvider("icon", provider)
+    quick_backend.set_icon_provider(provider)
+    engine.load(QUrl.fromLocalFile(get_qml_path("QuickWindow.qml")))
+    if not engine.rootObjects():
+        raise RuntimeError("加载QuickWindow.qml失败")
+    quick_window = engine.rootObjects()[0]
+    quick_window.setProperty("visible", True)
+    return quick_backend, engine, quick_window
+
+
+def _pump(ms: int):
+    """处理事件"""
+    from PySide6.QtCore import QTimer, QEventLoop
+
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def check_icon_dpr(work_dir: Path) -> List[str]:
+    """设备像素比检查，返回失败项
+
+    offscreen平台下用QT_SCALE_FACTOR模拟高DPI屏幕，加载实际的QuickWindow.qml，
+    检查委托发出的请求ID附带屏幕设备像素比、解码后是应用路径（含特殊字符）、返回的图标尺寸和设备像素比正确；
+    之后用委托的请求ID模拟窗口在1倍屏幕和高DPI屏幕之间来回移动，不应重新提取图标
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("QT_SCALE_FACTOR", "2")
+    # ConfigManager是单例，需在创建后端之前指向临时配置目录
+    os.environ["QUICKLAUNCHER_CONFIG_DIR"] = str(work_dir / "config")
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+    from PySide6.QtCore import QSize
+    from PySide6.QtWidgets import QApplication
+    from ui.icon_provider_safe import SafeIconProvider
+    from ui.quick_window import QuickWindowBackend
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    screen_dpr = app.primaryScreen().devicePixelRatio()
+
+    rows, cols = 2, 10
+    paths = _write_icon_files(work_dir / "icons", rows * cols)
+    write_synthetic_config(work_dir / "config", len(paths), rows, cols, paths=paths)
+
+    class RecordingIconProvider(SafeIconProvider):
+        """记录委托发出的请求 (请求ID, 请求尺寸, 返回的图标)"""
+
+        def __init__(self, cache_dir: str):
+            super().__init__(cache_dir=cache_dir)
+            self.requests = []
+
+        def requestPixmap(self, id, size, requestedSize):
+            pixmap = super().requestPixmap(id, size, requestedSize)
+            self.requests.append((id, QSize(requestedSize), pixmap))
+            return pixmap
+
+    provider = RecordingIconProvider(cache_dir=str(work_dir / "cache"))
+    quick_backend, engine, quick_window = _load_quick_window(provider)
+
+    # 每个可见应用的委托加载静止和悬停两个尺寸
+    quick_config = quick_backend.config_manager.quick_config
+    icon_size = quick_config.icon_size or 48
+    hover_size = QuickWindowBackend.hover_icon_size(icon_size, quick_config.hover_scale)
+    expected_requests = quick_backend.quickAppsModel.rowCount() * 2
+    deadline = time.perf_counter() + 10
+    while len(provider.requests) < expected_requests and time.perf_counter() < deadline:
+        _pump(20)
+    _pump(200)
+    delegate_requests = list(provider.requests)
+
+    failures = []
+    if screen_dpr == 1.0:
+        failures.append("屏幕设备像素比为1，无法模拟高DPI屏幕")
+    if not 0 < expected_requests <= len(delegate_requests):
+        failures.append(f"委托只发出了 {len(delegate_requests)}/{expected_requests} 个请求")
+
+    pixel_sizes = {round(icon_size * screen_dpr), round(hover_size * screen_dpr)}
+    decoded_paths = set()
+    for request_id, requested_size, pixmap in delegate_requests:
+        request_path, dpr = provider._split_request_id(request_id)
+        decoded_paths.add(provider._decode_path(request_path))
+        if "?dpr=" not in request_id or dpr != screen_dpr:
+            failures.append(f"请求ID没有附带屏幕设备像素比: {request_id}")
+        elif requested_size.width() not in pixel_sizes:
+            failures.append(f"请求尺寸 {requested_size.width()} 不是 {sorted(pixel_sizes)} 之一: {request_id}")
+        elif pixmap.devicePixelRatio() != screen_dpr or pixmap.width() != requested_size.width():
+            failures.append(f"返回的图标 {pixmap.width()} px @{pixmap.devicePixelRatio():g}x, "
+                            f"请求 {requested_size.width()} px @{screen_dpr:g}x: {request_id}")
+    if decoded_paths != set(paths):
+        failures.append(f"请求ID解码后的路径与应用路径不一致: {sorted(decoded_paths ^ set(paths))[:5]}")
+
+    # 用委托的请求ID换上另一块屏幕的设备像素比，预热1倍屏幕后来回切换
+    variants = {(provider._split_request_id(request_id)[0], round(requested_size.width() / screen_dpr))
+                for request_id, requested_size, _ in delegate_requests}
+
+    def request_all(dpr: float) -> list:
+        """按QuickWindow.qml的方式请求：sourceSize按设备像素比放大"""
+        pixmaps = []
+        for request_path, logical_size in variants:
+            pixel_size = round(logical_size * dpr)
+            pixmap = provider.requestPixmap(f"{request_path}?dpr={dpr:g}", QSize(), QSize(pixel_size, pixel_size))
+            pixmaps.append((request_path, logical_size, pixmap))
+        return pixmaps
+
+    request_all(1.0)
+    warm_extractions = provider.cache.stats['extractions']
+    for flip in range(10):
+        dpr = screen_dpr if flip % 2 else 1.0
+        for request_path, logical_size, pixmap in request_all(dpr):
+            if pixmap.devicePixelRatio() != dpr or pixmap.width() != round(logical_size * dpr):
+                failures.append(f"切换到 {dpr:g}x 后返回 {pixmap.width()} px @{pixmap.devicePixelRatio():g}x: "
+                                f"{request_path}")
+    re_extractions = provider.cache.stats['extractions'] - warm_extractions
+    if re_extractions:
+        failures.append(f"切换屏幕后重新提取了 {re_extractions} 个图标")
+
+    sample_id = delegate_requests[0][0] if delegate_requests else "无"
+    print(f"屏幕设备像素比: {screen_dpr}, 委托请求: {len(delegate_requests)}（示例 {sample_id}）")
+    print(f"预热提取: {warm_extractions}, 切换10次后重新提取: {re_extractions}")
+
+    engine.deleteLater()
+    provider.shutdown()
+    return failures
+
+
+def check_hover_sweep(work_dir: Path) -> List[str]:
+    """悬停扫过检查，返回失败项
+
+    加载实际的QuickWindow.qml，鼠标依次悬停每个图标并等待放大动画结束，检查后端已预取并保留
+    可见图标的静止和悬停尺寸、请求ID解码后是应用路径、悬停期间不再请求图标提供者，并统计帧间隔
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    # ConfigManager是单例，需在创建后端之前指向临时配置目录
+    os.environ["QUICKLAUNCHER_CONFIG_DIR"] = str(work_dir / "config")
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+    from PySide6.QtCore import QPoint, QPointF
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtQuick import QQuickWindow, QSGRendererInterface
+    from PySide6.QtTest import QTest
+    from ui.icon_provider_safe import SafeIconProvider
+    from ui.quick_window import QuickWindowBackend
+
+    QQuickWindow.setGraphicsApi(QSGRendererInterface.GraphicsApi.Software)
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    rows, cols = 2, 10
+    icon_paths = _write_icon_files(work_dir / "icons", rows * cols)
+    write_synthetic_config(work_dir / "config", len(icon_paths), rows, cols, paths=icon_paths)
+
+    class CountingIconProvider(SafeIconProvider):
+        """记录提供者收到的请求 (请求ID, 请求尺寸)"""
+
+        def __init__(self, cache_dir: str):
+            super().__init__(cache_dir=cache_dir)
+            self.calls = []
+
+        def requestPixmap(self, id, size, requestedSize):
+            self.calls.append((id, requestedSize.width()))
+            return super().requestPixmap(id, size, requestedSize)
+
+    def icon_items(item) -> list:
+        """快捷窗口中的图标容器（带iconSource属性的委托项），按模型顺序"""
+        found = []
+        for child in item.childItems():
+            if child.property("iconSource") is not None:
+                found.append(child)
+            found.extend(icon_items(child))
+        return found
+
+    provider = CountingIconProvider(cache_dir=str(work_dir / "cache"))
+    quick_backend, engine, quick_window = _load_quick_window(provider)
+
+    quick_config = quick_backend.config_manager.quick_config
+    icon_size = quick_config.icon_size or 48
+    hover_size = QuickWindowBackend.hover_icon_size(icon_size, quick_config.hover_scale)
+    visible_count = quick_backend.quickAppsModel.rowCount()
+
+    # 等待后端的预取完成，以及委托创建时两个尺寸的加载
+    cache = provider.cache
+    expected_prefetches = visible_count * 2
+    deadline = time.perf_counter() + 10
+    while ((cache.stats['prefetches'] < expected_prefetches or len(provider.calls) < expected_prefetches)
+           and time.perf_counter() < deadline):
+        _pump(20)
+    _pump(300)
+
+    load_calls = list(provider.calls)
+    memory_stats = cache.get_stats()['memory_cache']
+    icons = icon_items(quick_window.contentItem())
+
+    frames = []
+    quick_window.frameSwapped.connect(lambda: frames.append(time.perf_counter()))
+    hovered = 0
+    for index, icon in enumerate(icons):
+        center = icon.mapToScene(QPointF(icon.width() / 2, icon.height() / 2))
+        QTest.mouseMove(quick_window, center.toPoint())
+        _pump(250)
+        if quick_window.property("currentAppIndex") == index:
+            hovered += 1
+    QTest.mouseMove(quick_window, QPoint(1, 1))
+    _pump(250)
+
+    hover_calls = provider.calls[len(load_calls):]
+    requested_paths = {provider._decode_path(provider._split_request_id(call_id)[0]) for call_id, _ in load_calls}
+    intervals = [(b - a) * 1000 for a, b in zip(frames, frames[1:])]
+
+    print(f"{visible_count} 个可见图标, 图标 {icon_size} px, 悬停 {hover_size} px")
+    print(f"预取 {memory_stats['prefetches']} 个变体, 保留层 {memory_stats['pinned']} 个图标 "
+          f"({memory_stats['pinned_mb']} MB)")
+    print(f"加载时提供者调用 {len(load_calls)}（尺寸 {sorted({size for _, size in load_calls})}）, "
+          f"悬停 {hovered}/{len(icons)} 个图标, 悬停扫过时提供者调用 {len(hover_calls)}")
+    print(f"帧间隔: {_summarize(intervals) if intervals else '无帧（当前平台不渲染）'}")
+
+    failures = []
+    if memory_stats['prefetches'] < expected_prefetches or memory_stats['pinned'] == 0:
+        failures.append("后端没有预取可见图标")
+    if requested_paths != set(icon_paths):
+        failures.append(f"请求ID解码后的路径与应用路径不一致: {sorted(requested_paths ^ set(icon_paths))[:5]}")
+    if len(icons) != visible_count or hovered != len(icons):
+        failures.append(f"只悬停到 {hovered}/{visible_count} 个图标")
+    if hover_calls:
+        failures.append(f"悬停期间请求了图标提供者: {hover_calls[:5]}")
+
+    engine.deleteLater()
+    provider.shutdown()
+    return failures
+
+
+def run_benchmarks(sizes: List[int], timeout: int = 600) -> Dict[str, Any]:
+    """为每个应用数量启动独立子进程运行基准测试"""
+    results = []
+
+    for size in sizes:
+        temp_dir = Path(tempfile.mkdtemp(prefix="quicklauncher_bench_"))
+        result_file = temp_dir / "result.json"
+        try:
+            write_synthetic_config(temp_dir / "config", size)
+            env = dict(os.environ)
+            env.setdefault("QT_QPA_PLATFORM", "offscreen")
+            command = [
+                sys.executable, "-m", "utils.qml_benchmark",
+                "--worker", str(size),
+                "--config-dir", str(temp_dir / "config"),
+                "--output", str(result_file)
+            ]
+            print(f"运行基准测试: {size} 个应用")
+            completed = subprocess.run(command, cwd=str(PROJECT_ROOT), env=env, timeout=timeout,
+                                       capture_output=True, text=True)
+            if completed.returncode == 0 and result_file.exists():
+                with open(result_file, "r", encoding="utf-8") as f:
+                    results.append(json.load(f))
+            else:
+                results.append({
+                    "apps": size,
+                    "error": (completed.stderr or "").strip().splitlines()[-20:]
+                })
+        except subprocess.TimeoutExpired:
+            results.append({"apps": size, "error": f"超时（{timeout}秒）"})
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    try:
+        from PySide6 import __version__ as pyside_version
+    except ImportError:
+        pyside_version = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "pyside6": pyside_version,
+        "qpa_platform": os.environ.get("QT_QPA_PLATFORM", "offscreen"),
+        "results": results
+    }
+
+
+# 单项检查：名称 -> 检查函数(临时目录) -> 失败项
+CHECKS = {
+    "dpr": check_icon_dpr,
+    "hover": check_hover_sweep,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="QuickLauncher QML界面基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="测试的应用数量")
+    parser.add_argument("--output", default="benchmark_results.json", help="结果JSON文件")
+    parser.add_argument("--timeout", type=int, default=600, help="每个应用数量的超时时间（秒）")
+    parser.add_argument("--check", choices=sorted(CHECKS), help="运行单项检查")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--config-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.check:
+        work_dir = Path(tempfile.mkdtemp(prefix=f"quicklauncher_{args.check}_"))
+        try:
+            failures = CHECKS[args.check](work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        for failure in failures:
+            print(f"失败: {failure}")
+        print("通过" if not failures else "失败")
+        return 1 if failures else 0
+
+    if args.worker is not None:
+        result = _run_worker(args.worker, args.config_dir)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        return 0
+
+    report = run_benchmarks(args.sizes, args.timeout)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    failed = False
+    for item in report["results"]:
+        if "error" in item:
+            print(f"{item['apps']:>6} 个应用: 失败")
+            failed = True
+            continue
+        for failure in item.get("failures", []):
+            print(f"{item['apps']:>6} 个应用: 检查失败: {failure}")
+            failed = True
+        quick = item["quick_window"]
+        management = item["app_management"]
+        print(
+            f"{item['apps']:>6} 个应用: "
+            f"快捷窗口首帧 {quick['startup_to_first_frame_ms']} ms, "
+            f"重新布局中位数 {quick['relayout'].get('median_ms')} ms, "
+            f"搜索中位数 {management['search_keystroke'].get('median_ms')} ms / "
+            f"第一批结果 {management['search_first_result'].get('median_ms')} ms, "
+            f"悬停帧p95 {quick['hover_frame_times'].get('p95_ms')} ms, "
+            f"滚动帧p95 {management.get('scroll_frame_times', {}).get('p95_ms')} ms, "
+            f"列表委托 {management.get('delegates_after_scroll')}, "
+            f"主窗口渲染中位数 实时模糊 {item['main_window']['live_blur']['render_frame'].get('median_ms')} ms / "
+            f"预渲染 {item['main_window']['static_background']['render_frame'].get('median_ms')} ms, "
+            f"内存峰值 {item['peak_rss_mb']} MB"
+        )
+    print(f"结果已保存到: {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())